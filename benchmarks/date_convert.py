@@ -0,0 +1,99 @@
+"""日期转换耗时对比：fromisoformat + strftime / strptime 旧路径与切片 + 缓存新路径
+
+用法:
+    python benchmarks/date_convert.py [值个数]
+
+分别测试全部不重复的值与大量重复的值（如按天记录的日期列），并校验新旧结果一致。
+"""
+import random
+import sys
+import time
+from datetime import datetime
+
+from seatable_api_async.column import CTimeColumn, DateColumn, _parse_date_str, _utc_to_local
+from seatable_api_async.utils import _convert_date_value, _format_date
+
+
+def old_convert_date_value(value, date_format):
+    if not value:
+        return None
+    try:
+        date_value = datetime.fromisoformat(value)
+        if date_format == "YYYY-MM-DD":
+            return date_value.strftime("%Y-%m-%d")
+        return date_value.strftime("%Y-%m-%d %H:%M:%S")
+    except (ValueError, TypeError):
+        return value
+
+
+def old_parse_input_value(time_str):
+    time_str_list = time_str.split(" ")
+    if len(time_str_list) == 1:
+        return datetime.strptime(time_str_list[0], "%Y-%m-%d")
+    h, m, s = 0, 0, 0
+    ymd, hms_str = time_str_list
+    hms_str_list = hms_str.split(":")
+    if len(hms_str_list) == 1:
+        h = hms_str_list[0]
+    elif len(hms_str_list) == 2:
+        h, m = hms_str_list
+    elif len(hms_str_list) == 3:
+        h, m, s = hms_str_list
+    return datetime.strptime(f"{ymd} {h}:{m}:{s}", "%Y-%m-%d %H:%M:%S")
+
+
+def old_get_local_time(time_str):
+    utc_time = datetime.strptime(time_str, "%Y-%m-%dT%H:%M:%S.%f+00:00")
+    return utc_time + (datetime.now() - datetime.utcnow())
+
+
+def build_values(count: int, distinct: int):
+    rng = random.Random(0)
+    pool = [
+        datetime.fromordinal(datetime(2020, 1, 1).toordinal() + rng.randrange(2000)).replace(
+            hour=rng.randrange(24), minute=rng.randrange(60), second=rng.randrange(60), microsecond=rng.randrange(1000) * 1000)
+        for _ in range(distinct)
+    ]
+    picks = [pool[rng.randrange(distinct)] for _ in range(count)]
+    return {
+        "iso": [d.isoformat(timespec="milliseconds") + "+08:00" for d in picks],
+        "input": [d.strftime("%Y-%m-%d %H:%M") for d in picks],
+        "ctime": [d.isoformat(timespec="milliseconds") + "+00:00" for d in picks],
+    }
+
+
+def timeit(func, values) -> float:
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    date_column, ctime_column = DateColumn(), CTimeColumn()
+
+    for label, distinct in (("不重复", count), ("重复（365 个不同值）", 365)):
+        values = build_values(count, distinct)
+        for value in values["iso"][:1000]:
+            assert old_convert_date_value(value, None) == _convert_date_value(value, None)
+        for value in values["input"][:1000]:
+            assert old_parse_input_value(value) == date_column.parse_input_value(value)
+
+        cases = [
+            ("_convert_date_value", values["iso"],
+             lambda v: old_convert_date_value(v, None), lambda v: _convert_date_value(v, None)),
+            ("DateColumn.parse_input_value", values["input"], old_parse_input_value, date_column.parse_input_value),
+            ("CTimeColumn.get_local_time", values["ctime"], old_get_local_time, ctime_column.get_local_time),
+        ]
+        print(f"{label}: {count} 个值")
+        for name, data, old, new in cases:
+            for cache in (_format_date, _parse_date_str, _utc_to_local):
+                cache.cache_clear()
+            old_elapsed = timeit(old, data)
+            new_elapsed = timeit(new, data)
+            print(f"  {name:<30} 旧 {old_elapsed * 1000:8.1f} ms  新 {new_elapsed * 1000:8.1f} ms  x{old_elapsed / new_elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
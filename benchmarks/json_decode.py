@@ -0,0 +1,74 @@
+"""JSON 解码耗时对比：旧路径（bytes -> str -> json.loads）与直接解析字节
+
+用法:
+    python benchmarks/json_decode.py [行数]
+"""
+import json
+import random
+import string
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def build_payload(row_count: int) -> bytes:
+    """构造与 list_rows 响应结构相近的负载"""
+    rng = random.Random(0)
+
+    def text(n: int) -> str:
+        return "".join(rng.choices(string.ascii_letters + "中文测试", k=n))
+
+    rows = [
+        {
+            "_id": text(22),
+            "_mtime": "2025-11-20T08:15:30.123+00:00",
+            "_ctime": "2025-11-20T08:15:30.123+00:00",
+            "名称": text(12),
+            "年龄": rng.randint(18, 60),
+            "分数": rng.random() * 100,
+            "性别": rng.choice(["男", "女"]),
+            "标签": [text(4) for _ in range(3)],
+            "备注": text(80),
+            "已完成": rng.random() > 0.5,
+        }
+        for _ in range(row_count)
+    ]
+    return json.dumps({"rows": rows}, ensure_ascii=False).encode("utf-8")
+
+
+def timeit(func, payload: bytes, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    payload = build_payload(row_count)
+    print(f"payload: {row_count} rows, {len(payload) / 1024 / 1024:.1f} MB")
+
+    cases = {
+        "text + json.loads (旧路径)": lambda b: json.loads(b.decode("utf-8")),
+        "json.loads(bytes)": json.loads,
+    }
+    if orjson:
+        cases["orjson.loads(bytes)"] = orjson.loads
+    else:
+        print("orjson 未安装，跳过 orjson 后端")
+
+    baseline = None
+    for name, func in cases.items():
+        elapsed = timeit(func, payload)
+        baseline = baseline or elapsed
+        print(f"{name:<30} {elapsed * 1000:8.1f} ms  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
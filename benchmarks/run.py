@@ -0,0 +1,179 @@
+"""端到端吞吐基准：基于进程内替身服务器，统计各场景的行/秒与请求延迟 p50/p99
+
+用法:
+    python benchmarks/run.py [--rows 20000] [--latency 0.005] [--throttle-every 0] [--only list_rows,query]
+
+场景:
+    list_rows       iter_rows 遍历整表
+    batch_append    batch_append_rows 批量写入
+    batch_update    batch_update_rows 批量更新
+    query           iter_query 分块查询并转换
+    file_upload     upload_many 并发上传
+    file_download   download_many 并发下载
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from seatable_api_async import RequestHooks, SeaTableApiAsync
+from seatable_api_async.instrumentation import RequestContext
+
+from stub_server import StubSeaTable
+
+
+class LatencyRecorder(RequestHooks):
+    """记录每个请求的精确耗时，按接口模板分组"""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+
+    def on_decoded(self, ctx: RequestContext) -> None:
+        self.samples.setdefault(ctx.endpoint, []).append(ctx.elapsed)
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> None:
+        self.on_decoded(ctx)
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+    def percentiles(self, endpoints: Tuple[str, ...]) -> Tuple[float, float, int]:
+        values = sorted(v for endpoint in endpoints for v in self.samples.get(endpoint, ()))
+        if not values:
+            return 0.0, 0.0, 0
+        if len(values) == 1:
+            return values[0], values[0], 1
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        return cuts[49], cuts[98], len(values)
+
+
+async def bench_list_rows(api: SeaTableApiAsync, stub: StubSeaTable, args: argparse.Namespace) -> int:
+    count = 0
+    async for _ in api.iter_rows(stub.table_name, page_size=1000, concurrency=args.concurrency, row_count=args.rows):
+        count += 1
+    return count
+
+
+async def bench_batch_append(api: SeaTableApiAsync, stub: StubSeaTable, args: argparse.Namespace) -> int:
+    rows = [{"名称": f"row{i}", "数量": i, "备注": "x" * args.text_size} for i in range(args.write_rows)]
+    await api.batch_append_rows(stub.table_name, rows, concurrency=args.concurrency)
+    return len(rows)
+
+
+async def bench_batch_update(api: SeaTableApiAsync, stub: StubSeaTable, args: argparse.Namespace) -> int:
+    rows = await api.list_rows(stub.table_name, limit=1000)
+    updates = [{"row_id": row["_id"], "row": {"数量": i}} for i, row in enumerate(rows * (args.write_rows // max(len(rows), 1) or 1))]
+    await api.batch_update_rows(stub.table_name, updates, concurrency=args.concurrency)
+    return len(updates)
+
+
+async def bench_query(api: SeaTableApiAsync, stub: StubSeaTable, args: argparse.Namespace) -> int:
+    count = 0
+    async for chunk in api.iter_query(f"SELECT * FROM {stub.table_name} LIMIT {args.rows}", chunk_size=10000):
+        count += len(chunk)
+    return count
+
+
+async def bench_file_upload(api: SeaTableApiAsync, stub: StubSeaTable, args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"upload{i}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.file_size))
+            paths.append(path)
+        results = await api.upload_many(paths, concurrency=args.concurrency)
+    failed = [item for item in results if item["error"]]
+    if failed:
+        raise failed[0]["error"]
+    return len(results)
+
+
+async def bench_file_download(api: SeaTableApiAsync, stub: StubSeaTable, args: argparse.Namespace) -> int:
+    urls = [stub.asset_url.replace("bench.bin", f"bench{i}.bin") for i in range(args.files)]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = await api.download_many(urls, tmp, concurrency=args.concurrency)
+    failed = [item for item in results if item["error"]]
+    if failed:
+        raise failed[0]["error"]
+    return len(results)
+
+
+# 场景名 -> (函数, 统计延迟的接口模板, 计数单位)
+BENCHMARKS: Dict[str, Tuple[Callable[..., Awaitable[int]], Tuple[str, ...], str]] = {
+    "list_rows": (bench_list_rows, ("rows",), "rows"),
+    "batch_append": (bench_batch_append, ("batch-append-rows",), "rows"),
+    "batch_update": (bench_batch_update, ("batch-update-rows",), "rows"),
+    "query": (bench_query, ("query",), "rows"),
+    "file_upload": (bench_file_upload, ("upload",), "files"),
+    "file_download": (bench_file_download, ("download",), "files"),
+}
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise SystemExit(f"unknown benchmark: {', '.join(sorted(unknown))}")
+
+    results = []
+    for name in names:
+        func, endpoints, unit = BENCHMARKS[name]
+        # 每个场景使用全新的替身服务器，写入场景不影响后续的读取场景
+        stub = StubSeaTable(
+            row_count=args.rows,
+            text_size=args.text_size,
+            file_size=args.file_size,
+            latency=args.latency,
+            jitter=args.jitter,
+            throttle_every=args.throttle_every,
+        )
+        async with stub:
+            recorder = LatencyRecorder()
+            async with SeaTableApiAsync(stub.api_token, stub.url, hooks=[recorder]) as api:
+                best = None
+                for _ in range(args.repeat):
+                    recorder.reset()
+                    start = time.perf_counter()
+                    count = await func(api, stub, args)
+                    elapsed = time.perf_counter() - start
+                    if best is None or elapsed < best["seconds"]:
+                        p50, p99, requests = recorder.percentiles(endpoints)
+                        best = {"name": name, "count": count, "unit": unit, "seconds": elapsed, "p50": p50, "p99": p99, "requests": requests}
+                best["throttled"] = stub.throttled_count
+                results.append(best)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="表的初始行数")
+    parser.add_argument("--write-rows", type=int, default=5000, help="写入场景的行数")
+    parser.add_argument("--text-size", type=int, default=64, help="备注列文本长度，调整单行大小")
+    parser.add_argument("--files", type=int, default=8, help="文件传输场景的文件数")
+    parser.add_argument("--file-size", type=int, default=1024 * 1024, help="单个文件的字节数")
+    parser.add_argument("--latency", type=float, default=0.0, help="服务器每个请求的固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="叠加的随机延迟上限（秒）")
+    parser.add_argument("--throttle-every", type=int, default=0, help="每 N 个请求注入一次 429")
+    parser.add_argument("--concurrency", type=int, default=4, help="分页、分块与文件传输的并发数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个场景重复次数，取最快一次")
+    parser.add_argument("--only", default="", help="逗号分隔的场景名")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'benchmark':<15} {'count':>8} {'seconds':>9} {'per sec':>11} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'429':>5}")
+    for r in results:
+        rate = r["count"] / r["seconds"] if r["seconds"] else 0.0
+        print(
+            f"{r['name']:<15} {r['count']:>8} {r['seconds']:>9.3f} {rate:>7.0f} {r['unit']:<3} "
+            f"{r['requests']:>9} {r['p50'] * 1000:>8.2f} {r['p99'] * 1000:>8.2f} {r['throttled']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""进程内 SeaTable 替身服务器，用于离线基准测试
+
+覆盖客户端用到的接口：app-access-token、metadata、rows、batch-*、links、
+SQL 查询、linked-records、上传/下载链接及文件服务器。支持配置延迟、
+注入 429 响应以及行数、文本长度、文件大小等负载规模。仅模拟 dtable-server
+直连模式（use_api_gateway=False）。
+
+示例:
+    async with StubSeaTable(row_count=10000, latency=0.005) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url) as api:
+            rows = await api.list_rows(stub.table_name)
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import operator
+import random
+import re
+import string
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Set
+
+from aiohttp import web
+
+__all__ = ["StubSeaTable"]
+
+DTABLE_UUID = "12345678-1234-1234-1234-123456789abc"
+TABLE_ID = "0000"
+
+_SQL_LIMIT = re.compile(r"\blimit\s+(\d+)(?:\s+offset\s+(\d+))?\s*$", re.IGNORECASE)
+# 查询只支持 _mtime / _id 上的比较条件（可用 AND、OR 与括号组合）、按这两列排序与只取 _id，供增量同步使用
+_SQL_WHERE = re.compile(r"\bwhere\s+(.*?)(?:\s+order\s+by\b|\s+limit\b|$)", re.IGNORECASE | re.DOTALL)
+_SQL_WHERE_TOKEN = re.compile(r"\s*(\(|\)|\band\b|\bor\b|_mtime\b|_id\b|>=|<=|!=|=|>|<|'[^']*')", re.IGNORECASE)
+_SQL_ORDER = re.compile(r"\border\s+by\s+((?:_mtime|_id)(?:\s*,\s*(?:_mtime|_id))*)", re.IGNORECASE)
+_SQL_SELECT_ID = re.compile(r"^\s*select\s+_id\s+from\b", re.IGNORECASE)
+_SQL_COMPARATORS = {
+    "=": operator.eq, "!=": operator.ne, ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+}
+
+_OPTIONS = [{"id": f"{i:06d}", "name": name, "color": "#FFFFFF"} for i, name in enumerate(["进行中", "已完成", "已取消", "待定"])]
+_TAGS = [{"id": f"t{i:05d}", "name": f"标签{i}", "color": "#FFFFFF"} for i in range(8)]
+
+# 表结构：列类型覆盖文本、数字、单选、多选、日期、复选框
+_COLUMNS = [
+    {"key": "0000", "name": "名称", "type": "text", "data": None},
+    {"key": "a001", "name": "数量", "type": "number", "data": {"format": "number"}},
+    {"key": "a002", "name": "状态", "type": "single-select", "data": {"options": _OPTIONS}},
+    {"key": "a003", "name": "标签", "type": "multiple-select", "data": {"options": _TAGS}},
+    {"key": "a004", "name": "日期", "type": "date", "data": {"format": "YYYY-MM-DD HH:mm"}},
+    {"key": "a005", "name": "完成", "type": "checkbox", "data": None},
+    {"key": "a006", "name": "备注", "type": "text", "data": None},
+]
+_KEY_TO_NAME = {column["key"]: column["name"] for column in _COLUMNS}
+_NAME_TO_KEY = {column["name"]: column["key"] for column in _COLUMNS}
+_OPTION_NAMES = {option["id"]: option["name"] for option in _OPTIONS + _TAGS}
+
+
+def _fake_jwt(jti: int, lifetime: float = 3 * 24 * 3600) -> str:
+    """构造不签名的 JWT，客户端只读取其中的 exp；jti 使每次签发的 token 互不相同"""
+    def encode(obj: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode({'exp': int(time.time() + lifetime), 'jti': jti})}.stub"
+
+
+class StubSeaTable:
+    """进程内的 SeaTable 替身服务器
+
+    :param row_count: 初始行数
+    :param text_size: 备注列的文本长度，用于调整单行负载大小
+    :param file_size: 下载文件的字节数
+    :param latency: 每个请求的固定延迟（秒）
+    :param jitter: 在固定延迟上叠加的随机延迟上限（秒）
+    :param throttle_every: 每 N 个请求返回一次 429，0 表示不注入
+    :param retry_after: 429 响应的 Retry-After 秒数
+    :param fail_every: 每 N 个请求返回一次 503，0 表示不注入
+    """
+
+    table_name = "Table1"
+    api_token = "stub-api-token"
+    # 表的列定义，与 metadata、columns 接口返回的一致
+    columns = _COLUMNS
+
+    def __init__(
+            self,
+            row_count: int = 10000,
+            text_size: int = 64,
+            file_size: int = 1024 * 1024,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            throttle_every: int = 0,
+            retry_after: float = 0.0,
+            seed: int = 0,
+            fail_every: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.fail_every = fail_every
+        self.failed_count = 0
+        self._upload_generation = 0
+        self._issued_tokens = 0
+        # 被作废的 JWT，携带它们的请求返回 401
+        self.revoked_tokens: Set[str] = set()
+        self.file_size = file_size
+        self.text_size = text_size
+        self.request_count = 0
+        self.throttled_count = 0
+        self.url: Optional[str] = None
+        self._rng = random.Random(seed)
+        self._next_id = 0
+        # 以列 key 存储行，list_rows 时转换为列名
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        for _ in range(row_count):
+            row = self._generate_row()
+            self._rows[row["_id"]] = row
+        self._file = bytes(self._rng.getrandbits(8) for _ in range(min(file_size, 65536)))
+        self._runner: Optional[web.AppRunner] = None
+
+    def __str__(self) -> str:
+        return f"<SeaTable StubSeaTable [{self.url}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self) -> StubSeaTable:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    # ========== 数据 ==========
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return f"{self._next_id:022d}"
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+    def _generate_row(self) -> Dict[str, Any]:
+        rng = self._rng
+        now = "2025-11-20T08:15:30.123+00:00"
+        return {
+            "_id": self._new_id(),
+            "_ctime": now,
+            "_mtime": now,
+            "0000": "".join(rng.choices(string.ascii_letters, k=12)),
+            "a001": rng.randint(0, 10000),
+            "a002": rng.choice(_OPTIONS)["id"],
+            "a003": [tag["id"] for tag in rng.sample(_TAGS, 3)],
+            "a004": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:30:00+08:00",
+            "a005": rng.random() > 0.5,
+            "a006": "".join(rng.choices(string.ascii_letters + "中文测试", k=self.text_size)),
+        }
+
+    @staticmethod
+    def _to_names(row: Dict[str, Any]) -> Dict[str, Any]:
+        """dtable-server 返回以列名为键、选项为名称的行"""
+        result: Dict[str, Any] = {}
+        for key, value in row.items():
+            if key == "a002":
+                value = _OPTION_NAMES.get(value, value)
+            elif key == "a003" and value:
+                value = [_OPTION_NAMES.get(v, v) for v in value]
+            result[_KEY_TO_NAME.get(key, key)] = value
+        return result
+
+    @staticmethod
+    def _to_keys(row: Dict[str, Any]) -> Dict[str, Any]:
+        """把客户端写入的以列名为键的行转换为以列 key 为键"""
+        return {_NAME_TO_KEY.get(name, name): value for name, value in row.items()}
+
+    # ========== 服务器 ==========
+
+    async def start(self) -> str:
+        """启动服务器，返回其根 URL"""
+        app = web.Application(middlewares=[self._middleware], client_max_size=1024 ** 3)
+        dtable = "/dtable-server/api/v1/dtables/{uuid}"
+        app.router.add_get("/api/v2.1/dtable/app-access-token/", self._app_access_token)
+        app.router.add_get("/api/v2.1/dtable/app-upload-link/", self._upload_link)
+        app.router.add_get("/api/v2.1/dtable/app-download-link/", self._download_link)
+        app.router.add_get(f"{dtable}/metadata/", self._metadata)
+        app.router.add_get(f"{dtable}/columns/", self._columns)
+        app.router.add_get(f"{dtable}/rows/", self._list_rows)
+        app.router.add_post(f"{dtable}/rows/", self._append_row)
+        app.router.add_post(f"{dtable}/batch-append-rows/", self._batch_append_rows)
+        app.router.add_put(f"{dtable}/batch-update-rows/", self._batch_update_rows)
+        app.router.add_delete(f"{dtable}/batch-delete-rows/", self._batch_delete_rows)
+        app.router.add_route("*", f"{dtable}/links/", self._links)
+        app.router.add_put(f"{dtable}/batch-update-links/", self._links)
+        app.router.add_post("/dtable-db/api/v1/query/{uuid}/", self._query)
+        app.router.add_post("/dtable-db/api/v1/linked-records/{uuid}/", self._linked_records)
+        app.router.add_post("/upload-api/{token}", self._upload)
+        app.router.add_get("/files/{path:.*}", self._download)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def asset_url(self) -> str:
+        """可传给 download_file 的文件 URL"""
+        return f"{self.url}/workspace/1/asset/{DTABLE_UUID}/files/2025-11/bench.bin"
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.request_count += 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.throttle_every and self.request_count % self.throttle_every == 0:
+            self.throttled_count += 1
+            return web.Response(status=429, headers={"Retry-After": str(self.retry_after)}, text="Too Many Requests")
+        if self.fail_every and self.request_count % self.fail_every == 0:
+            self.failed_count += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if request.headers.get("Authorization", "").removeprefix("Token ") in self.revoked_tokens:
+            return web.Response(status=401, text="Token expired")
+        return await handler(request)
+
+    def _base(self, request: web.Request) -> str:
+        return f"{request.scheme}://{request.host}"
+
+    async def _app_access_token(self, request: web.Request) -> web.Response:
+        base = self._base(request)
+        self._issued_tokens += 1
+        return web.json_response({
+            "app_name": "bench",
+            "access_token": _fake_jwt(self._issued_tokens),
+            "dtable_uuid": DTABLE_UUID,
+            "dtable_server": f"{base}/dtable-server/",
+            "dtable_socket": f"{base}/",
+            "dtable_db": f"{base}/dtable-db/",
+            "workspace_id": 1,
+            "dtable_name": "bench",
+        })
+
+    async def _metadata(self, request: web.Request) -> web.Response:
+        table = {"_id": TABLE_ID, "name": self.table_name, "columns": _COLUMNS, "views": [{"_id": "0000", "name": "Default View"}]}
+        return web.json_response({"metadata": {"tables": [table], "version": 1, "format_version": 1}})
+
+    async def _columns(self, request: web.Request) -> web.Response:
+        return web.json_response({"columns": _COLUMNS})
+
+    async def _list_rows(self, request: web.Request) -> web.Response:
+        start = int(request.query.get("start", 0))
+        limit = min(int(request.query.get("limit", 1000)), 1000)
+        rows = list(self._rows.values())[start:start + limit]
+        return web.json_response({"rows": [self._to_names(row) for row in rows]})
+
+    def _insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        now = self._now()
+        row = {"_id": self._new_id(), "_ctime": now, "_mtime": now, **self._to_keys(row)}
+        self._rows[row["_id"]] = row
+        return row
+
+    async def _append_row(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response(self._to_names(self._insert(body.get("row", {}))))
+
+    async def _batch_append_rows(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        rows = [self._insert(row) for row in body.get("rows", [])]
+        return web.json_response({"inserted_row_count": len(rows), "first_row": self._to_names(rows[0]) if rows else None})
+
+    async def _batch_update_rows(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        for update in body.get("updates", []):
+            row = self._rows.get(update.get("row_id"))
+            if row is not None:
+                row.update(self._to_keys(update.get("row", {})), _mtime=self._now())
+        return web.json_response({"success": True})
+
+    async def _batch_delete_rows(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        row_ids = body.get("row_ids", [])
+        deleted = sum(self._rows.pop(row_id, None) is not None for row_id in row_ids)
+        return web.json_response({"deleted_rows": deleted})
+
+    async def _links(self, request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response({"success": True})
+
+    @staticmethod
+    def _compile_where(clause: str) -> Callable[[Dict[str, Any]], bool]:
+        """把 WHERE 子句解析为谓词，只支持 _mtime / _id 与字符串字面量的比较及 AND、OR、括号"""
+        tokens, pos = [], 0
+        while pos < len(clause.rstrip()):
+            token = _SQL_WHERE_TOKEN.match(clause, pos)
+            if not token:
+                raise web.HTTPBadRequest(text=f"unsupported WHERE clause: {clause}")
+            tokens.append(token.group(1))
+            pos = token.end()
+        tokens.append("")
+
+        def error() -> web.HTTPBadRequest:
+            return web.HTTPBadRequest(text=f"unsupported WHERE clause: {clause}")
+
+        def take() -> str:
+            nonlocal pos
+            pos += 1
+            return tokens[pos - 1]
+
+        def operand() -> Callable[[Dict[str, Any]], Any]:
+            value = take()
+            if value.startswith("'"):
+                literal = value[1:-1]
+                return lambda row: literal
+            if value.lower() in ("_mtime", "_id"):
+                key = value.lower()
+                return lambda row: row[key]
+            raise error()
+
+        def factor() -> Callable[[Dict[str, Any]], bool]:
+            if tokens[pos] == "(":
+                take()
+                predicate = disjunction()
+                if take() != ")":
+                    raise error()
+                return predicate
+            left = operand()
+            compare = _SQL_COMPARATORS.get(take())
+            if compare is None:
+                raise error()
+            right = operand()
+            return lambda row: compare(left(row), right(row))
+
+        def conjunction() -> Callable[[Dict[str, Any]], bool]:
+            predicate = factor()
+            while tokens[pos].lower() == "and":
+                take()
+                predicate = (lambda a, b: lambda row: a(row) and b(row))(predicate, factor())
+            return predicate
+
+        def disjunction() -> Callable[[Dict[str, Any]], bool]:
+            predicate = conjunction()
+            while tokens[pos].lower() == "or":
+                take()
+                predicate = (lambda a, b: lambda row: a(row) or b(row))(predicate, conjunction())
+            return predicate
+
+        pos = 0
+        result = disjunction()
+        if tokens[pos] != "":
+            raise error()
+        return result
+
+    async def _query(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        sql = body.get("sql", "")
+        match = _SQL_LIMIT.search(sql)
+        # 未带 LIMIT 时与服务器一致，最多返回 100 行
+        limit, offset = (int(match.group(1)), int(match.group(2) or 0)) if match else (100, 0)
+        rows = list(self._rows.values())
+        where = _SQL_WHERE.search(sql)
+        if where:
+            predicate = self._compile_where(where.group(1))
+            rows = [row for row in rows if predicate(row)]
+        order = _SQL_ORDER.search(sql)
+        if order:
+            keys = [key.strip() for key in order.group(1).split(",")]
+            rows.sort(key=lambda row: tuple(row[key] for key in keys))
+        rows = rows[offset:offset + min(limit, 10000)]
+        if _SQL_SELECT_ID.search(sql):
+            rows = [{"_id": row["_id"]} for row in rows]
+        return web.json_response({"success": True, "results": rows, "metadata": _COLUMNS})
+
+    async def _linked_records(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({row["row_id"]: [] for row in body.get("rows", [])})
+
+    async def _upload_link(self, request: web.Request) -> web.Response:
+        base = self._base(request)
+        return web.json_response({
+            "upload_link": f"{base}/upload-api/stub-upload-token-{self._upload_generation}",
+            "parent_path": f"/asset/{DTABLE_UUID}",
+            "img_relative_path": "images/2025-11",
+            "file_relative_path": "files/2025-11",
+        })
+
+    def expire_upload_links(self) -> None:
+        """使已发出的上传链接失效，之后用旧链接上传返回 403"""
+        self._upload_generation += 1
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        if request.match_info["token"] != f"stub-upload-token-{self._upload_generation}":
+            await request.read()
+            return web.Response(status=403, text="Invalid upload token")
+        reader = await request.multipart()
+        name, size = "file", 0
+        async for part in reader:
+            if part.name == "file":
+                name = part.filename or name
+                while chunk := await part.read_chunk(1024 * 1024):
+                    size += len(chunk)
+            else:
+                await part.read()
+        return web.json_response([{"name": name, "id": "stub", "size": size}])
+
+    async def _download_link(self, request: web.Request) -> web.Response:
+        path = request.query.get("path", "").strip("/")
+        return web.json_response({"download_link": f"{self._base(request)}/files/{path}"})
+
+    async def _download(self, request: web.Request) -> web.StreamResponse:
+        resp = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        resp.content_length = self.file_size
+        await resp.prepare(request)
+        remaining = self.file_size
+        while remaining > 0:
+            chunk = self._file[:remaining]
+            await resp.write(chunk)
+            remaining -= len(chunk)
+        await resp.write_eof()
+        return resp
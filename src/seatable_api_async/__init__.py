@@ -6,11 +6,23 @@
 from .seatable_api import SeaTableApiAsync
 from .account_api import AccountApiAsync
 from .socket_io import SocketIOAsync
+from .replica import BaseReplica
+from .client_pool import SeaTableClientPool
+from .row_buffer import RowWriteBuffer
+from .compact_row import CompactRow
+from .row_filter import RowFilter, compile_filter
+from .snapshot import TableSnapshot
+from .sqlite_cache import SQLiteRowCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .auth_cache import AuthCache
+from .instrumentation import MetricsCollector, RequestContext, RequestHooks
 from .exception import (
     SeatableApiException,
     AccountApiAsyncException,
     AuthExpiredError,
     BaseUnauthError,
+    BatchRowsError,
 )
 from .constants import ColumnTypes
 
@@ -18,10 +30,25 @@ __all__ = [
     "SeaTableApiAsync",
     "AccountApiAsync",
     "SocketIOAsync",
+    "BaseReplica",
+    "SeaTableClientPool",
+    "RowWriteBuffer",
+    "CompactRow",
+    "RowFilter",
+    "compile_filter",
+    "TableSnapshot",
+    "SQLiteRowCache",
+    "RateLimiter",
+    "RetryPolicy",
+    "AuthCache",
+    "RequestHooks",
+    "RequestContext",
+    "MetricsCollector",
     "SeatableApiException",
     "AccountApiAsyncException",
     "AuthExpiredError",
     "BaseUnauthError",
+    "BatchRowsError",
     "ColumnTypes",
 ]
 
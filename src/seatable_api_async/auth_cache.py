@@ -0,0 +1,84 @@
+"""app-access-token 认证结果的磁盘缓存"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .utils import json_dumps, json_loads
+
+__all__ = ["AuthCache"]
+
+
+class AuthCache:
+    """将 app-access-token 的结果缓存到磁盘，进程重启后无需重新认证
+
+    每个 (server_url, token) 对应一个以其 SHA-256 命名的文件，权限为 0600，
+    读写时加文件锁，多个进程可以共享同一个缓存目录。
+
+    示例:
+        cache = AuthCache()
+        async with SeaTableApiAsync(token, server_url, auth_cache=cache) as api:
+            ...
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory or os.path.join(os.path.expanduser("~"), ".cache", "seatable_api_async", "auth")
+
+    def __str__(self) -> str:
+        return f"<SeaTable AuthCache [{self.directory}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _path(self, server_url: str, token: str) -> str:
+        key = hashlib.sha256(f"{server_url}\n{token}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key)
+
+    async def load(self, server_url: str, token: str) -> Optional[Dict[str, Any]]:
+        """读取缓存，返回 {"data": 认证响应, "exp": 过期时间}，不存在、无法读取或损坏时返回 None"""
+        return await asyncio.to_thread(self._read, self._path(server_url, token))
+
+    async def save(self, server_url: str, token: str, data: Dict[str, Any], exp: datetime) -> None:
+        """写入认证响应及其过期时间"""
+        await asyncio.to_thread(self._write, self._path(server_url, token), {"data": data, "exp": exp.timestamp()})
+
+    async def delete(self, server_url: str, token: str) -> None:
+        """删除缓存"""
+        try:
+            await asyncio.to_thread(os.remove, self._path(server_url, token))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        # 文件不存在、无权限等读取错误均视为未命中
+        try:
+            with open(path, "rb") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_SH)
+                content = f.read()
+        except OSError:
+            return None
+        try:
+            entry = json_loads(content)
+            return {"data": entry["data"], "exp": datetime.fromtimestamp(entry["exp"])}
+        except (KeyError, TypeError, ValueError, OverflowError, OSError):
+            return None
+
+    def _write(self, path: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                os.fchmod(fd, 0o600)
+            f.truncate()
+            f.write(json_dumps(entry))
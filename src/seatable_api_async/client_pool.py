@@ -0,0 +1,114 @@
+"""多 Base 客户端池"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from .seatable_api import SeaTableApiAsync
+
+__all__ = ["SeaTableClientPool"]
+
+
+class SeaTableClientPool:
+    """共享一个连接池的多 Base 客户端池
+
+    所有 Base 客户端共用同一个 aiohttp.ClientSession，TCPConnector 的 limit /
+    limit_per_host 即整个池的并发连接上限。已认证的客户端按 LRU 保留最多
+    max_bases 个，超出时淘汰最久未使用的。同一 token 的并发 get 只认证一次。
+    client_kwargs 会传给每个 SeaTableApiAsync，如 proxy、rate_limiter、retry_policy。
+
+    示例:
+        async with SeaTableClientPool(server_url, max_bases=256) as pool:
+            base = await pool.get(token)
+            rows = await base.list_rows("Table1")
+    """
+
+    def __init__(
+            self,
+            server_url: str,
+            max_bases: int = 128,
+            limit: int = 100,
+            limit_per_host: int = 30,
+            timeout: int = 30,
+            **client_kwargs: Any,
+    ) -> None:
+        if max_bases < 1:
+            raise ValueError("max_bases must be at least 1")
+        self.server_url = server_url
+        self.max_bases = max_bases
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.client_kwargs = client_kwargs
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._clients: OrderedDict[str, SeaTableApiAsync] = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def __str__(self) -> str:
+        return f"<SeaTable ClientPool [{len(self._clients)}/{self.max_bases}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def __aenter__(self) -> SeaTableClientPool:
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.close()
+
+    async def get(self, token: str) -> SeaTableApiAsync:
+        """获取 token 对应的已认证客户端"""
+        if self.session is None:
+            raise RuntimeError("SeaTableClientPool is not opened, use 'async with'")
+        client = self._clients.get(token)
+        if client is not None:
+            self._clients.move_to_end(token)
+            return client
+
+        task = self._pending.get(token)
+        if task is None:
+            task = self._pending[token] = asyncio.ensure_future(self._open(token))
+            task.add_done_callback(lambda _: self._pending.pop(token, None))
+        # shield 保证单个调用方被取消时不影响其他等待同一 token 的调用方
+        client = await asyncio.shield(task)
+        if token in self._clients:
+            self._clients.move_to_end(token)
+        return client
+
+    def evict(self, token: str) -> None:
+        """从池中移除 token 对应的客户端"""
+        client = self._clients.pop(token, None)
+        if client:
+            client.stop_auto_refresh()
+
+    async def close(self) -> None:
+        """关闭共享的连接池"""
+        for task in self._pending.values():
+            task.cancel()
+        for client in self._clients.values():
+            client.stop_auto_refresh()
+        self._clients.clear()
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _open(self, token: str) -> SeaTableApiAsync:
+        client = SeaTableApiAsync(token, self.server_url, timeout=self.timeout, session=self.session, **self.client_kwargs)
+        await client.auth()
+        if client.auto_refresh:
+            client.start_auto_refresh()
+        self._clients[token] = client
+        while len(self._clients) > self.max_bases:
+            _, evicted = self._clients.popitem(last=False)
+            evicted.stop_auto_refresh()
+        return client
@@ -1,11 +1,73 @@
-from datetime import datetime
+import functools
+from datetime import datetime, timezone
 
-from .constants import ColumnTypes
+from .constants import ColumnTypes, DATE_CACHE_SIZE
 
 # Set the null list to distinguish the pure none and the number 0 or 0.00, which is
 # a critical real value in number type column.
 NULL_LIST = ['', [], None]
 
+def _is_digits(value):
+    return value.isascii() and value.isdigit()
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_str(time_str):
+    """Parse "YYYY-MM-DD[ hh[:mm[:ss]]]", the common shapes by slicing.
+
+    Returns None for strings with more than one space, as the strptime path does.
+    """
+    length = len(time_str)
+    if length in (10, 16, 19) and time_str[4] == '-' and time_str[7] == '-':
+        year, month, day = time_str[:4], time_str[5:7], time_str[8:10]
+        if _is_digits(year) and _is_digits(month) and _is_digits(day):
+            if length == 10:
+                return datetime(int(year), int(month), int(day))
+            if time_str[10] == ' ' and time_str[13] == ':' and _is_digits(time_str[11:13]) and _is_digits(time_str[14:16]):
+                second = 0
+                if length == 19:
+                    if time_str[16] != ':' or not _is_digits(time_str[17:19]):
+                        return _strptime_date_str(time_str)
+                    second = int(time_str[17:19])
+                return datetime(int(year), int(month), int(day), int(time_str[11:13]), int(time_str[14:16]), second)
+    return _strptime_date_str(time_str)
+
+
+def _strptime_date_str(time_str):
+    time_str_list = time_str.split(' ')
+    datetime_obj = None
+    if len(time_str_list) == 1:
+        ymd = time_str_list[0]
+        datetime_obj = datetime.strptime(ymd, '%Y-%m-%d')
+    elif len(time_str_list) == 2:
+        h, m, s = 0, 0, 0
+        ymd, hms_str = time_str_list
+        hms_str_list = hms_str.split(':')
+        if len(hms_str_list) == 1:
+            h = hms_str_list[0]
+        elif len(hms_str_list) == 2:
+            h, m = hms_str_list
+        elif len(hms_str_list) == 3:
+            h, m, s = hms_str_list
+        datetime_obj = datetime.strptime(f"{ymd} {h}:{m}:{s}", '%Y-%m-%d %H:%M:%S')
+    return datetime_obj
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _utc_to_local(time_str):
+    """Parse "YYYY-MM-DDThh:mm:ss.ffffff+00:00" and shift it to naive local time.
+
+    The offset is taken for the value itself, so values on either side of a DST change are both correct.
+    """
+    if 27 <= len(time_str) <= 32 and time_str.endswith('+00:00') and time_str[4] == '-' and time_str[7] == '-' \
+            and time_str[10] == 'T' and time_str[13] == ':' and time_str[16] == ':' and time_str[19] == '.' \
+            and time_str[11:13] != '24' and _is_digits(
+                time_str[:4] + time_str[5:7] + time_str[8:10] + time_str[11:13] + time_str[14:16] + time_str[17:19] + time_str[20:-6]):
+        utc_time = datetime.fromisoformat(time_str[:-6])
+    else:
+        utc_time = datetime.strptime(time_str, '%Y-%m-%dT%H:%M:%S.%f+00:00')
+    return utc_time.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
 
 # Column Value related classes handle the compare computation of the table data
 class ColumnValue(object):
@@ -224,23 +286,7 @@ class DateColumn(BaseColumn):
         if not time_str:
             return ""
         try:
-            time_str_list = time_str.split(' ')
-            datetime_obj = None
-            if len(time_str_list) == 1:
-                ymd = time_str_list[0]
-                datetime_obj = datetime.strptime(ymd, '%Y-%m-%d')
-            elif len(time_str_list) == 2:
-                h, m, s = 0, 0, 0
-                ymd, hms_str = time_str_list
-                hms_str_list = hms_str.split(':')
-                if len(hms_str_list) == 1:
-                    h = hms_str_list[0]
-                elif len(hms_str_list) == 2:
-                    h, m = hms_str_list
-                elif len(hms_str_list) == 3:
-                    h, m, s = hms_str_list
-                datetime_obj = datetime.strptime(f"{ymd} {h}:{m}:{s}", '%Y-%m-%d %H:%M:%S')
-            return datetime_obj
+            return _parse_date_str(time_str)
         except (ValueError, TypeError, AttributeError):
             return self.raise_error(time_str)
 
@@ -267,10 +313,7 @@ class CTimeColumn(DateColumn):
         return "SeaTable CTime Column"
 
     def get_local_time(self, time_str):
-        utc_time = datetime.strptime(time_str, '%Y-%m-%dT%H:%M:%S.%f+00:00')
-        delta2utc = datetime.now() - datetime.utcnow()
-        local_time = utc_time + delta2utc
-        return local_time
+        return _utc_to_local(time_str)
 
     def parse_table_value(self, time_str):
         return NumberDateColumnValue(self.get_local_time(time_str), self.column_type)
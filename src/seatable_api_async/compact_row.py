@@ -0,0 +1,144 @@
+"""紧凑行对象：按表结构生成 tuple 子类，代替以列名为键的 dict"""
+from __future__ import annotations
+
+import keyword
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from .constants import COMPACT_LAYOUT_CACHE_SIZE
+
+__all__ = ["CompactRow"]
+
+R = TypeVar("R", bound="CompactRow")
+
+# 所有行都包含的内置列，位于字段最前面
+BUILTIN_FIELDS = ("_id", "_ctime", "_mtime")
+
+# 按 (基类, 字段) 缓存生成的子类，LRU 淘汰，避免表结构频繁变化时无限增长
+_layouts: OrderedDict[Tuple[type, Tuple[str, ...]], type] = OrderedDict()
+_layouts_lock = threading.Lock()
+
+
+def _field_getter(index: int) -> Callable[[Any], Any]:
+    getitem = tuple.__getitem__
+    return lambda self: getitem(self, index)
+
+
+def _restore(base: Type[CompactRow], fields: Tuple[str, ...], values: Tuple[Any, ...]) -> CompactRow:
+    return tuple.__new__(base.layout(fields), values)
+
+
+class CompactRow(tuple):
+    """以 tuple 存储的行，同一表结构的行共享字段名，单行内存约为 dict 的三分之一
+
+    按表结构生成的子类保存字段名，最后一个元素保存字段以外的键（没有时为 None）。
+    支持 row.名称、row["名称"]、row.get("名称")，需要 dict 时调用 as_dict()。
+    列名与 tuple 方法重名或不是合法标识符时只能用 row["列名"] 访问。
+
+    示例:
+        rows = await api.list_rows("Table1", row_factory=CompactRow)
+        print(rows[0]["Name"], rows[0].as_dict())
+    """
+
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+    _positions: Dict[str, int] = {}
+
+    @classmethod
+    def layout(cls: Type[R], fields: Iterable[str]) -> Type[R]:
+        """返回字段为 fields 的子类，相同字段复用同一个类"""
+        fields = tuple(fields)
+        cache_key = (cls, fields)
+        with _layouts_lock:
+            layout = _layouts.get(cache_key)
+            if layout is not None:
+                _layouts.move_to_end(cache_key)
+                return layout
+            namespace: Dict[str, Any] = {
+                "__slots__": (),
+                "_fields": fields,
+                "_positions": {name: i for i, name in enumerate(fields)},
+            }
+            for i, name in enumerate(fields):
+                if name.isidentifier() and not keyword.iskeyword(name) and not hasattr(cls, name):
+                    namespace[name] = property(_field_getter(i))
+            layout = _layouts[cache_key] = type(cls.__name__, (cls,), namespace)
+            if len(_layouts) > COMPACT_LAYOUT_CACHE_SIZE:
+                _layouts.popitem(last=False)
+        return layout
+
+    @classmethod
+    def for_columns(cls: Type[R], columns: Iterable[Dict[str, Any]]) -> Type[R]:
+        """按列定义生成子类，字段为内置列加各列名"""
+        names = [column["name"] for column in columns]
+        return cls.layout(BUILTIN_FIELDS + tuple(name for name in names if name not in BUILTIN_FIELDS))
+
+    @classmethod
+    def from_dict(cls: Type[R], row: Dict[str, Any]) -> R:
+        """由以列名为键的 dict 构建行，缺失的字段为 None"""
+        positions = cls._positions
+        values: List[Any] = [None] * (len(positions) + 1)
+        extras: Optional[Dict[str, Any]] = None
+        for key, value in row.items():
+            index = positions.get(key)
+            if index is not None:
+                values[index] = value
+            elif extras is None:
+                extras = {key: value}
+            else:
+                extras[key] = value
+        values[-1] = extras
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def from_values(cls: Type[R], values: List[Any]) -> R:
+        """由按字段顺序排列的值构建行，values 的最后一个元素为额外键的 dict 或 None"""
+        return tuple.__new__(cls, values)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # 动态生成的子类无法按名称导入，序列化时记录基类与字段
+        return _restore, (type(self).__bases__[0], self._fields, tuple(self))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+    def __getitem__(self, key: Any) -> Any:
+        if not isinstance(key, str):
+            return tuple.__getitem__(self, key)
+        index = self._positions.get(key)
+        if index is not None:
+            return tuple.__getitem__(self, index)
+        extras = tuple.__getitem__(self, -1)
+        if extras and key in extras:
+            return extras[key]
+        raise KeyError(key)
+
+    def __getattr__(self, name: str) -> Any:
+        # 只在字段属性不存在时调用，用于访问额外键
+        extras = tuple.__getitem__(self, -1) if tuple.__len__(self) else None
+        if extras and name in extras:
+            return extras[name]
+        raise AttributeError(name)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        extras = tuple.__getitem__(self, -1)
+        return list(self._fields) + list(extras) if extras else list(self._fields)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self.as_dict().items())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """转换为 dict，缺失的字段为 None"""
+        result = dict(zip(self._fields, self))
+        extras = tuple.__getitem__(self, -1)
+        if extras:
+            result.update(extras)
+        return result
@@ -13,6 +13,22 @@ MOVE_COLUMN = 'move_column'
 MODIFY_COLUMN_TYPE = 'modify_column_type'
 DELETE_COLUMN = 'delete_column'
 
+##### pagination #####
+LIST_ROWS_PAGE_SIZE = 1000
+QUERY_PAGE_SIZE = 10000
+BATCH_ROWS_LIMIT = 1000
+
+##### file transfer #####
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_LINK_TTL = 300
+FILE_TRANSFER_CONCURRENCY = 4
+
+##### row conversion #####
+CONVERTER_CACHE_SIZE = 64
+COMPACT_LAYOUT_CACHE_SIZE = 256
+DATE_CACHE_SIZE = 4096
+
 
 ##### column types #####
 @unique
@@ -9,7 +9,25 @@ class BaseUnauthError(ConnectionError):
 
 
 class SeatableApiException(Exception):
-    pass
+    """SeaTable 接口错误；由 HTTP 错误响应引起时 status 为响应状态码，否则为 None"""
+
+    def __init__(self, *args, status=None):
+        super().__init__(*args)
+        self.status = status
+
+
+class BatchRowsError(SeatableApiException):
+    """分块批量操作中部分块失败
+
+    result 为成功块合并后的响应，errors 为失败块列表，
+    每项包含 chunk（块序号）、start（起始下标）、size（行数）、error（异常）。
+    """
+
+    def __init__(self, result, errors, chunk_count):
+        self.result = result
+        self.errors = errors
+        self.chunk_count = chunk_count
+        super().__init__(f"{len(errors)} of {chunk_count} batch chunks failed: {errors[0]['error']}")
 
 
 class AccountApiAsyncException(Exception):
@@ -0,0 +1,281 @@
+"""表与 SQL 查询结果的流式导出：CSV、JSONL、Parquet
+
+逐页获取、转换并追加写入文件，内存中只保留当前页。Parquet 需要 pyarrow：
+    pip install seatable-api-async[analytics]
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import csv
+import io
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+
+from .compact_row import BUILTIN_FIELDS
+from .constants import ColumnTypes
+from .utils import convert_db_rows, import_optional, json_dumps
+
+__all__ = ["EXPORT_FORMATS", "export_pages", "guess_export_format"]
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+_NUMBER_TYPES = {ColumnTypes.NUMBER.value, ColumnTypes.DURATION.value, ColumnTypes.RATE.value}
+
+# (列名, 列类型)
+ExportColumn = Tuple[str, Optional[str]]
+
+
+def guess_export_format(path: str) -> str:
+    """按扩展名推断导出格式"""
+    fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"cannot infer export format from '{path}', pass format= one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def _export_columns(metadata: Optional[List[Dict[str, Any]]], rows: List[Dict[str, Any]]) -> List[ExportColumn]:
+    """列以查询结果的 metadata 为准，前面加上结果中包含的内置列，后面加上 metadata 未描述的首页键（如别名与计算列）"""
+    described = [(column["name"], column.get("type")) for column in metadata or []]
+    keys = dict.fromkeys(key for row in rows for key in row)
+    keys.update((name, None) for name, _ in described)
+    columns: List[ExportColumn] = [(name, None) for name in BUILTIN_FIELDS if name in keys]
+    columns += [(name, column_type) for name, column_type in described if name not in BUILTIN_FIELDS]
+    known = {name for name, _ in columns}
+    columns += [(key, _value_type([row.get(key) for row in rows])) for key in keys if key not in known]
+    return columns
+
+
+def _value_type(values: List[Any]) -> Optional[str]:
+    """没有列定义的键（如 COUNT(*) AS cnt）按首页的值推断为数字或复选框列"""
+    values = [value for value in values if value is not None]
+    if values and all(isinstance(value, bool) for value in values):
+        return ColumnTypes.CHECKBOX.value
+    if values and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return ColumnTypes.NUMBER.value
+    return None
+
+
+def _check_keys(names: frozenset, rows: List[Dict[str, Any]]) -> None:
+    """CSV 与 Parquet 的列在首页确定，之后才出现的键无法写入，报错而不是静默丢弃"""
+    for row in rows:
+        if not names.issuperset(row):
+            key = next(key for key in row if key not in names)
+            raise ValueError(f"column '{key}' is not in the export columns fixed by the first page, select it explicitly or export to jsonl")
+
+
+def _number(name: str, value: Any) -> Optional[float]:
+    """数字列的值转为 float，空值为 None，无法转换时报错"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise ValueError(f"cannot export {value!r} in column '{name}' as a number")
+
+
+def _boolean(name: str, value: Any) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    raise ValueError(f"cannot export {value!r} in column '{name}' as a checkbox")
+
+
+def _text(value: Any) -> Optional[str]:
+    """标量原样转为字符串，列表与字典序列化为 JSON"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, dict)):
+        return json_dumps(value).decode("utf-8")
+    return str(value)
+
+
+# ========== 写入器 ==========
+
+class _ExportWriter(abc.ABC):
+    """导出写入器：打开目标文件，按页追加写入，最后关闭"""
+
+    def __init__(self, path: str, columns: List[ExportColumn], **options: Any) -> None:
+        self.path = path
+        self.columns = columns
+        self.names = frozenset(name for name, _ in columns)
+        self.options = options
+        self._file: Any = None
+
+    @abc.abstractmethod
+    async def open(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        ...
+
+
+class _StreamWriter(_ExportWriter):
+    """逐页追加字节的文本格式；format_rows 在线程中执行，write 在事件循环中写文件"""
+
+    async def open(self) -> None:
+        self._file = await aiofiles.open(self.path, "wb")
+        header = self.header()
+        if header:
+            await self._file.write(header)
+
+    def header(self) -> bytes:
+        return b""
+
+    @abc.abstractmethod
+    def format_rows(self, rows: List[Dict[str, Any]]) -> bytes:
+        """把一页行序列化为要追加的字节"""
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        await self._file.write(await asyncio.to_thread(self.format_rows, rows))
+
+    async def close(self) -> None:
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+
+
+class _CsvWriter(_StreamWriter):
+    def _encode(self, records: List[List[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        return buffer.getvalue().encode("utf-8")
+
+    def header(self) -> bytes:
+        return self._encode([[name for name, _ in self.columns]])
+
+    def format_rows(self, rows: List[Dict[str, Any]]) -> bytes:
+        _check_keys(self.names, rows)
+        names = [name for name, _ in self.columns]
+        return self._encode([[_text(row.get(name)) for name in names] for row in rows])
+
+
+class _JsonlWriter(_StreamWriter):
+    def format_rows(self, rows: List[Dict[str, Any]]) -> bytes:
+        return b"".join(json_dumps(row) + b"\n" for row in rows)
+
+
+class _ParquetWriter(_ExportWriter):
+    """每页写入一个或多个 row group（row_group_size 控制上限），列类型由列定义决定
+
+    数字类列为 double，复选框为 bool，多选为 list<string>，其余列为 string（非标量值序列化为 JSON）。
+    数字列中无法转为 float 的值、复选框列中的非布尔值会报错，不会静默写为空值。
+    """
+
+    def __init__(self, path: str, columns: List[ExportColumn], **options: Any) -> None:
+        super().__init__(path, columns, **options)
+        self._pa = import_optional("pyarrow")
+        self._pq = import_optional("pyarrow.parquet")
+        pa = self._pa
+        fields = []
+        for name, column_type in columns:
+            if column_type in _NUMBER_TYPES:
+                arrow_type = pa.float64()
+            elif column_type == ColumnTypes.CHECKBOX.value:
+                arrow_type = pa.bool_()
+            elif column_type == ColumnTypes.MULTIPLE_SELECT.value:
+                arrow_type = pa.list_(pa.string())
+            else:
+                arrow_type = pa.string()
+            fields.append(pa.field(name, arrow_type))
+        self._schema = pa.schema(fields)
+
+    async def open(self) -> None:
+        self._file = await asyncio.to_thread(
+            self._pq.ParquetWriter, self.path, self._schema, compression=self.options.get("compression") or "snappy"
+        )
+
+    def _column_values(self, field: Any, rows: List[Dict[str, Any]]) -> List[Any]:
+        pa = self._pa
+        values = [row.get(field.name) for row in rows]
+        if field.type == pa.float64():
+            return [_number(field.name, v) for v in values]
+        if field.type == pa.bool_():
+            return [_boolean(field.name, v) for v in values]
+        if pa.types.is_list(field.type):
+            return [[_text(item) for item in v] if isinstance(v, list) else None for v in values]
+        return [_text(v) for v in values]
+
+    def _write_table(self, rows: List[Dict[str, Any]]) -> None:
+        pa = self._pa
+        _check_keys(self.names, rows)
+        arrays = [pa.array(self._column_values(field, rows), type=field.type) for field in self._schema]
+        table = pa.Table.from_arrays(arrays, schema=self._schema)
+        self._file.write_table(table, row_group_size=self.options.get("row_group_size"))
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._write_table, rows)
+
+    async def close(self) -> None:
+        if self._file is not None:
+            writer, self._file = self._file, None
+            await asyncio.to_thread(writer.close)
+
+
+_WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+
+
+async def export_pages(
+        pages: AsyncIterator[Dict[str, Any]],
+        path: str,
+        format: Optional[str] = None,
+        row_group_size: Optional[int] = None,
+        compression: Optional[str] = None,
+) -> int:
+    """把 dtable-db 查询的原始响应页（含 metadata 与 results）转换后写入文件
+
+    先写入 .part 临时文件，完成后再改名，失败时删除临时文件。
+
+    :param format: "csv"、"jsonl" 或 "parquet"，默认按扩展名推断
+    :param row_group_size: Parquet 单个 row group 的最大行数，默认每页一个 row group
+    :param compression: Parquet 压缩算法，默认 snappy
+    :return: 写入的行数
+    """
+    fmt = format or guess_export_format(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"unsupported export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+    part_path = f"{path}.part"
+    writer: Optional[_ExportWriter] = None
+    metadata: Optional[List[Dict[str, Any]]] = None
+    count = 0
+
+    async def open_writer(rows: List[Dict[str, Any]]) -> _ExportWriter:
+        # 列由 metadata 与第一页有结果的数据决定，之后各页按相同的列写入，出现新键时报错
+        opened = _WRITERS[fmt](part_path, _export_columns(metadata, rows), row_group_size=row_group_size, compression=compression)
+        await opened.open()
+        return opened
+
+    try:
+        async for data in pages:
+            metadata = data.get("metadata") or metadata
+            results = data.get("results") or []
+            if not results:
+                continue
+            rows = await asyncio.to_thread(convert_db_rows, metadata, results)
+            if writer is None:
+                writer = await open_writer(rows)
+            await writer.write(rows)
+            count += len(rows)
+        if writer is None:
+            # 没有任何结果时只写入查询结果的列
+            writer = await open_writer([])
+        await writer.close()
+    except BaseException:
+        if writer is not None:
+            await writer.close()
+        if await aiofiles.os.path.exists(part_path):
+            await aiofiles.os.remove(part_path)
+        raise
+    await aiofiles.os.replace(part_path, path)
+    return count
@@ -0,0 +1,226 @@
+"""请求埋点钩子与按接口统计的延迟直方图"""
+from __future__ import annotations
+
+import re
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+__all__ = ["RequestContext", "RequestHooks", "MetricsCollector", "endpoint_template"]
+
+# URL 到接口模板的匹配规则，按顺序匹配第一条
+_ENDPOINT_PATTERNS: List[Tuple[re.Pattern, Optional[str]]] = [
+    # dtable-server / api-gateway / v2.1 dtables 接口：.../dtables/{uuid}/rows/...
+    (re.compile(r"/dtables/[^/]+/([^/?]+)"), None),
+    # 以 API Token 调用的接口：.../api/v2.1/dtable/app-access-token/、.../dtable/custom/app-upload-link/
+    (re.compile(r"/api/v2\.1/dtable/((?:custom/)?[^/?]+)"), None),
+    # dtable-db 接口：.../api/v1/query/{uuid}/
+    (re.compile(r"/api/v1/([^/?]+)/[0-9a-fA-F-]{32,36}(?:/|$)"), None),
+    # 文件服务器
+    (re.compile(r"/upload-api/"), "upload"),
+    (re.compile(r"/files/"), "download"),
+]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape_label(value: Any) -> str:
+    """按 Prometheus 文本格式转义标签值中的反斜杠、双引号与换行"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def endpoint_template(url: str) -> str:
+    """将请求 URL 归类为接口模板，如 rows、query、links、app-access-token"""
+    for pattern, name in _ENDPOINT_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return name or match.group(1)
+    return "other"
+
+
+class RequestContext:
+    """一次 req() 调用的埋点上下文，重试共享同一个上下文"""
+
+    __slots__ = ("method", "url", "endpoint", "started", "attempt", "retries", "status", "response_bytes", "extra")
+
+    def __init__(self, method: str, url: str) -> None:
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.started = time.perf_counter()
+        self.attempt = 0
+        self.retries = 0
+        self.status: Optional[int] = None
+        self.response_bytes: Optional[int] = None
+        # 供钩子存放自定义数据
+        self.extra: Dict[str, Any] = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class RequestHooks:
+    """请求埋点钩子，按需重写其中的方法
+
+    on_request_start: 每次尝试发出请求前
+    on_response_headers: 收到响应头后
+    on_body_received: 读完响应体后
+    on_decoded: 请求成功结束，结果已生成
+    on_error: 请求以异常结束
+    """
+
+    def on_request_start(self, ctx: RequestContext) -> None:
+        pass
+
+    def on_response_headers(self, ctx: RequestContext, resp: Any) -> None:
+        pass
+
+    def on_body_received(self, ctx: RequestContext) -> None:
+        pass
+
+    def on_decoded(self, ctx: RequestContext) -> None:
+        pass
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> None:
+        pass
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsCollector(RequestHooks):
+    """进程内指标收集器，按 (接口模板, 方法) 统计延迟直方图、状态码、字节数、重试与错误
+
+    示例:
+        metrics = MetricsCollector()
+        async with SeaTableApiAsync(token, server_url, hooks=[metrics]) as api:
+            ...
+        print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = "seatable") -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self._statuses: Dict[Tuple[str, str, int], int] = {}
+        self._bytes: Dict[Tuple[str, str], int] = {}
+        self._retries: Dict[Tuple[str, str], int] = {}
+        self._errors: Dict[Tuple[str, str, str], int] = {}
+
+    def __str__(self) -> str:
+        return f"<SeaTable MetricsCollector [{len(self._histograms)} endpoints]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def on_body_received(self, ctx: RequestContext) -> None:
+        if ctx.response_bytes:
+            key = (ctx.endpoint, ctx.method)
+            self._bytes[key] = self._bytes.get(key, 0) + ctx.response_bytes
+
+    def on_decoded(self, ctx: RequestContext) -> None:
+        self._finish(ctx)
+
+    def on_error(self, ctx: RequestContext, error: BaseException) -> None:
+        key = (ctx.endpoint, ctx.method, type(error).__name__)
+        self._errors[key] = self._errors.get(key, 0) + 1
+        self._finish(ctx)
+
+    def _finish(self, ctx: RequestContext) -> None:
+        elapsed = ctx.elapsed
+        key = (ctx.endpoint, ctx.method)
+        hist = self._histograms.get(key)
+        if hist is None:
+            hist = self._histograms[key] = _Histogram(len(self.buckets) + 1)
+        hist.counts[bisect_left(self.buckets, elapsed)] += 1
+        hist.total += elapsed
+        hist.count += 1
+        if ctx.status is not None:
+            status_key = (ctx.endpoint, ctx.method, ctx.status)
+            self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+        if ctx.retries:
+            self._retries[key] = self._retries.get(key, 0) + ctx.retries
+
+    def quantile(self, endpoint: str, method: str, q: float) -> Optional[float]:
+        """按直方图估算分位数（取所在桶的上界），无数据时返回 None"""
+        hist = self._histograms.get((endpoint, method))
+        if not hist or not hist.count:
+            return None
+        rank = q * hist.count
+        cumulative = 0
+        for index, count in enumerate(hist.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def summary(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """各接口的请求数、平均耗时、p50/p99 估计值、响应字节数、重试与错误次数"""
+        errors: Dict[Tuple[str, str], int] = {}
+        for (endpoint, method, _), count in self._errors.items():
+            errors[(endpoint, method)] = errors.get((endpoint, method), 0) + count
+        return {
+            key: {
+                "count": hist.count,
+                "mean": hist.total / hist.count if hist.count else 0.0,
+                "p50": self.quantile(*key, 0.5),
+                "p99": self.quantile(*key, 0.99),
+                "bytes": self._bytes.get(key, 0),
+                "retries": self._retries.get(key, 0),
+                "errors": errors.get(key, 0),
+            }
+            for key, hist in self._histograms.items()
+        }
+
+    def reset(self) -> None:
+        """清空已收集的指标"""
+        self._histograms.clear()
+        self._statuses.clear()
+        self._bytes.clear()
+        self._retries.clear()
+        self._errors.clear()
+
+    def to_prometheus(self) -> str:
+        """导出为 Prometheus 文本格式"""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_request_duration_seconds SeaTable API request latency including retries.",
+            f"# TYPE {p}_request_duration_seconds histogram",
+        ]
+        for (endpoint, method), hist in sorted(self._histograms.items()):
+            labels = _labels(endpoint=endpoint, method=method)
+            cumulative = 0
+            for bound, count in zip(self.buckets, hist.counts):
+                cumulative += count
+                lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"{p}_request_duration_seconds_sum{{{labels}}} {hist.total}")
+            lines.append(f"{p}_request_duration_seconds_count{{{labels}}} {hist.count}")
+
+        lines += [f"# HELP {p}_responses_total SeaTable API responses by status.", f"# TYPE {p}_responses_total counter"]
+        for (endpoint, method, status), count in sorted(self._statuses.items()):
+            lines.append(f"{p}_responses_total{{{_labels(endpoint=endpoint, method=method, status=status)}}} {count}")
+
+        lines += [f"# HELP {p}_response_bytes_total SeaTable API response body bytes.", f"# TYPE {p}_response_bytes_total counter"]
+        for (endpoint, method), count in sorted(self._bytes.items()):
+            lines.append(f"{p}_response_bytes_total{{{_labels(endpoint=endpoint, method=method)}}} {count}")
+
+        lines += [f"# HELP {p}_request_retries_total SeaTable API request retries.", f"# TYPE {p}_request_retries_total counter"]
+        for (endpoint, method), count in sorted(self._retries.items()):
+            lines.append(f"{p}_request_retries_total{{{_labels(endpoint=endpoint, method=method)}}} {count}")
+
+        lines += [f"# HELP {p}_request_errors_total SeaTable API requests that raised.", f"# TYPE {p}_request_errors_total counter"]
+        for (endpoint, method, error), count in sorted(self._errors.items()):
+            lines.append(f"{p}_request_errors_total{{{_labels(endpoint=endpoint, method=method, error=error)}}} {count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,78 @@
+"""Base 元数据缓存"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .utils import MetadataIndex
+
+__all__ = ["MetadataCache"]
+
+
+class MetadataCache:
+    """带 TTL 的元数据缓存，索引由 MetadataIndex 提供
+
+    缓存过期或被 invalidate 后，下一次 load 重新下载元数据；
+    并发的 load 只会触发一次下载。
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.index: Optional[MetadataIndex] = None
+        self._valid = False
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        # 每次 invalidate 加一；下载期间发生失效时，下载结果可能是旧的表结构，需要丢弃
+        self._generation = 0
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self.index.metadata if self._valid and self.index else None
+
+    @property
+    def is_valid(self) -> bool:
+        return self._valid and time.monotonic() - self._loaded_at < self.ttl
+
+    def invalidate(self) -> None:
+        """使缓存失效，正在进行的下载结果也不会被采用"""
+        self._valid = False
+        self._generation += 1
+
+    async def load(self, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> MetadataCache:
+        """确保缓存有效，必要时调用 loader 重新下载元数据
+
+        下载期间缓存被 invalidate 时重新下载，避免把失效前的元数据标记为有效。
+        """
+        if self.is_valid:
+            return self
+        async with self._lock:
+            while not self.is_valid:
+                generation = self._generation
+                metadata = await loader()
+                if generation == self._generation:
+                    self.update(metadata)
+        return self
+
+    def update(self, metadata: Dict[str, Any]) -> None:
+        """用新的元数据重建索引"""
+        self.index = MetadataIndex(metadata)
+        self._valid = True
+        self._loaded_at = time.monotonic()
+
+    @property
+    def tables(self) -> List[Dict[str, Any]]:
+        return self.index.tables
+
+    def get_table(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """按表名查找表，表名形如表 ID 时也按 ID 查找"""
+        return self.index.get_table(table_name)
+
+    def get_table_by_id(self, table_id: str) -> Optional[Dict[str, Any]]:
+        return self.index.get_table_by_id(table_id)
+
+    def get_column_by_name(self, table_name: str, column_name: str) -> Optional[Dict[str, Any]]:
+        return self.index.get_column_by_name(table_name, column_name)
+
+    def get_column_by_key(self, table_name: str, column_key: str) -> Optional[Dict[str, Any]]:
+        return self.index.get_column_by_key(table_name, column_key)
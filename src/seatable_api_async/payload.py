@@ -0,0 +1,35 @@
+"""流式上传的请求体"""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import aiofiles
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.payload import Payload
+
+from .constants import UPLOAD_CHUNK_SIZE
+
+__all__ = ["AsyncFilePayload"]
+
+
+class AsyncFilePayload(Payload):
+    """通过 aiofiles 分块读取本地文件的请求体
+
+    大小在构造时确定，multipart 请求可以带上 Content-Length；
+    每次发送都重新打开文件，因此重试时可以再次发送。
+    """
+
+    def __init__(self, path: str, chunk_size: int = UPLOAD_CHUNK_SIZE, **kwargs: Any) -> None:
+        super().__init__(path, **kwargs)
+        self._chunk_size = chunk_size
+        self._size = os.path.getsize(path)
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        with open(self._value, "rb") as f:
+            return f.read().decode(encoding, errors)
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        async with aiofiles.open(self._value, "rb") as f:
+            while chunk := await f.read(self._chunk_size):
+                await writer.write(chunk)
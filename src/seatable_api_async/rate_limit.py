@@ -0,0 +1,80 @@
+"""客户端限流与退避"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+__all__ = ["RateLimiter", "backoff_delay", "parse_retry_after"]
+
+
+class RateLimiter:
+    """令牌桶限流器
+
+    每秒补充 rate 个令牌，最多积攒 burst 个。同一个实例可以传给多个客户端，
+    共享同一份配额。收到 429 时调用 pause 让所有共享者一起暂停。
+
+    示例:
+        limiter = RateLimiter(rate=5, burst=10)
+        async with SeaTableApiAsync(token, server_url, rate_limiter=limiter) as api:
+            ...
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        return f"<SeaTable RateLimiter [{self.rate}/s, burst {self.burst}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def acquire(self) -> None:
+        """取得一个令牌，不足时等待"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """暂停发放令牌 seconds 秒，并清空已积攒的令牌"""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """第 attempt 次重试（从 0 开始）的指数退避时间，带完全抖动"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头，支持秒数与 HTTP 日期两种格式"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,259 @@
+"""Base 的本地副本：首次全量加载，之后按 update-dtable 事件增量更新"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from .row_filter import compile_filter
+from .socket_io import SocketIOAsync
+from .utils import MetadataIndex, convert_operation, json_loads
+
+if TYPE_CHECKING:
+    from .seatable_api import SeaTableApiAsync
+
+__all__ = ["BaseReplica"]
+
+logger = logging.getLogger(__name__)
+
+# convert_operation 结果中不属于行数据的键
+_OPERATION_KEYS = ("op_type", "table_name")
+# 只影响视图显示、不影响行数据的操作
+_IGNORED_OP_MARKERS = ("view",)
+
+
+class BaseReplica(SocketIOAsync):
+    """Base 的内存副本，按行 ID 索引，读取不再请求服务器
+
+    连接后全量加载各表的行（加载期间的事件在完成后重放），之后应用 insert_row / modify_row / delete_row 及其批量形式的事件。
+    以下情况会在 resync_delay 秒后重新全量加载（期间收到的事件在加载完成后重放）：
+    事件序号不连续、断线重连、无法增量应用的操作（如增删列、改表名）。
+
+    示例:
+        async with SeaTableApiAsync(token, server_url) as api:
+            async with BaseReplica(api, tables=["Table1"]) as replica:
+                rows = replica.rows("Table1")
+                row = replica.get_row("Table1", row_id)
+                adults = replica.filter("Table1", "Age >= 18")
+    """
+
+    def __init__(
+            self,
+            seatable_api: "SeaTableApiAsync",
+            tables: Optional[Sequence[str]] = None,
+            resync_delay: float = 1.0,
+            concurrency: int = 1,
+    ) -> None:
+        """
+        :param tables: 需要复制的表名，默认全部表
+        :param resync_delay: 检测到缺失事件后延迟多少秒重新加载，合并短时间内的多次触发
+        :param concurrency: 全量加载时每张表同时在途的分页请求数
+        """
+        super().__init__(seatable_api)
+        self.tables = list(tables) if tables is not None else None
+        self.resync_delay = resync_delay
+        self.concurrency = concurrency
+        self.index: Optional[MetadataIndex] = None
+        self.version: Optional[int] = None
+        self.resync_count = 0
+        # 表 ID -> {行 ID: 行}
+        self._rows: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._ready = asyncio.Event()
+        self._connected_once = False
+        self._resync_task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+        # 加载期间收到的事件，加载完成后重放
+        self._pending: Optional[List[Dict[str, Any]]] = None
+
+    def __str__(self) -> str:
+        return f"<SeaTable BaseReplica [{self.seatable_api.dtable_name}]>"
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    async def wait_ready(self) -> None:
+        """等待首次加载或重新加载完成"""
+        await self._ready.wait()
+
+    async def connect(self) -> None:
+        """先建立 WebSocket 连接并开始缓冲事件，再全量加载，加载完成后重放缓冲的事件
+
+        先加载再加入房间的话，两者之间服务器发出的事件会丢失。
+        """
+        self._pending = []
+        try:
+            await super().connect()
+            await self.load()
+        except BaseException:
+            self._pending = None
+            if self.connected:
+                await super().disconnect()
+            raise
+
+    async def disconnect(self) -> None:
+        if self._resync_task:
+            self._resync_task.cancel()
+            self._resync_task = None
+        await super().disconnect()
+
+    # ========== 读取 ==========
+
+    def _table_rows(self, table_name: str) -> Dict[str, Dict[str, Any]]:
+        table = self.index.get_table(table_name) if self.index else None
+        if not table or table["_id"] not in self._rows:
+            raise ValueError(f"table '{table_name}' is not replicated")
+        return self._rows[table["_id"]]
+
+    def rows(self, table_name: str) -> List[Dict[str, Any]]:
+        """表的全部行，按加载与插入顺序"""
+        return list(self._table_rows(table_name).values())
+
+    def get_row(self, table_name: str, row_id: str) -> Optional[Dict[str, Any]]:
+        return self._table_rows(table_name).get(row_id)
+
+    def count(self, table_name: str) -> int:
+        return len(self._table_rows(table_name))
+
+    def filter(self, table_name: str, conditions: str) -> List[Dict[str, Any]]:
+        """按过滤表达式在本地筛选行，语法同 compile_filter"""
+        table = self.index.get_table(table_name) if self.index else None
+        columns = (table.get("columns") or []) if table else []
+        return compile_filter(conditions, columns).filter(self._table_rows(table_name).values())
+
+    # ========== 加载 ==========
+
+    def _selected_tables(self, index: MetadataIndex) -> List[Dict[str, Any]]:
+        if self.tables is None:
+            return index.tables
+        tables = []
+        for name in self.tables:
+            table = index.get_table(name)
+            if table is None:
+                raise ValueError(f"table '{name}' not found")
+            tables.append(table)
+        return tables
+
+    async def _load_table(self, table: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        rows: Dict[str, Dict[str, Any]] = {}
+        async for row in self.seatable_api.iter_rows(table["name"], concurrency=self.concurrency):
+            rows[row["_id"]] = row
+        return rows
+
+    async def load(self) -> None:
+        """重新获取元数据并全量加载各表，加载期间收到的事件在完成后重放"""
+        async with self._load_lock:
+            self._ready.clear()
+            # connect 中已开始缓冲时保留已收到的事件
+            if self._pending is None:
+                self._pending = []
+            try:
+                self.seatable_api.invalidate_metadata()
+                index = await self.seatable_api.get_metadata_index()
+                tables = self._selected_tables(index)
+                loaded = await asyncio.gather(*(self._load_table(table) for table in tables))
+                self.index = index
+                self._rows = {table["_id"]: rows for table, rows in zip(tables, loaded)}
+                for data in self._pending:
+                    self._apply(data)
+            finally:
+                self._pending = None
+                self._ready.set()
+        logger.info("[ SeaTable replica loaded %d tables ]", len(self._rows))
+
+    def resync(self) -> None:
+        """安排一次延迟的全量重新加载，已安排时不重复触发"""
+        if self._resync_task and not self._resync_task.done():
+            return
+        self._resync_task = asyncio.get_running_loop().create_task(self._resync())
+
+    async def _resync(self) -> None:
+        while True:
+            await asyncio.sleep(self.resync_delay)
+            self.resync_count += 1
+            try:
+                await self.load()
+                return
+            except Exception:
+                logger.exception("[ SeaTable replica resync failed, retrying ]")
+
+    # ========== 事件 ==========
+
+    async def _on_connect(self) -> None:
+        await super()._on_connect()
+        # 断线期间的事件已丢失
+        if self._connected_once:
+            self.resync()
+        self._connected_once = True
+
+    async def on_update_dtable(self, data: Any, index: Any = None, *args: Any) -> None:
+        """应用行变更事件；index 为事件序号时检测缺失的事件"""
+        if isinstance(index, int):
+            if self.version is not None and index <= self.version:
+                return
+            if self.version is not None and index > self.version + 1:
+                logger.warning("[ SeaTable replica missed events %d..%d ]", self.version + 1, index - 1)
+                self.resync()
+            self.version = index
+        try:
+            operation = json_loads(data) if isinstance(data, (str, bytes)) else data
+        except ValueError:
+            logger.warning("[ SeaTable replica received undecodable event ]")
+            self.resync()
+            return
+        if self._pending is not None:
+            self._pending.append(operation)
+            return
+        self._apply(operation)
+
+    def _apply(self, data: Dict[str, Any]) -> None:
+        op_type = data.get("op_type") or ""
+        rows = self._rows.get(data.get("table_id"))
+        if op_type in ("insert_row", "modify_row", "delete_row", "insert_rows", "modify_rows", "delete_rows"):
+            if rows is None:
+                # 未复制的表
+                return
+            try:
+                self._apply_rows(rows, data)
+            except (KeyError, TypeError, AttributeError):
+                logger.warning("[ SeaTable replica cannot apply %s, resyncing ]", op_type)
+                self.resync()
+            return
+        if any(marker in op_type for marker in _IGNORED_OP_MARKERS):
+            return
+        # 表结构等变化无法增量应用
+        logger.info("[ SeaTable replica resyncing after %s ]", op_type or "unknown operation")
+        self.resync()
+
+    def _apply_rows(self, rows: Dict[str, Dict[str, Any]], data: Dict[str, Any]) -> None:
+        op_type, table_id = data["op_type"], data["table_id"]
+        if op_type == "delete_row":
+            rows.pop(data["row_id"], None)
+        elif op_type == "delete_rows":
+            for row_id in data["row_ids"]:
+                rows.pop(row_id, None)
+        elif op_type == "insert_row":
+            self._put(rows, convert_operation(self.index, data), replace=True)
+        elif op_type == "modify_row":
+            self._put(rows, convert_operation(self.index, data), replace=False)
+        elif op_type == "insert_rows":
+            for row_data in data["row_datas"]:
+                operation = {"op_type": "insert_row", "table_id": table_id, "row_id": row_data["_id"], "row_data": row_data}
+                self._put(rows, convert_operation(self.index, operation), replace=True)
+        else:
+            for row_id, updated in data["updated"].items():
+                operation = {"op_type": "modify_row", "table_id": table_id, "row_id": row_id, "updated": updated}
+                self._put(rows, convert_operation(self.index, operation), replace=False)
+
+    def _put(self, rows: Dict[str, Dict[str, Any]], converted: Dict[str, Any], replace: bool) -> None:
+        row_id = converted["_id"]
+        cells = {key: value for key, value in converted.items() if key not in _OPERATION_KEYS}
+        current = rows.get(row_id)
+        if replace:
+            rows[row_id] = cells
+        elif current is not None:
+            current.update(cells)
+        else:
+            # 修改了副本中没有的行，说明之前漏掉了插入事件
+            logger.warning("[ SeaTable replica modified unknown row %s, resyncing ]", row_id)
+            self.resync()
@@ -0,0 +1,76 @@
+"""瞬时故障重试策略"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from .rate_limit import backoff_delay
+
+__all__ = ["RetryPolicy"]
+
+# 默认可安全重放的 HTTP 方法
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """网络错误与 5xx 响应的重试策略
+
+    GET/PUT/DELETE 默认可重试；POST 只有在调用处标记为幂等（如 SQL 查询）
+    或 retry_non_idempotent=True 时才重试，避免重复添加行。
+
+    重试预算：初始有 budget_min 个重试额度，每个请求存入 budget_ratio 个，
+    每次重试消耗 1 个，最多积攒 budget_min * 10 个。故障持续时重试量被限制在
+    请求量的 budget_ratio 左右，不会放大对服务器的压力。
+
+    示例:
+        policy = RetryPolicy(max_retries=5, attempt_timeout=20)
+        async with SeaTableApiAsync(token, server_url, retry_policy=policy) as api:
+            ...
+    """
+
+    def __init__(
+            self,
+            max_retries: int = 3,
+            backoff_base: float = 0.5,
+            backoff_max: float = 10.0,
+            attempt_timeout: Optional[float] = None,
+            retry_statuses: Iterable[int] = (500, 502, 503, 504),
+            retry_non_idempotent: bool = False,
+            budget_ratio: float = 0.2,
+            budget_min: int = 10,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.attempt_timeout = attempt_timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self._budget = float(budget_min)
+
+    def __str__(self) -> str:
+        return f"<SeaTable RetryPolicy [max_retries={self.max_retries}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def record_request(self) -> None:
+        """每个新请求存入重试额度"""
+        self._budget = min(self.budget_min * 10, self._budget + self.budget_ratio)
+
+    def should_retry(self, method: str, retries: int, idempotent: Optional[bool] = None) -> bool:
+        """判断第 retries 次重试（从 0 开始）是否允许，允许时消耗一个重试额度"""
+        if retries >= self.max_retries:
+            return False
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not (idempotent or self.retry_non_idempotent):
+            return False
+        if self._budget < 1:
+            return False
+        self._budget -= 1
+        return True
+
+    def delay(self, retries: int) -> float:
+        """第 retries 次重试前的等待时间"""
+        return backoff_delay(retries, self.backoff_base, self.backoff_max)
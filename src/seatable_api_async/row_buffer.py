@@ -0,0 +1,175 @@
+"""单行写操作合并缓冲区"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Literal, Optional, Set, TYPE_CHECKING
+
+from .constants import BATCH_ROWS_LIMIT
+from .exception import SeatableApiException
+
+if TYPE_CHECKING:
+    from .seatable_api import SeaTableApiAsync
+
+__all__ = ["RowWriteBuffer"]
+
+_Op = Literal["append", "update", "delete"]
+
+
+class _PendingBatch:
+    """同一张表、同一种操作的待发送批次"""
+
+    __slots__ = ("op", "apply_default", "items", "futures", "timer")
+
+    def __init__(self, op: _Op, apply_default: Optional[bool] = None) -> None:
+        self.op = op
+        self.apply_default = apply_default
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RowWriteBuffer:
+    """将多个协程的单行写操作合并为批量请求
+
+    按表排队，同一张表的操作类型（或 apply_default）切换、攒满 max_batch_size 行或等待超过 max_delay 秒时，
+    通过 batch_append_rows / batch_update_rows / batch_delete_rows 发送。
+    同一张表的批次按入队顺序依次发送，每个调用方等待自己那一行的结果。
+
+    示例:
+        async with SeaTableApiAsync(token, server_url) as api:
+            async with RowWriteBuffer(api) as buffer:
+                await asyncio.gather(*(buffer.append_row("Table1", row) for row in rows))
+    """
+
+    def __init__(
+            self,
+            seatable_api: "SeaTableApiAsync",
+            max_batch_size: int = BATCH_ROWS_LIMIT,
+            max_delay: float = 0.05,
+    ) -> None:
+        if not 0 < max_batch_size <= BATCH_ROWS_LIMIT:
+            raise ValueError(f"max_batch_size must be between 1 and {BATCH_ROWS_LIMIT}")
+        self.seatable_api = seatable_api
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[str, _PendingBatch] = {}
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def __str__(self) -> str:
+        return f"<SeaTable RowWriteBuffer [{self.seatable_api.dtable_name}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self) -> RowWriteBuffer:
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.close()
+
+    async def append_row(self, table_name: str, row_data: Dict[str, Any], apply_default: Optional[bool] = None) -> Any:
+        """添加行，返回该行在批量响应中的 row_ids 项；响应不含 row_ids 时返回所在批次的响应"""
+        return await self._enqueue(table_name, "append", row_data, apply_default)
+
+    async def update_row(self, table_name: str, row_id: str, row_data: Dict[str, Any]) -> Dict[str, Any]:
+        """更新行，返回 {"row_id": 行 ID, "success": 所在批次是否成功}"""
+        return await self._enqueue(table_name, "update", {"row_id": row_id, "row": row_data})
+
+    async def delete_row(self, table_name: str, row_id: str) -> Dict[str, Any]:
+        """删除行，返回 {"row_id": 行 ID, "deleted": 是否已删除}
+
+        批量响应只有删除总数：全部删除时为 True，均未删除时为 False，部分删除时无法区分各行，为 None。
+        """
+        return await self._enqueue(table_name, "delete", row_id)
+
+    async def flush(self, table_name: Optional[str] = None) -> None:
+        """立即发送待发送的批次，并等待已发出的批次完成"""
+        for name in [table_name] if table_name else list(self._pending):
+            self._start_flush(name)
+        if table_name:
+            tasks = [self._tails[table_name]] if table_name in self._tails else []
+        else:
+            tasks = list(self._tasks)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def close(self) -> None:
+        """发送剩余批次并停止接收新的写操作"""
+        self._closed = True
+        await self.flush()
+
+    def _enqueue(self, table_name: str, op: _Op, item: Any, apply_default: Optional[bool] = None) -> asyncio.Future:
+        if self._closed:
+            raise SeatableApiException("RowWriteBuffer is closed")
+        batch = self._pending.get(table_name)
+        if batch and (batch.op != op or batch.apply_default != apply_default):
+            # 操作类型切换时先发出之前的批次，保证同一张表的写入顺序
+            self._start_flush(table_name)
+            batch = None
+        if batch is None:
+            batch = self._pending[table_name] = _PendingBatch(op, apply_default)
+            batch.timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush, table_name)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.max_batch_size:
+            self._start_flush(table_name)
+        return future
+
+    def _start_flush(self, table_name: str) -> None:
+        batch = self._pending.pop(table_name, None)
+        if batch is None:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(table_name, batch, self._tails.get(table_name)))
+        self._tails[table_name] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._on_sent(table_name, t))
+
+    def _on_sent(self, table_name: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._tails.get(table_name) is task:
+            del self._tails[table_name]
+
+    async def _send(self, table_name: str, batch: _PendingBatch, previous: Optional[asyncio.Task]) -> None:
+        if previous:
+            await asyncio.wait([previous])
+        try:
+            if batch.op == "append":
+                res = await self.seatable_api.batch_append_rows(table_name, batch.items, apply_default=batch.apply_default)
+                row_ids = res.get("row_ids") if isinstance(res, dict) else None
+                if isinstance(row_ids, list) and len(row_ids) == len(batch.futures):
+                    results = row_ids
+                else:
+                    results = [res] * len(batch.futures)
+            elif batch.op == "update":
+                res = await self.seatable_api.batch_update_rows(table_name, batch.items)
+                success = bool((res or {}).get("success", True))
+                results = [{"row_id": item["row_id"], "success": success} for item in batch.items]
+            else:
+                res = await self.seatable_api.batch_delete_rows(table_name, batch.items)
+                deleted_rows = (res or {}).get("deleted_rows")
+                if deleted_rows == len(set(batch.items)):
+                    deleted: Optional[bool] = True
+                elif deleted_rows == 0:
+                    deleted = False
+                else:
+                    deleted = None
+                results = [{"row_id": row_id, "deleted": deleted} for row_id in batch.items]
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
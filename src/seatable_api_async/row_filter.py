@@ -0,0 +1,301 @@
+"""本地行过滤：把过滤表达式编译为谓词，按 column.py 的列类型语义在已获取的行上过滤
+
+表达式语法:
+    condition  := column op value
+    op         := = | != | > | >= | < | <= | like
+    expression := condition | expression and expression | expression or expression | ( expression )
+
+列名或值包含空格、括号、引号、比较符号时用单引号或双引号括起来，如
+    "Name like 'abc%' and (Age >= 18 or '出生日期' < '2000-01-01')"
+"""
+from __future__ import annotations
+
+import functools
+import operator
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+from .column import (
+    NULL_LIST,
+    BaseColumn,
+    CheckBoxColumn,
+    CTimeColumn,
+    DateColumn,
+    LongTextColumn,
+    MultiSelectColumn,
+    NumberColumn,
+    TextColumn,
+    _parse_date_str,
+    get_column_by_type,
+)
+from .constants import DATE_CACHE_SIZE, ColumnTypes
+
+__all__ = ["RowFilter", "compile_filter"]
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# 不在列定义中的内置列
+_BUILTIN_COLUMN_TYPES = {
+    "_id": ColumnTypes.TEXT.value,
+    "_ctime": ColumnTypes.CTIME.value,
+    "_mtime": ColumnTypes.MTIME.value,
+}
+
+_NULLS = tuple(NULL_LIST)
+
+_COMPARATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+# ========== 词法与语法 ==========
+
+class _FilterGrammar:
+    """ply 词法与语法规则，解析结果为 ("and"|"or", 左, 右) 或 ("cond", 列名, 运算符, 值)"""
+
+    reserved = {"and": "AND", "or": "OR", "like": "LIKE"}
+    tokens = ["STRING", "QUOTE_STRING", "EQUAL", "NOT_EQUAL", "GTE", "GT", "LTE", "LT", "LPAREN", "RPAREN"] + list(reserved.values())
+
+    t_ignore = " \t\r\n"
+    t_NOT_EQUAL = r"!="
+    t_GTE = r">="
+    t_LTE = r"<="
+    t_EQUAL = r"="
+    t_GT = r">"
+    t_LT = r"<"
+    t_LPAREN = r"\("
+    t_RPAREN = r"\)"
+
+    precedence = (
+        ("left", "OR"),
+        ("left", "AND"),
+    )
+
+    def t_QUOTE_STRING(self, t):
+        r"\"[^\"]*\"|'[^']*'"
+        t.value = t.value[1:-1]
+        return t
+
+    def t_STRING(self, t):
+        r"[^\s=!<>()'\"]+"
+        t.type = self.reserved.get(t.value.lower(), "STRING")
+        return t
+
+    def t_error(self, t):
+        raise ValueError(f"Illegal character '{t.value[0]}' at position {t.lexpos}")
+
+    def p_expression_binary(self, p):
+        """expression : expression AND expression
+                      | expression OR expression"""
+        p[0] = (p[2].lower(), p[1], p[3])
+
+    def p_expression_group(self, p):
+        """expression : LPAREN expression RPAREN"""
+        p[0] = p[2]
+
+    def p_expression_condition(self, p):
+        """expression : term operator term"""
+        p[0] = ("cond", p[1], p[2].lower(), p[3])
+
+    def p_operator(self, p):
+        """operator : EQUAL
+                    | NOT_EQUAL
+                    | GTE
+                    | GT
+                    | LTE
+                    | LT
+                    | LIKE"""
+        p[0] = p[1]
+
+    def p_term(self, p):
+        """term : STRING
+                | QUOTE_STRING"""
+        p[0] = p[1]
+
+    def p_error(self, p):
+        if p is None:
+            raise ValueError("Unexpected end of filter expression")
+        raise ValueError(f"Syntax error at '{p.value}' (position {p.lexpos})")
+
+
+_grammar = _FilterGrammar()
+_lexer = lex.lex(module=_grammar)
+_parser = yacc.yacc(module=_grammar, write_tables=False, debug=False)
+# ply 解析器保存了解析状态，不能并发使用
+_parser_lock = threading.Lock()
+
+
+def _parse(expression: str) -> tuple:
+    if not expression or not expression.strip():
+        raise ValueError("filter expression cannot be empty")
+    with _parser_lock:
+        return _parser.parse(expression, lexer=_lexer.clone())
+
+
+# ========== 谓词编译 ==========
+
+def _like_matcher(pattern: str) -> Callable[[str], bool]:
+    """对应 StringColumnValue.like"""
+    if "%" not in pattern:
+        raise ValueError('There is no patterns found in "like" phrases')
+    if pattern[0] != "%" and pattern[-1] == "%":
+        start = pattern[:-1]
+        return lambda text: text.startswith(start)
+    if pattern[0] == "%" and pattern[-1] != "%":
+        end = pattern[1:]
+        return lambda text: text.endswith(end)
+    if pattern[0] == "%" and pattern[-1] == "%":
+        middle = pattern[1:-1]
+        return lambda text: middle in text
+    parts = pattern.split("%")
+    start, end = parts[0], parts[-1]
+    return lambda text: text.startswith(start) and text.endswith(end)
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_cell(value: str) -> Optional[datetime]:
+    """日期单元格：list_rows 返回的 ISO 格式（如 2025-09-23T19:30:00+08:00）取其日期时间并忽略时区，其余按查询值格式解析"""
+    if len(value) > 10 and value[10] == "T":
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    return _parse_date_str(value)
+
+
+def _date_cell_parser(column: DateColumn) -> Callable[[Any], Any]:
+    def parse(value: Any) -> Any:
+        if not value:
+            return ""
+        try:
+            return _parse_date_cell(value)
+        except (ValueError, TypeError, AttributeError):
+            return column.raise_error(value)
+    return parse
+
+
+def _cell_parser(column: BaseColumn) -> Optional[Callable[[Any], Any]]:
+    """单元格值的转换函数，与各列类型 parse_table_value 包装前的处理一致，None 表示原样使用"""
+    if isinstance(column, CTimeColumn):
+        return column.get_local_time
+    if isinstance(column, DateColumn):
+        return _date_cell_parser(column)
+    if isinstance(column, LongTextColumn):
+        return lambda value: (value or "").strip("\n")
+    return None
+
+
+def _compile_condition(column_name: str, column_type: str, op: str, term: str) -> Predicate:
+    """把单个条件编译为谓词，查询值只解析一次，逐行时不创建 ColumnValue 对象"""
+    column = get_column_by_type(column_type)
+    value = column.parse_input_value(term)
+    parse_cell = _cell_parser(column)
+
+    def cell(row: Dict[str, Any]) -> Any:
+        raw = row.get(column_name)
+        return parse_cell(raw) if parse_cell else raw
+
+    if isinstance(column, CheckBoxColumn):
+        # BoolColumnValue
+        if op == "=":
+            return lambda row: bool(row.get(column_name)) == value
+        if op == "!=":
+            return lambda row: bool(row.get(column_name)) != value
+    elif isinstance(column, MultiSelectColumn):
+        # ListColumnValue
+        if op == "=":
+            if not value:
+                return lambda row: row.get(column_name) in _NULLS
+            return lambda row: value in (row.get(column_name) or ())
+        if op == "!=":
+            if not value:
+                return lambda row: row.get(column_name) not in _NULLS
+            return lambda row: value not in (row.get(column_name) or ())
+    else:
+        if op == "=":
+            if value == "":
+                return lambda row: cell(row) in _NULLS
+            return lambda row: cell(row) == value
+        if op == "!=":
+            if value == "":
+                return lambda row: cell(row) not in _NULLS
+            return lambda row: cell(row) != value
+
+    if op == "like":
+        # 只有文本类列（StringColumnValue）支持模糊匹配
+        if not isinstance(column, TextColumn):
+            raise ValueError(f"{column_type} type column does not support the query method 'like'")
+        match = _like_matcher(value)
+        return lambda row: match(cell(row) or "")
+
+    # 比较运算只有数字与日期类列支持，对应 NumberDateColumnValue
+    if not isinstance(column, (NumberColumn, DateColumn)):
+        raise ValueError(f"{column_type} type column does not support the query method '{op}'")
+    if value == "":
+        raise ValueError("""The token ">", ">=", "<", "<=" does not support the null query string "".""")
+    compare = _COMPARATORS[op]
+
+    def predicate(row: Dict[str, Any]) -> bool:
+        current = cell(row)
+        return compare(current, value) if current not in _NULLS else False
+
+    return predicate
+
+
+class RowFilter:
+    """编译后的行过滤器，可重复用于多批行
+
+    示例:
+        columns = await api.list_columns("Table1")
+        row_filter = compile_filter("Name like 'abc%' and Age > 18", columns)
+        matched = row_filter.filter(rows)
+        async for row in row_filter.filter_async(api.iter_rows("Table1")):
+            ...
+    """
+
+    def __init__(self, expression: str, columns: Iterable[Dict[str, Any]]) -> None:
+        self.expression = expression
+        self._column_types = dict(_BUILTIN_COLUMN_TYPES)
+        self._column_types.update({column["name"]: column.get("type") for column in columns})
+        self._predicate = self._compile(_parse(expression))
+
+    def __str__(self) -> str:
+        return f"<SeaTable RowFilter [{self.expression}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _compile(self, node: tuple) -> Predicate:
+        kind = node[0]
+        if kind == "cond":
+            _, column_name, op, term = node
+            if column_name not in self._column_types:
+                raise ValueError(f"column '{column_name}' not found")
+            return _compile_condition(column_name, self._column_types[column_name], op, term)
+        left, right = self._compile(node[1]), self._compile(node[2])
+        if kind == "and":
+            return lambda row: left(row) and right(row)
+        return lambda row: left(row) or right(row)
+
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        return self._predicate(row)
+
+    def filter(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """返回满足条件的行"""
+        predicate = self._predicate
+        return [row for row in rows if predicate(row)]
+
+    async def filter_async(self, rows: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """逐行过滤异步迭代器，如 api.iter_rows(...)"""
+        predicate = self._predicate
+        async for row in rows:
+            if predicate(row):
+                yield row
+
+
+def compile_filter(expression: str, columns: Iterable[Dict[str, Any]]) -> RowFilter:
+    """编译过滤表达式
+
+    :param expression: 过滤表达式，如 "Name = 'abc' and Age >= 18"
+    :param columns: 表的列定义（含 name 与 type），用于确定各列的比较语义
+    """
+    return RowFilter(expression, columns)
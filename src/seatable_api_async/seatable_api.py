@@ -1,13 +1,21 @@
 """SeaTable Base API 异步客户端"""
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from json import JSONDecodeError, loads as json_loads
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from json import JSONDecodeError
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Literal, Optional, Sequence, Set, Tuple, Type, Union
 from urllib import parse
 from uuid import UUID
 
 import aiofiles
+import aiofiles.os
 import aiohttp
 
 from .constants import (
@@ -18,12 +26,72 @@ from .constants import (
     FREEZE_COLUMN,
     MOVE_COLUMN,
     MODIFY_COLUMN_TYPE,
+    LIST_ROWS_PAGE_SIZE,
+    QUERY_PAGE_SIZE,
+    BATCH_ROWS_LIMIT,
+    DOWNLOAD_CHUNK_SIZE,
+    UPLOAD_LINK_TTL,
+    FILE_TRANSFER_CONCURRENCY,
+)
+from .auth_cache import AuthCache
+from .compact_row import CompactRow
+from .exception import BaseUnauthError, BatchRowsError, SeatableApiException
+from .export import export_pages
+from .instrumentation import RequestContext, RequestHooks
+from .metadata_cache import MetadataCache
+from .payload import AsyncFilePayload
+from .rate_limit import RateLimiter, backoff_delay, parse_retry_after
+from .retry import RetryPolicy
+from .row_filter import compile_filter
+from .snapshot import TableSnapshot
+from .utils import (
+    parse_server_url,
+    parse_headers,
+    like_table_id,
+    convert_db_rows,
+    path_get,
+    split_sql_limit,
+    is_select_sql,
+    merge_batch_results,
+    json_loads,
+    json_dumps,
+    parse_jwt_exp,
+    MetadataIndex,
 )
-from .exception import BaseUnauthError, SeatableApiException
-from .utils import parse_server_url, parse_headers, like_table_id, convert_db_rows, path_get
 
 __all__ = ["SeaTableApiAsync"]
 
+logger = logging.getLogger(__name__)
+
+# JWT 提前刷新的时间，避免在请求过程中过期
+JWT_REFRESH_BUFFER = timedelta(minutes=5)
+# 无法从 JWT 中读取 exp 时假定的有效期
+JWT_DEFAULT_LIFETIME = timedelta(days=3)
+# 上传服务器对过期或无效的上传链接返回的状态码
+_EXPIRED_LINK_STATUSES = frozenset({401, 403, 404})
+# 配置了 auth_cache 时，请求返回这些状态码视为缓存的 JWT 已失效
+_REJECTED_JWT_STATUSES = frozenset({401, 403})
+
+
+def _cancel_tasks(tasks: Iterable[asyncio.Future]) -> None:
+    """取消未完成的后台任务，并取走已完成任务的异常，避免未处理异常告警"""
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
+
+
+def _invalidates_metadata(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """装饰修改表结构的方法，调用后使元数据缓存失效"""
+    @functools.wraps(func)
+    async def wrapper(self: SeaTableApiAsync, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            self.invalidate_metadata()
+    return wrapper
+
 
 class SeaTableApiAsync:
     """SeaTable Base API 异步客户端
@@ -39,13 +107,31 @@ class SeaTableApiAsync:
             server_url: str,
             use_api_gateway: bool = False,
             proxy: Optional[str] = None,
-            timeout: int = 30
+            timeout: int = 30,
+            batch_concurrency: int = 1,
+            metadata_ttl: Optional[float] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            rate_limit_retries: int = 3,
+            retry_policy: Optional[RetryPolicy] = None,
+            session: Optional[aiohttp.ClientSession] = None,
+            auto_refresh: bool = False,
+            auth_cache: Optional[AuthCache] = None,
+            hooks: Optional[Sequence[RequestHooks]] = None,
     ) -> None:
         self.token = token
         self.server_url = server_url.strip().rstrip("/")
         self.use_api_gateway = use_api_gateway
         self.proxy = proxy
         self.timeout = timeout
+        # 批量操作分块后同时在途的请求数
+        self.batch_concurrency = batch_concurrency
+        # 元数据缓存，metadata_ttl 为 None 时不缓存
+        self.metadata_cache: Optional[MetadataCache] = MetadataCache(metadata_ttl) if metadata_ttl else None
+        # 请求限流器，可在多个客户端间共享；429 响应最多重试 rate_limit_retries 次
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        # 网络错误与 5xx 的重试策略，为 None 时不重试
+        self.retry_policy = retry_policy
 
         # 认证后填充
         self.dtable_server_url: Optional[str] = None
@@ -57,7 +143,23 @@ class SeaTableApiAsync:
         self.dtable_uuid: Optional[str] = None
         self.dtable_name: Optional[str] = None
         self.is_authed = False
-        self.session: Optional[aiohttp.ClientSession] = None
+        # 外部传入的 session 由调用方负责关闭
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+
+        # JWT 刷新：并发请求共享同一次刷新；auto_refresh 时在后台提前续期
+        self.auto_refresh = auto_refresh
+        self._auth_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # 认证结果的磁盘缓存，冷启动时可跳过 app-access-token 请求
+        self.auth_cache = auth_cache
+        # 请求埋点钩子，如 MetricsCollector；为空时不创建埋点上下文
+        self.hooks: List[RequestHooks] = list(hooks or ())
+
+        # 上传链接在有效期内复用
+        self._upload_info: Optional[Dict[str, Any]] = None
+        self._upload_info_time = 0.0
+        self._upload_info_lock = asyncio.Lock()
 
     def __str__(self) -> str:
         return f"<SeaTable Base [{self.dtable_name}]>"
@@ -66,15 +168,19 @@ class SeaTableApiAsync:
         return self.__str__()
 
     async def __aenter__(self) -> SeaTableApiAsync:
-        self.session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(limit=100, limit_per_host=30),
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-        )
+        if self._owns_session:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
         await self.auth()
+        if self.auto_refresh:
+            self.start_auto_refresh()
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        if self.session:
+        self.stop_auto_refresh()
+        if self.session and self._owns_session:
             await self.session.close()
 
     def _table_params(self, table_name: str, **extra: Any) -> Dict[str, Any]:
@@ -93,6 +199,39 @@ class SeaTableApiAsync:
             params["other_table_id"] = other_table_name
         return params
 
+    async def _dispatch_chunks(
+            self,
+            send: Callable[[List[Any]], Awaitable[Dict[str, Any]]],
+            items: List[Any],
+            chunk_size: int,
+            concurrency: Optional[int],
+    ) -> Dict[str, Any]:
+        """将批量数据分块并发发送，合并各块响应"""
+        if not 0 < chunk_size <= BATCH_ROWS_LIMIT:
+            raise ValueError(f"chunk_size must be between 1 and {BATCH_ROWS_LIMIT}")
+        if len(items) <= chunk_size:
+            return await send(items)
+
+        starts = range(0, len(items), chunk_size)
+        semaphore = asyncio.Semaphore(concurrency or self.batch_concurrency)
+
+        async def run(start: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await send(items[start:start + chunk_size])
+
+        outcomes = await asyncio.gather(*(run(start) for start in starts), return_exceptions=True)
+        results: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        for index, (start, outcome) in enumerate(zip(starts, outcomes)):
+            if isinstance(outcome, BaseException):
+                errors.append({"chunk": index, "start": start, "size": len(items[start:start + chunk_size]), "error": outcome})
+            else:
+                results.append(outcome)
+        merged = merge_batch_results(results)
+        if errors:
+            raise BatchRowsError(merged, errors, len(starts))
+        return merged
+
     # ========== HTTP 请求 ==========
 
     async def req(
@@ -101,7 +240,7 @@ class SeaTableApiAsync:
             url: str,
             json: Optional[Dict[str, Any]] = None,
             data: Optional[Dict[str, Any]] = None,
-            file: Optional[Tuple[str, bytes]] = None,
+            file: Optional[Tuple[str, Union[bytes, aiohttp.payload.Payload]]] = None,
             params: Optional[Dict[str, Any]] = None,
             headers: Optional[Dict[str, str]] = None,
             proxy: Optional[str] = None,
@@ -109,8 +248,14 @@ class SeaTableApiAsync:
             response_type: Optional[Literal["json", "text", "bytes"]] = None,
             res_path: Optional[str] = None,
             is_check_auth: bool = True,
+            idempotent: Optional[bool] = None,
+            response_handler: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
     ) -> Any:
-        """发送 HTTP 请求"""
+        """发送 HTTP 请求
+
+        :param idempotent: 请求能否安全重放，None 时按 HTTP 方法判断，仅在配置了 retry_policy 时生效
+        :param response_handler: 成功响应的处理函数，直接消费响应体（如流式写文件），其返回值作为请求结果
+        """
         if is_check_auth and not self.is_authed:
             raise BaseUnauthError
 
@@ -118,14 +263,8 @@ class SeaTableApiAsync:
         token_type = token_type or "JWT"
 
         # 检查 JWT token 是否即将过期，如果是则自动续期
-        # 提前 5 分钟刷新，避免在请求过程中过期
         if is_check_auth and token_type == "JWT" and self.jwt_exp:
-            buffer_time = timedelta(minutes=5)
-            now = datetime.now()
-            threshold = now + buffer_time
-            if threshold >= self.jwt_exp:
-                # Token 即将过期或已过期，自动刷新
-                await self.auth()
+            await self.ensure_token_fresh()
 
         # URL 末尾加斜杠
         if not url.endswith("/"):
@@ -139,54 +278,174 @@ class SeaTableApiAsync:
         if headers:
             req_headers.update(headers)
 
-        # 清理 None 值
-        if json:
-            json = {k: v for k, v in json.items() if v is not None}
+        # 清理 None 值，JSON 请求体由当前 JSON 后端序列化
+        body: Optional[bytes] = None
+        if json is not None:
+            body = json_dumps({k: v for k, v in json.items() if v is not None})
+            req_headers.setdefault("Content-Type", "application/json")
         if data:
             data = {k: v for k, v in data.items() if v is not None}
         if params:
             params = {k: str(v) for k, v in params.items() if v is not None}
 
-        # 处理文件上传
-        req_data: Any = data
-        if file is not None:
-            form_data = aiohttp.FormData()
-            form_data.add_field(name="file", value=file[1], filename=file[0])
-            if data:
-                for k, v in data.items():
-                    form_data.add_field(name=k, value=str(v))
-            req_data = form_data
-
-        resp = await self.session.request(
-            method=method,
-            url=url,
-            headers=req_headers,
-            json=json,
-            data=req_data,
-            params=params,
-            proxy=proxy or self.proxy,
-        )
-
-        status = resp.status
-        text = await resp.text()
+        send_args = (method, url, req_headers, body, data, file, params, proxy, response_type, res_path, idempotent, response_handler)
+        try:
+            return await self._send_with_hooks(send_args)
+        except SeatableApiException as e:
+            if not (self.auth_cache and is_check_auth and token_type == "JWT" and e.status in _REJECTED_JWT_STATUSES):
+                raise
+        # 磁盘缓存中的 JWT 可能已被服务器作废：删除缓存并重新认证后重发一次
+        await self._reauth(token)
+        req_headers["Authorization"] = f"Token {self.jwt_token}"
+        return await self._send_with_hooks(send_args)
+
+    async def _send_with_hooks(self, send_args: Tuple[Any, ...]) -> Any:
+        if not self.hooks:
+            return await self._send(*send_args)
+
+        # 埋点：重试共享同一个上下文，请求结束时触发 on_decoded 或 on_error
+        ctx = RequestContext(send_args[0], send_args[1])
+        try:
+            result = await self._send(*send_args, ctx=ctx)
+        except BaseException as e:
+            self._emit("on_error", ctx, e)
+            raise
+        self._emit("on_decoded", ctx)
+        return result
+
+    def _emit(self, event: str, ctx: RequestContext, *args: Any) -> None:
+        """调用各钩子的 event 方法，钩子抛出的异常只记录日志，不影响请求"""
+        for hook in self.hooks:
+            try:
+                getattr(hook, event)(ctx, *args)
+            except Exception:
+                logger.exception("Request hook %r failed in %s", hook, event)
+
+    async def _send(
+            self,
+            method: str,
+            url: str,
+            req_headers: Dict[str, str],
+            body: Optional[bytes],
+            data: Optional[Dict[str, Any]],
+            file: Optional[Tuple[str, Union[bytes, aiohttp.payload.Payload]]],
+            params: Optional[Dict[str, Any]],
+            proxy: Optional[str],
+            response_type: Optional[str],
+            res_path: Optional[str],
+            idempotent: Optional[bool],
+            response_handler: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]],
+            ctx: Optional[RequestContext] = None,
+    ) -> Any:
+        """发送已构建好的请求，处理限流、重试与响应解析"""
+        policy = self.retry_policy
+        if policy:
+            policy.record_request()
+        # 单次尝试的超时时间，未配置时沿用 session 的超时
+        extra: Dict[str, Any] = {}
+        if policy and policy.attempt_timeout:
+            extra["timeout"] = aiohttp.ClientTimeout(total=policy.attempt_timeout)
+
+        throttled = 0
+        retries = 0
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+
+            # 处理文件上传，FormData 只能发送一次，每次尝试重新构建
+            req_data: Any = body if body is not None else data
+            if file is not None:
+                form_data = aiohttp.FormData()
+                form_data.add_field(name="file", value=file[1], filename=file[0])
+                if data:
+                    for k, v in data.items():
+                        form_data.add_field(name=k, value=str(v))
+                req_data = form_data
+
+            if ctx:
+                ctx.attempt += 1
+                self._emit("on_request_start", ctx)
+            try:
+                resp = await self.session.request(
+                    method=method,
+                    url=url,
+                    headers=req_headers,
+                    data=req_data,
+                    params=params,
+                    proxy=proxy or self.proxy,
+                    **extra,
+                )
+                status = resp.status
+                if ctx:
+                    ctx.status = status
+                    self._emit("on_response_headers", ctx, resp)
+
+                if status == 429 and throttled < self.rate_limit_retries:
+                    # 429 时请求未被处理，按 Retry-After 或指数退避等待后重试
+                    delay = parse_retry_after(resp.headers.get("Retry-After"))
+                    if delay is None:
+                        delay = backoff_delay(throttled)
+                    resp.release()
+                    if self.rate_limiter:
+                        self.rate_limiter.pause(delay)
+                    await asyncio.sleep(delay)
+                    throttled += 1
+                    if ctx:
+                        ctx.retries += 1
+                    continue
+
+                if policy and status in policy.retry_statuses and policy.should_retry(method, retries, idempotent):
+                    resp.release()
+                    await asyncio.sleep(policy.delay(retries))
+                    retries += 1
+                    if ctx:
+                        ctx.retries += 1
+                    continue
+
+                if response_handler and status < 400:
+                    try:
+                        result = await response_handler(resp)
+                    finally:
+                        resp.release()
+                    if ctx:
+                        # 响应体由 response_handler 流式消费，按已接收的字节数上报
+                        ctx.response_bytes = resp.content.total_bytes
+                        self._emit("on_body_received", ctx)
+                    return result
+
+                content = await resp.read()
+                if ctx:
+                    ctx.response_bytes = len(content)
+                    self._emit("on_body_received", ctx)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError):
+                if policy and policy.should_retry(method, retries, idempotent):
+                    await asyncio.sleep(policy.delay(retries))
+                    retries += 1
+                    if ctx:
+                        ctx.retries += 1
+                    continue
+                raise
+            break
 
-        if status == 429:
-            raise SeatableApiException("429 Too Many Requests")
-        if status == 404:
-            raise SeatableApiException(f"404 Not Found: {url}")
-        if status in (400, 403):
-            raise SeatableApiException(text)
         if status >= 400:
-            raise SeatableApiException(f"HTTP {status}: {text[:200]}")
+            text = content.decode(resp.get_encoding(), errors="replace")
+            if status == 429:
+                raise SeatableApiException("429 Too Many Requests", status=status)
+            if status == 404:
+                raise SeatableApiException(f"404 Not Found: {url}", status=status)
+            if status in (400, 403):
+                raise SeatableApiException(text, status=status)
+            raise SeatableApiException(f"HTTP {status}: {text[:200]}", status=status)
 
         response_type = response_type or "json"
         if response_type == "bytes":
-            return await resp.read()
+            return content
         if response_type == "text":
-            return text
+            return content.decode(resp.get_encoding())
 
+        # 直接解析原始字节，省去先解码为字符串的开销
         try:
-            res = json_loads(text)
+            res = json_loads(content)
             return path_get(res, res_path) if res_path else res
         except JSONDecodeError as e:
             raise SeatableApiException(f"Invalid JSON response: {e}")
@@ -205,14 +464,28 @@ class SeaTableApiAsync:
 
     # ========== 认证 ==========
 
-    async def auth(self) -> None:
-        """认证并获取访问令牌"""
-        self.jwt_exp = datetime.now() + timedelta(days=3)
+    async def auth(self, use_cache: bool = True) -> None:
+        """认证并获取访问令牌，配置了 auth_cache 时优先使用未过期的缓存
+
+        :param use_cache: 为 False 时跳过缓存直接向服务器认证，用于主动续期
+        """
+        if self.auth_cache and use_cache:
+            entry = await self.auth_cache.load(self.server_url, self.token)
+            if entry and datetime.now() + JWT_REFRESH_BUFFER < entry["exp"]:
+                self._apply_auth(entry["data"], entry["exp"])
+                return
+
         data = await self.get(f"{self.dtable_2_1}/app-access-token", token_type="TOKEN", is_check_auth=False)
+        self._apply_auth(data, parse_jwt_exp(data.get("access_token")) or datetime.now() + JWT_DEFAULT_LIFETIME)
+        if self.auth_cache:
+            await self.auth_cache.save(self.server_url, self.token, data, self.jwt_exp)
 
+    def _apply_auth(self, data: Dict[str, Any], jwt_exp: datetime) -> None:
+        """应用 app-access-token 的认证结果"""
         self.dtable_server_url = parse_server_url(data.get("dtable_server"))
         self.dtable_db_url = parse_server_url(data.get("dtable_db", ""))
         self.jwt_token = data.get("access_token")
+        self.jwt_exp = jwt_exp
         self.headers = parse_headers(self.jwt_token)
         self.workspace_id = data.get("workspace_id")
         self.dtable_uuid = data.get("dtable_uuid")
@@ -220,16 +493,80 @@ class SeaTableApiAsync:
         self.use_api_gateway = data.get("use_api_gateway")
         self.is_authed = True
 
+    async def _reauth(self, rejected_token: Optional[str]) -> None:
+        """服务器拒绝了 JWT 时删除其缓存并重新认证，并发请求只认证一次"""
+        async with self._auth_lock:
+            if self.jwt_token != rejected_token:
+                return
+            await self.auth_cache.delete(self.server_url, self.token)
+            await self.auth(use_cache=False)
+
+    def _token_expiring(self) -> bool:
+        return self.jwt_exp is None or datetime.now() + JWT_REFRESH_BUFFER >= self.jwt_exp
+
+    async def ensure_token_fresh(self) -> bool:
+        """JWT 即将过期时刷新，并发调用只刷新一次，返回本次调用是否执行了刷新"""
+        if not self._token_expiring():
+            return False
+        async with self._auth_lock:
+            if not self._token_expiring():
+                return False
+            await self.auth()
+            return True
+
+    def start_auto_refresh(self) -> None:
+        """启动后台续期任务，在 JWT 进入刷新窗口之前完成续期，请求路径不再等待认证"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._auto_refresh())
+
+    def stop_auto_refresh(self) -> None:
+        """停止后台续期任务"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def _auto_refresh(self) -> None:
+        while True:
+            # 比请求路径的刷新窗口再提前一个窗口；有效期很短的 token 至少等到剩余时间的一半
+            remaining = (self.jwt_exp - datetime.now()).total_seconds() if self.jwt_exp else 0
+            wait = max(remaining - 2 * JWT_REFRESH_BUFFER.total_seconds(), remaining / 2, 1)
+            await asyncio.sleep(wait)
+            try:
+                async with self._auth_lock:
+                    await self.auth(use_cache=False)
+                logger.info("[ SeaTable JWT token refreshed in background ]")
+            except Exception as e:
+                logger.warning("[ SeaTable JWT background refresh failed ] %s", e)
+                await asyncio.sleep(30)
+
     # ========== 元数据 ==========
 
     async def get_metadata(self) -> Dict[str, Any]:
         return await self.get(f"{self.dtable}/metadata", res_path="metadata")
 
+    async def get_metadata_index(self) -> MetadataIndex:
+        """获取元数据的字典索引，开启元数据缓存时复用缓存的索引
+
+        适合传给 convert_row 处理 WebSocket 事件，表结构变化后重新获取即可。
+        """
+        if self.metadata_cache:
+            return (await self.metadata_cache.load(self.get_metadata)).index
+        return MetadataIndex(await self.get_metadata())
+
+    def invalidate_metadata(self) -> None:
+        """使元数据缓存失效"""
+        if self.metadata_cache:
+            self.metadata_cache.invalidate()
+
     async def list_tables(self) -> List[Dict[str, Any]]:
+        if self.metadata_cache:
+            return (await self.metadata_cache.load(self.get_metadata)).tables
         meta = await self.get_metadata()
         return meta.get("tables") or []
 
     async def get_table_by_name(self, table_name: str) -> Optional[Dict[str, Any]]:
+        if self.metadata_cache:
+            return (await self.metadata_cache.load(self.get_metadata)).get_table(table_name)
         tables = await self.list_tables()
         return next((t for t in tables if t.get("name") == table_name), None)
 
@@ -273,12 +610,15 @@ class SeaTableApiAsync:
 
     # ========== 表操作 ==========
 
+    @_invalidates_metadata
     async def add_table(self, table_name: str, lang: str = "en", columns: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         return await self.post(self.dtable_tables, json={"table_name": table_name, "lang": lang, "columns": columns})
 
+    @_invalidates_metadata
     async def rename_table(self, table_name: str, new_table_name: str) -> Dict[str, Any]:
         return await self.put(self.dtable_tables, json={"table_name": table_name, "new_table_name": new_table_name})
 
+    @_invalidates_metadata
     async def delete_table(self, table_name: str) -> Dict[str, Any]:
         json_data = {"table_name": table_name}
         return await self.delete(self.dtable_tables, json=json_data)
@@ -291,12 +631,15 @@ class SeaTableApiAsync:
     async def get_view_by_name(self, table_name: str, view_name: str) -> Dict[str, Any]:
         return await self.get(f"{self.dtable_views}/{view_name}", params={"table_name": table_name})
 
+    @_invalidates_metadata
     async def add_view(self, table_name: str, view_name: str) -> Dict[str, Any]:
         return await self.post(self.dtable_views, json={"name": view_name}, params={"table_name": table_name})
 
+    @_invalidates_metadata
     async def rename_view(self, table_name: str, view_name: str, new_view_name: str) -> Dict[str, Any]:
         return await self.put(f"{self.dtable_views}/{view_name}", json={"name": new_view_name}, params={"table_name": table_name})
 
+    @_invalidates_metadata
     async def delete_view(self, table_name: str, view_name: str) -> Dict[str, Any]:
         return await self.delete(f"{self.dtable_views}/{view_name}", params={"table_name": table_name})
 
@@ -309,15 +652,87 @@ class SeaTableApiAsync:
             order_by: Optional[str] = None,
             desc: bool = False,
             start: Optional[int] = None,
-            limit: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+            limit: Optional[int] = None,
+            row_factory: Optional[Type[CompactRow]] = None,
+    ) -> List[Any]:
+        """列出表格的行
+
+        :param row_factory: 传入 CompactRow 时返回按表结构生成的紧凑行而不是 dict
+        """
         params = self._table_params(table_name, view_name=view_name, start=start, limit=limit)
         if order_by:
             params["order_by"] = order_by
             params["direction"] = "desc" if desc else "asc"
         if self.use_api_gateway:
             params["convert_keys"] = True
-        return await self.get(self.dtable_rows, params=params, res_path="rows")
+        rows_request = self.get(self.dtable_rows, params=params, res_path="rows")
+        if row_factory is None:
+            return await rows_request
+        # 列定义与行同时请求，不增加串行的往返
+        rows, columns = await asyncio.gather(rows_request, self._table_columns(table_name))
+        from_dict = row_factory.for_columns(columns).from_dict
+        return [from_dict(row) for row in rows or []]
+
+    async def iter_rows(
+            self,
+            table_name: str,
+            view_name: Optional[str] = None,
+            order_by: Optional[str] = None,
+            desc: bool = False,
+            page_size: int = LIST_ROWS_PAGE_SIZE,
+            concurrency: int = 1,
+            row_count: Optional[int] = None,
+            row_factory: Optional[Type[CompactRow]] = None,
+    ) -> AsyncIterator[Any]:
+        """逐行遍历表格，自动分页，产出当前页时已在后台请求后续页
+
+        :param page_size: 每页行数，最大 1000
+        :param concurrency: 同时在途的页请求数，默认 1 即只预取下一页
+        :param row_count: 已知的总行数，提供时不会请求超出范围的页
+        :param row_factory: 传入 CompactRow 时产出紧凑行，表的列定义与第一页同时获取
+        """
+        if not 0 < page_size <= LIST_ROWS_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {LIST_ROWS_PAGE_SIZE}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        from_dict: Optional[Callable[[Dict[str, Any]], CompactRow]] = None
+
+        pending: Deque[asyncio.Future] = deque()
+        next_start = 0
+        exhausted = False
+
+        def schedule() -> None:
+            nonlocal next_start
+            while not exhausted and len(pending) < concurrency and (row_count is None or next_start < row_count):
+                pending.append(asyncio.ensure_future(self.list_rows(
+                    table_name, view_name=view_name, order_by=order_by, desc=desc, start=next_start, limit=page_size
+                )))
+                next_start += page_size
+
+        columns_task: Optional[asyncio.Future] = None
+        try:
+            schedule()
+            if row_factory:
+                columns_task = asyncio.ensure_future(self._table_columns(table_name))
+            while pending:
+                rows = await pending.popleft() or []
+                if len(rows) < page_size:
+                    # 短页说明已到末尾，后续页无需再请求
+                    exhausted = True
+                    _cancel_tasks(pending)
+                    pending.clear()
+                else:
+                    schedule()
+                if columns_task and rows:
+                    if from_dict is None:
+                        from_dict = row_factory.for_columns(await columns_task).from_dict
+                    rows = [from_dict(row) for row in rows]
+                for row in rows:
+                    yield row
+        finally:
+            _cancel_tasks(pending)
+            if columns_task:
+                _cancel_tasks([columns_task])
 
     async def get_row(self, table_name: str, row_id: str) -> Dict[str, Any]:
         params = self._table_params(table_name)
@@ -336,14 +751,25 @@ class SeaTableApiAsync:
             json_data["row"] = row_data
             return await self.post(self.dtable_rows, json=json_data)
 
-    async def batch_append_rows(self, table_name: str, rows_data: List[Dict[str, Any]], apply_default: Optional[bool] = None) -> Dict[str, Any]:
-        json_data = {**self._table_params(table_name), "rows": rows_data}
-        if apply_default is not None:
-            json_data["apply_default"] = apply_default
-        if self.use_api_gateway:
-            return await self.post(self.dtable_rows, json=json_data)
-        else:
-            return await self.post(f"{self.dtable}/batch-append-rows", json=json_data)
+    async def batch_append_rows(
+            self,
+            table_name: str,
+            rows_data: List[Dict[str, Any]],
+            apply_default: Optional[bool] = None,
+            chunk_size: int = BATCH_ROWS_LIMIT,
+            concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """批量添加行，超过 chunk_size 时自动分块发送（并发时各块的先后顺序不保证）"""
+        async def send(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+            json_data = {**self._table_params(table_name), "rows": chunk}
+            if apply_default is not None:
+                json_data["apply_default"] = apply_default
+            if self.use_api_gateway:
+                return await self.post(self.dtable_rows, json=json_data)
+            else:
+                return await self.post(f"{self.dtable}/batch-append-rows", json=json_data)
+
+        return await self._dispatch_chunks(send, rows_data, chunk_size, concurrency)
 
     async def insert_row(self, table_name: str, row_data: Dict[str, Any], anchor_row_id: str, apply_default: Optional[bool] = None) -> Dict[str, Any]:
         """插入行到指定行之后（v2 API 不支持 anchor_row_id，等同于 append_row）"""
@@ -360,12 +786,22 @@ class SeaTableApiAsync:
             json_data.update({"row_id": row_id, "row": row_data})
         return await self.put(self.dtable_rows, json=json_data)
 
-    async def batch_update_rows(self, table_name: str, rows_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        json_data = {**self._table_params(table_name), "updates": rows_data}
-        if self.use_api_gateway:
-            return await self.put(self.dtable_rows, json=json_data)
-        else:
-            return await self.put(f"{self.dtable}/batch-update-rows", json=json_data)
+    async def batch_update_rows(
+            self,
+            table_name: str,
+            rows_data: List[Dict[str, Any]],
+            chunk_size: int = BATCH_ROWS_LIMIT,
+            concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """批量更新行，超过 chunk_size 时自动分块发送"""
+        async def send(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+            json_data = {**self._table_params(table_name), "updates": chunk}
+            if self.use_api_gateway:
+                return await self.put(self.dtable_rows, json=json_data)
+            else:
+                return await self.put(f"{self.dtable}/batch-update-rows", json=json_data)
+
+        return await self._dispatch_chunks(send, rows_data, chunk_size, concurrency)
 
     async def delete_row(self, table_name: str, row_id: str) -> Dict[str, Any]:
         json_data: Dict[str, Any] = {**self._table_params(table_name)}
@@ -375,12 +811,22 @@ class SeaTableApiAsync:
             json_data["row_id"] = row_id
         return await self.delete(self.dtable_rows, json=json_data)
 
-    async def batch_delete_rows(self, table_name: str, row_ids: List[str]) -> Dict[str, Any]:
-        json_data = {**self._table_params(table_name), "row_ids": row_ids}
-        if self.use_api_gateway:
-            return await self.delete(self.dtable_rows, json=json_data)
-        else:
-            return await self.delete(f"{self.dtable}/batch-delete-rows", json=json_data)
+    async def batch_delete_rows(
+            self,
+            table_name: str,
+            row_ids: List[str],
+            chunk_size: int = BATCH_ROWS_LIMIT,
+            concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """批量删除行，超过 chunk_size 时自动分块发送"""
+        async def send(chunk: List[str]) -> Dict[str, Any]:
+            json_data = {**self._table_params(table_name), "row_ids": chunk}
+            if self.use_api_gateway:
+                return await self.delete(self.dtable_rows, json=json_data)
+            else:
+                return await self.delete(f"{self.dtable}/batch-delete-rows", json=json_data)
+
+        return await self._dispatch_chunks(send, row_ids, chunk_size, concurrency)
 
     async def filter_rows(
             self,
@@ -402,6 +848,23 @@ class SeaTableApiAsync:
         params = {"table_name": table_name, "view_name": view_name}
         return await self.get(f"{self.dtable_server_url}/api/v1/dtables/{self.dtable_uuid}/filtered-rows", json=json_data, params=params, res_path="rows")
 
+    async def filter(self, table_name: str, conditions: str, view_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """在本地按过滤表达式筛选行，如 "Name like 'abc%' and Age >= 18"
+
+        表达式编译一次后逐页过滤 iter_rows 的结果；需要反复过滤同一批行时，
+        可用 compile_filter 编译后直接作用于已缓存的行，无需再次请求服务器。
+        """
+        row_filter = compile_filter(conditions, await self._table_columns(table_name))
+        return [row async for row in row_filter.filter_async(self.iter_rows(table_name, view_name=view_name))]
+
+    async def snapshot(self, table_name: str, view_name: Optional[str] = None, concurrency: int = 1) -> TableSnapshot:
+        """拉取整表为列式快照，按列类型存储为 NumPy 数组，需要安装 analytics 可选依赖
+
+        行在 iter_rows 分页过程中逐行写入列缓冲区，不保留整表的行字典。
+        """
+        columns = await self._table_columns(table_name)
+        return await TableSnapshot.from_async_rows(self.iter_rows(table_name, view_name=view_name, concurrency=concurrency), columns)
+
     # ========== 链接操作 ==========
 
     async def add_link(self, link_id: str, table_name: str, other_table_name: str, row_id: str, other_row_id: str) -> Dict[str, Any]:
@@ -448,9 +911,9 @@ class SeaTableApiAsync:
     async def get_linked_records(self, table_id: str, link_column_key: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
         if self.use_api_gateway:
             json_data = {"table_id": table_id, "link_column_key": link_column_key, "rows": rows}
-            return await self.post(f"{self.dtable}/query-links", json=json_data)
+            return await self.post(f"{self.dtable}/query-links", json=json_data, idempotent=True)
         else:
-            return await self.post(f"{self.dtable_db}/linked-records/{self.dtable_uuid}", json={"table_id": table_id, "link_column": link_column_key, "rows": rows})
+            return await self.post(f"{self.dtable_db}/linked-records/{self.dtable_uuid}", json={"table_id": table_id, "link_column": link_column_key, "rows": rows}, idempotent=True)
 
     # ========== 列操作 ==========
 
@@ -458,23 +921,43 @@ class SeaTableApiAsync:
         params = self._table_params(table_name, view_name=view_name)
         return await self.get(self.dtable_columns, params=params, res_path="columns")
 
+    async def _table_columns(self, table_name: str) -> List[Dict[str, Any]]:
+        """获取表的全部列，启用元数据缓存时从缓存读取"""
+        if self.metadata_cache:
+            table = (await self.metadata_cache.load(self.get_metadata)).get_table(table_name)
+            if table:
+                return table.get("columns") or []
+        return await self.list_columns(table_name)
+
     async def get_column_link_id(self, table_name: str, column_name: str) -> str:
-        columns = await self.list_columns(table_name)
-        for col in columns:
-            if col.get("name") == column_name and col.get("type") == "link":
-                return col.get("data", {}).get("link_id")
+        col = await self.get_column_by_name(table_name, column_name)
+        if col and col.get("type") == "link":
+            return col.get("data", {}).get("link_id")
         raise ValueError(f"link column '{column_name}' not found")
 
     async def get_column_by_name(self, table_name: str, column_name: str) -> Optional[Dict[str, Any]]:
+        if self.metadata_cache:
+            cache = await self.metadata_cache.load(self.get_metadata)
+            if cache.get_table(table_name):
+                return cache.get_column_by_name(table_name, column_name)
         columns = await self.list_columns(table_name)
         return next((col for col in columns if col.get("name") == column_name), None)
 
+    async def get_column_by_key(self, table_name: str, column_key: str) -> Optional[Dict[str, Any]]:
+        if self.metadata_cache:
+            cache = await self.metadata_cache.load(self.get_metadata)
+            if cache.get_table(table_name):
+                return cache.get_column_by_key(table_name, column_key)
+        columns = await self.list_columns(table_name)
+        return next((col for col in columns if col.get("key") == column_key), None)
+
     async def get_columns_by_type(self, table_name: str, column_type: ColumnTypes) -> List[Dict[str, Any]]:
         if column_type not in ColumnTypes:
             raise ValueError(f"invalid column type: {column_type}")
-        columns = await self.list_columns(table_name)
+        columns = await self._table_columns(table_name)
         return [col for col in columns if col.get("type") == column_type.value]
 
+    @_invalidates_metadata
     async def insert_column(
             self,
             table_name: str,
@@ -495,22 +978,27 @@ class SeaTableApiAsync:
             json_data["column_data"] = column_data
         return await self.post(self.dtable_columns, json=json_data)
 
+    @_invalidates_metadata
     async def rename_column(self, table_name: str, column_key: str, new_column_name: str) -> Dict[str, Any]:
         json_data = {**self._table_params(table_name), "op_type": RENAME_COLUMN, "column": column_key, "new_column_name": new_column_name}
         return await self.put(self.dtable_columns, json=json_data)
 
+    @_invalidates_metadata
     async def resize_column(self, table_name: str, column_key: str, new_column_width: int) -> Dict[str, Any]:
         json_data = {**self._table_params(table_name), "op_type": RESIZE_COLUMN, "column": column_key, "new_column_width": new_column_width}
         return await self.put(self.dtable_columns, json=json_data)
 
+    @_invalidates_metadata
     async def freeze_column(self, table_name: str, column_key: str, frozen: bool) -> Dict[str, Any]:
         json_data = {**self._table_params(table_name), "op_type": FREEZE_COLUMN, "column": column_key, "frozen": frozen}
         return await self.put(self.dtable_columns, json=json_data)
 
+    @_invalidates_metadata
     async def move_column(self, table_name: str, column_key: str, target_column_key: str) -> Dict[str, Any]:
         json_data = {**self._table_params(table_name), "op_type": MOVE_COLUMN, "column": column_key, "target_column": target_column_key}
         return await self.put(self.dtable_columns, json=json_data)
 
+    @_invalidates_metadata
     async def modify_column_type(self, table_name: str, column_key: str, new_column_type: ColumnTypes) -> Dict[str, Any]:
         if new_column_type not in ColumnTypes:
             raise ValueError(f"invalid column type: {new_column_type}")
@@ -519,16 +1007,19 @@ class SeaTableApiAsync:
         json_data = {**self._table_params(table_name), "op_type": MODIFY_COLUMN_TYPE, "column": column_key, "new_column_type": new_column_type.value}
         return await self.put(self.dtable_columns, json=json_data)
 
+    @_invalidates_metadata
     async def add_column_options(self, table_name: str, column: str, options: List[Dict[str, Any]]) -> Dict[str, Any]:
         """添加单选/多选列选项"""
         json_data = {**self._table_params(table_name), "column": column, "options": options}
         return await self.post(f"{self.dtable}/column-options", json=json_data)
 
+    @_invalidates_metadata
     async def add_column_cascade_settings(self, table_name: str, child_column: str, parent_column: str, cascade_settings: Dict[str, Any]) -> Dict[str, Any]:
         """添加单选列级联设置"""
         json_data = {**self._table_params(table_name), "child_column": child_column, "parent_column": parent_column, "cascade_settings": cascade_settings}
         return await self.post(f"{self.dtable}/column-cascade-settings", json=json_data)
 
+    @_invalidates_metadata
     async def delete_column(self, table_name: str, column_key: str) -> Dict[str, Any]:
         json_data = {**self._table_params(table_name), "column": column_key}
         return await self.delete(self.dtable_columns, json=json_data)
@@ -545,13 +1036,52 @@ class SeaTableApiAsync:
         """构建资源 URL"""
         return f"{self.server_url}/workspace/{self.workspace_id}/asset/{UUID(self.dtable_uuid)}/{parse.quote(relative_path.strip('/'))}/{parse.quote(filename)}"
 
-    async def _download_to_file(self, download_link: str, save_path: str) -> None:
-        """下载链接内容到本地文件"""
-        data = await self.get(download_link, response_type="bytes")
-        async with aiofiles.open(save_path, "wb") as f:
-            await f.write(data)
+    async def _download_to_file(
+            self,
+            download_link: str,
+            save_path: str,
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            checksum: Optional[str] = None,
+    ) -> Optional[str]:
+        """流式下载链接内容到本地文件，先写入 .part 临时文件，完成后再改名
+
+        :param progress: 进度回调，参数为 (已下载字节数, 总字节数或 None)
+        :param checksum: 摘要算法名，如 "sha256"，提供时返回文件内容的十六进制摘要
+        """
+        part_path = f"{save_path}.part"
+
+        async def write(resp: aiohttp.ClientResponse) -> Optional[str]:
+            digest = hashlib.new(checksum) if checksum else None
+            total = resp.content_length
+            received = 0
+            async with aiofiles.open(part_path, "wb") as f:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    await f.write(chunk)
+                    if digest:
+                        digest.update(chunk)
+                    received += len(chunk)
+                    if progress:
+                        progress(received, total)
+            return digest.hexdigest() if digest else None
 
-    async def _upload_content(self, upload_info: Dict[str, Any], name: str, content: bytes, file_type: str, replace: bool) -> Dict[str, Any]:
+        try:
+            result = await self.get(download_link, response_handler=write)
+        except BaseException:
+            if await aiofiles.os.path.exists(part_path):
+                await aiofiles.os.remove(part_path)
+            raise
+        await aiofiles.os.replace(part_path, save_path)
+        return result
+
+    async def _upload_content(
+            self,
+            upload_info: Dict[str, Any],
+            name: str,
+            content: Union[bytes, aiohttp.payload.Payload],
+            file_type: str,
+            replace: bool,
+    ) -> Dict[str, Any]:
         """上传内容并返回文件信息"""
         relative_path = upload_info["img_relative_path"] if file_type == "image" else upload_info["file_relative_path"]
         upload_url = upload_info["upload_link"] + "?ret-json=1"
@@ -560,31 +1090,124 @@ class SeaTableApiAsync:
         d = res[0]
         return {"type": file_type, "size": d.get("size"), "name": d.get("name"), "url": self._build_asset_url(relative_path, d.get("name", name))}
 
-    async def download_file(self, url: str, save_path: str) -> None:
-        """下载文件到本地"""
+    async def download_file(
+            self,
+            url: str,
+            save_path: str,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            checksum: Optional[str] = None,
+    ) -> Optional[str]:
+        """流式下载文件到本地，指定 checksum 算法时返回文件摘要"""
         uuid_str = str(UUID(self.dtable_uuid))
         if uuid_str not in url:
             raise SeatableApiException("url invalid")
         path = url.split(uuid_str)[-1].strip("/")
         download_link = await self.get_file_download_link(parse.unquote(path))
-        await self._download_to_file(download_link, save_path)
+        return await self._download_to_file(download_link, save_path, progress=progress, checksum=checksum)
+
+    async def _get_upload_info(self, refresh: bool = False) -> Tuple[Dict[str, Any], bool]:
+        """获取上传链接信息，有效期内复用，返回 (上传链接信息, 是否为复用的缓存)"""
+        async with self._upload_info_lock:
+            if not refresh and self._upload_info and time.monotonic() - self._upload_info_time < UPLOAD_LINK_TTL:
+                return self._upload_info, True
+            self._upload_info = await self.get_file_upload_link()
+            self._upload_info_time = time.monotonic()
+            return self._upload_info, False
+
+    async def _upload_with_link(
+            self,
+            name: str,
+            content: Union[bytes, aiohttp.payload.Payload],
+            file_type: str,
+            replace: bool,
+    ) -> Dict[str, Any]:
+        """使用复用的上传链接上传，复用的链接已失效（401/403/404）时换新链接重试一次
+
+        其他错误（如配额不足、参数错误）直接抛出，不会重复上传。
+        """
+        upload_info, reused = await self._get_upload_info()
+        try:
+            return await self._upload_content(upload_info, name, content, file_type, replace)
+        except SeatableApiException as e:
+            if not reused or e.status not in _EXPIRED_LINK_STATUSES:
+                raise
+        upload_info, _ = await self._get_upload_info(refresh=True)
+        return await self._upload_content(upload_info, name, content, file_type, replace)
 
     async def upload_bytes_file(self, name: str, content: bytes, file_type: Literal["file", "image"] = "file", replace: bool = False) -> Dict[str, Any]:
         """上传字节内容"""
         if file_type not in ("file", "image"):
             raise SeatableApiException("file_type must be 'file' or 'image'")
-        upload_info = await self.get_file_upload_link()
-        return await self._upload_content(upload_info, name, content, file_type, replace)
+        return await self._upload_with_link(name, content, file_type, replace)
 
     async def upload_local_file(self, file_path: str, name: Optional[str] = None, file_type: Literal["file", "image"] = "file", replace: bool = False) -> Dict[str, Any]:
-        """上传本地文件"""
+        """流式上传本地文件，不将文件整体读入内存"""
         if file_type not in ("file", "image"):
             raise SeatableApiException("file_type must be 'file' or 'image'")
         name = name or file_path.split("/")[-1]
-        async with aiofiles.open(file_path, "rb") as f:
-            content = await f.read()
-        upload_info = await self.get_file_upload_link()
-        return await self._upload_content(upload_info, name, content, file_type, replace)
+        return await self._upload_with_link(name, AsyncFilePayload(file_path), file_type, replace)
+
+    async def upload_many(
+            self,
+            files: List[Union[str, Tuple[str, str]]],
+            file_type: Literal["file", "image"] = "file",
+            replace: bool = False,
+            concurrency: int = FILE_TRANSFER_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """并发上传多个本地文件，复用上传链接
+
+        :param files: 本地文件路径，或 (本地文件路径, 上传后的文件名) 元组
+        :return: 与 files 顺序一致的结果列表，每项包含 file、result（文件信息）、error（异常）
+        """
+        if file_type not in ("file", "image"):
+            raise SeatableApiException("file_type must be 'file' or 'image'")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(item: Union[str, Tuple[str, str]]) -> Dict[str, Any]:
+            file_path, name = (item, None) if isinstance(item, str) else item
+            async with semaphore:
+                try:
+                    result = await self.upload_local_file(file_path, name=name, file_type=file_type, replace=replace)
+                except Exception as e:
+                    return {"file": file_path, "result": None, "error": e}
+            return {"file": file_path, "result": result, "error": None}
+
+        return list(await asyncio.gather(*(upload(item) for item in files)))
+
+    async def download_many(
+            self,
+            urls: List[str],
+            dest_dir: str,
+            concurrency: int = FILE_TRANSFER_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """并发下载多个文件到 dest_dir，文件名取自 URL
+
+        同一批中重名的文件依次保存为 "name (1).ext"、"name (2).ext"，不会写入同一个临时文件。
+
+        :return: 与 urls 顺序一致的结果列表，每项包含 url、path（保存路径）、error（异常）
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        used_names: Set[str] = set()
+        save_paths = []
+        for url in urls:
+            name = parse.unquote(url.rstrip("/").split("/")[-1])
+            stem, ext = os.path.splitext(name)
+            n = 0
+            while name in used_names:
+                n += 1
+                name = f"{stem} ({n}){ext}"
+            used_names.add(name)
+            save_paths.append(os.path.join(dest_dir, name))
+
+        async def download(url: str, save_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    await self.download_file(url, save_path)
+                except Exception as e:
+                    return {"url": url, "path": save_path, "error": e}
+            return {"url": url, "path": save_path, "error": None}
+
+        return list(await asyncio.gather(*(download(url, save_path) for url, save_path in zip(urls, save_paths))))
 
     # ========== 自定义文件夹 ==========
 
@@ -597,10 +1220,16 @@ class SeaTableApiAsync:
     async def get_custom_file_upload_link(self, path: str) -> Dict[str, Any]:
         return await self.get(f"{self.dtable_custom}/app-upload-link", params={"path": path}, token_type="TOKEN")
 
-    async def download_custom_file(self, path: str, save_path: str) -> None:
-        """下载自定义文件夹中的文件"""
+    async def download_custom_file(
+            self,
+            path: str,
+            save_path: str,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            checksum: Optional[str] = None,
+    ) -> Optional[str]:
+        """流式下载自定义文件夹中的文件，指定 checksum 算法时返回文件摘要"""
         download_link = await self.get_custom_file_download_link(parse.unquote(path))
-        await self._download_to_file(download_link, save_path)
+        return await self._download_to_file(download_link, save_path, progress=progress, checksum=checksum)
 
     async def get_custom_file_info(self, path: str, name: str) -> Dict[str, Any]:
         """获取自定义文件信息"""
@@ -610,13 +1239,12 @@ class SeaTableApiAsync:
         return {"type": "file", "size": d.get("file_size"), "name": file_name, "url": f"custom-asset://{d.get('uuid')}.{file_name.split('.')[-1]}"}
 
     async def upload_local_file_to_custom_folder(self, local_path: str, custom_folder_path: Optional[str] = None, name: Optional[str] = None) -> Dict[str, Any]:
-        """上传文件到自定义文件夹"""
+        """流式上传文件到自定义文件夹"""
         name = name or local_path.split("/")[-1]
         custom_folder_path = custom_folder_path or "/"
+        content = AsyncFilePayload(local_path)
         upload_info = await self.get_custom_file_upload_link(parse.unquote(custom_folder_path))
         upload_url = upload_info["upload_link"] + "?ret-json=1"
-        async with aiofiles.open(local_path, "rb") as f:
-            content = await f.read()
         data = {"parent_dir": upload_info["parent_path"], "relative_path": upload_info["relative_path"], "replace": 0}
         res = await self.post(upload_url, data=data, file=(name, content), token_type="None")
         return await self.get_custom_file_info(path=custom_folder_path, name=res[0].get("name"))
@@ -627,15 +1255,141 @@ class SeaTableApiAsync:
 
     # ========== 其他 ==========
 
-    async def query(self, sql: str, convert: bool = True) -> List[Dict[str, Any]]:
-        """执行 SQL 查询"""
-        if not sql:
-            raise ValueError("sql cannot be empty")
-        data = await self.post(f"{self.dtable_db}/query/{self.dtable_uuid}", json={"sql": sql})
+    async def _query_raw(self, sql: str) -> Dict[str, Any]:
+        """执行 SQL 查询，返回未转换的响应
+
+        只有 SELECT 会在超时或 5xx 后重试，INSERT/UPDATE/DELETE 可能已在服务器上生效，重放会重复写入。
+        """
+        data = await self.post(f"{self.dtable_db}/query/{self.dtable_uuid}", json={"sql": sql}, idempotent=is_select_sql(sql))
         if not data.get("success"):
             raise SeatableApiException(data.get("error_message"))
+        return data
+
+    async def query(self, sql: str, convert: bool = True, row_factory: Optional[Type[CompactRow]] = None) -> List[Any]:
+        """执行 SQL 查询
+
+        :param row_factory: 传入 CompactRow 时直接构建紧凑行，需要 convert=True
+        """
+        if not sql:
+            raise ValueError("sql cannot be empty")
+        if row_factory is not None and not convert:
+            raise ValueError("row_factory requires convert=True")
+        data = await self._query_raw(sql)
         results = data.get("results")
-        return convert_db_rows(data.get("metadata"), results) if convert else results
+        return convert_db_rows(data.get("metadata"), results, row_factory) if convert else results
+
+    async def iter_query(
+            self,
+            sql: str,
+            chunk_size: int = QUERY_PAGE_SIZE,
+            convert: bool = True,
+            row_factory: Optional[Type[CompactRow]] = None,
+    ) -> AsyncIterator[List[Any]]:
+        """分块执行 SQL 查询，逐块产出结果
+
+        SQL 末尾已有的 LIMIT/OFFSET 会被改写为按块翻页，原 LIMIT 作为总行数上限。
+        当前块在线程中转换时，下一块已在请求中。翻页结果是否稳定取决于 SQL 是否带 ORDER BY。
+
+        :param sql: SQL 语句
+        :param chunk_size: 每块行数，最大 10000
+        :param convert: 是否将结果转换为可读格式
+        :param row_factory: 传入 CompactRow 时直接构建紧凑行，需要 convert=True
+        """
+        if not sql:
+            raise ValueError("sql cannot be empty")
+        if row_factory is not None and not convert:
+            raise ValueError("row_factory requires convert=True")
+        async for data in self._iter_query_pages(sql, chunk_size):
+            results = data["results"]
+            if convert:
+                results = await asyncio.to_thread(convert_db_rows, data.get("metadata"), results, row_factory)
+            yield results
+
+    async def _iter_query_pages(self, sql: str, chunk_size: int) -> AsyncIterator[Dict[str, Any]]:
+        """按块翻页执行 SQL，产出未转换的非空响应页，消费当前页时下一页已在请求中"""
+        if not 0 < chunk_size <= QUERY_PAGE_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {QUERY_PAGE_SIZE}")
+
+        base_sql, total, offset = split_sql_limit(sql)
+        end = offset + total if total is not None else None
+
+        def fetch(start: int) -> Optional[asyncio.Future]:
+            size = chunk_size if end is None else min(chunk_size, end - start)
+            if size <= 0:
+                return None
+            return asyncio.ensure_future(self._query_raw(f"{base_sql} LIMIT {size} OFFSET {start}"))
+
+        task = fetch(offset)
+        try:
+            while task:
+                data = await task
+                results = data.get("results") or []
+                offset += len(results)
+                task = fetch(offset) if len(results) >= chunk_size else None
+                if not results:
+                    break
+                data["results"] = results
+                yield data
+        finally:
+            if task:
+                _cancel_tasks([task])
+
+    async def export_query(
+            self,
+            sql: str,
+            path: str,
+            format: Optional[Literal["csv", "jsonl", "parquet"]] = None,
+            chunk_size: int = QUERY_PAGE_SIZE,
+            row_group_size: Optional[int] = None,
+            compression: Optional[str] = None,
+    ) -> int:
+        """分块执行 SQL 查询并逐块写入文件，内存中只保留当前块
+
+        :param format: "csv"、"jsonl" 或 "parquet"（需要 pyarrow），默认按扩展名推断
+        :param chunk_size: 每块行数，最大 10000
+        :param row_group_size: Parquet 单个 row group 的最大行数，默认每块一个 row group
+        :param compression: Parquet 压缩算法，默认 snappy
+        :return: 写入的行数
+        """
+        if not sql:
+            raise ValueError("sql cannot be empty")
+        return await export_pages(
+            self._iter_query_pages(sql, chunk_size), path, format=format, row_group_size=row_group_size, compression=compression
+        )
+
+    async def export_table(
+            self,
+            table_name: str,
+            path: str,
+            format: Optional[Literal["csv", "jsonl", "parquet"]] = None,
+            chunk_size: int = QUERY_PAGE_SIZE,
+            row_group_size: Optional[int] = None,
+            compression: Optional[str] = None,
+    ) -> int:
+        """导出整张表，按 _id 键集翻页（WHERE _id > 上一页末行），参数同 export_query"""
+        return await export_pages(
+            self._iter_table_pages(table_name, chunk_size), path, format=format, row_group_size=row_group_size, compression=compression
+        )
+
+    async def _iter_table_pages(self, table_name: str, chunk_size: int) -> AsyncIterator[Dict[str, Any]]:
+        """按 _id 键集翻页查询整张表，产出未转换的非空响应页
+
+        每页的条件取决于上一页的末行，因此不预取；深翻页时也不会像 OFFSET 那样逐页变慢。
+        """
+        if not 0 < chunk_size <= QUERY_PAGE_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {QUERY_PAGE_SIZE}")
+        table = "`" + table_name.replace("`", "``") + "`"
+        last_id: Optional[str] = None
+        while True:
+            where = " WHERE _id > '" + last_id.replace("'", "''") + "'" if last_id is not None else ""
+            data = await self._query_raw(f"SELECT * FROM {table}{where} ORDER BY _id LIMIT {chunk_size}")
+            results = data.get("results") or []
+            if results:
+                data["results"] = results
+                yield data
+            if len(results) < chunk_size:
+                return
+            last_id = results[-1]["_id"]
 
     async def get_related_users(self) -> List[Dict[str, Any]]:
         return await self.get(f"{self.server_url}/api/v2.1/dtables/{self.dtable_uuid}/related-users", res_path="user_list")
@@ -0,0 +1,464 @@
+"""列式表快照：按列类型存储为 NumPy 数组，支持向量化过滤、分组聚合及导出 Arrow / pandas
+
+numpy 为必需依赖，pyarrow 与 pandas 只在导出时使用，均按需导入：
+    pip install seatable-api-async[analytics]
+"""
+from __future__ import annotations
+
+import functools
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import DATE_CACHE_SIZE, ColumnTypes
+from .utils import import_optional, json_dumps, path_get
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+__all__ = ["TableSnapshot"]
+
+_NUMBER_TYPES = {ColumnTypes.NUMBER.value, ColumnTypes.DURATION.value, ColumnTypes.RATE.value}
+_DATE_TYPES = {ColumnTypes.DATE.value, ColumnTypes.CTIME.value, ColumnTypes.MTIME.value}
+
+# 不在列定义中的内置列
+_BUILTIN_COLUMNS = [
+    {"name": "_ctime", "type": ColumnTypes.CTIME.value},
+    {"name": "_mtime", "type": ColumnTypes.MTIME.value},
+]
+
+# datetime64 的 NaT
+_NAT = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _to_epoch_ms(value: str) -> int:
+    """日期字符串转为毫秒时间戳，带时区的值换算为 UTC，不带时区的按字面时间处理"""
+    try:
+        dt = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return _NAT
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MILLISECOND
+
+
+def _date_value(value: Any) -> int:
+    if isinstance(value, datetime):
+        return _to_epoch_ms(value.isoformat())
+    return _to_epoch_ms(value) if value and isinstance(value, str) else _NAT
+
+
+# ========== 列构建 ==========
+
+class _ColumnBuilder:
+    """逐行追加单元格，完成后转换为 NumPy 数组；构建期间使用 array 紧凑存储"""
+
+    kind = "object"
+
+    def __init__(self, column: Dict[str, Any]) -> None:
+        self.name = column["name"]
+        self.column_type = column.get("type")
+        self._values: List[Any] = []
+
+    def append(self, value: Any) -> None:
+        self._values.append(value)
+
+    def build(self, np: Any) -> _Column:
+        values = np.empty(len(self._values), dtype=object)
+        values[:] = self._values
+        return _Column(self.name, self.column_type, self.kind, values)
+
+
+class _NumberBuilder(_ColumnBuilder):
+    kind = "number"
+
+    def __init__(self, column: Dict[str, Any]) -> None:
+        super().__init__(column)
+        self._buffer = array("d")
+
+    def append(self, value: Any) -> None:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self._buffer.append(value)
+        else:
+            try:
+                self._buffer.append(float(value) if value not in (None, "") else float("nan"))
+            except (TypeError, ValueError):
+                self._buffer.append(float("nan"))
+
+    def build(self, np: Any) -> _Column:
+        return _Column(self.name, self.column_type, self.kind, np.frombuffer(self._buffer, dtype=np.float64))
+
+
+class _DateBuilder(_ColumnBuilder):
+    kind = "date"
+
+    def __init__(self, column: Dict[str, Any]) -> None:
+        super().__init__(column)
+        self._buffer = array("q")
+
+    def append(self, value: Any) -> None:
+        self._buffer.append(_date_value(value))
+
+    def build(self, np: Any) -> _Column:
+        return _Column(self.name, self.column_type, self.kind, np.frombuffer(self._buffer, dtype="datetime64[ms]"))
+
+
+class _BoolBuilder(_ColumnBuilder):
+    kind = "bool"
+
+    def __init__(self, column: Dict[str, Any]) -> None:
+        super().__init__(column)
+        self._buffer = array("b")
+
+    def append(self, value: Any) -> None:
+        self._buffer.append(1 if value else 0)
+
+    def build(self, np: Any) -> _Column:
+        return _Column(self.name, self.column_type, self.kind, np.frombuffer(self._buffer, dtype=np.bool_))
+
+
+class _CategoryBuilder(_ColumnBuilder):
+    """单选列：字典编码为 int32，-1 表示空值；类别按列定义的选项顺序，未知值追加在后"""
+
+    kind = "category"
+
+    def __init__(self, column: Dict[str, Any]) -> None:
+        super().__init__(column)
+        self._buffer = array("i")
+        self._codes: Dict[Any, int] = {}
+        for option in path_get(column, "data.options") or []:
+            self._codes.setdefault(option.get("name"), len(self._codes))
+
+    def _code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._codes)
+        return code
+
+    def append(self, value: Any) -> None:
+        self._buffer.append(self._code(value) if value not in (None, "") else -1)
+
+    def build(self, np: Any) -> _Column:
+        codes = np.frombuffer(self._buffer, dtype=np.int32)
+        return _Column(self.name, self.column_type, self.kind, codes, categories=list(self._codes))
+
+
+class _MultiCategoryBuilder(_CategoryBuilder):
+    """多选列：offsets（int32，长度为行数 + 1）加扁平的 int32 编码"""
+
+    kind = "multi"
+
+    def __init__(self, column: Dict[str, Any]) -> None:
+        super().__init__(column)
+        self._offsets = array("i", [0])
+
+    def append(self, value: Any) -> None:
+        if value:
+            for item in value:
+                self._buffer.append(self._code(item))
+        self._offsets.append(len(self._buffer))
+
+    def build(self, np: Any) -> _Column:
+        codes = np.frombuffer(self._buffer, dtype=np.int32)
+        offsets = np.frombuffer(self._offsets, dtype=np.int32)
+        return _Column(self.name, self.column_type, self.kind, codes, categories=list(self._codes), offsets=offsets)
+
+
+def _builder_for(column: Dict[str, Any]) -> _ColumnBuilder:
+    column_type = column.get("type")
+    if column_type in _NUMBER_TYPES:
+        return _NumberBuilder(column)
+    if column_type in _DATE_TYPES:
+        return _DateBuilder(column)
+    if column_type == ColumnTypes.CHECKBOX.value:
+        return _BoolBuilder(column)
+    if column_type == ColumnTypes.SINGLE_SELECT.value:
+        return _CategoryBuilder(column)
+    if column_type == ColumnTypes.MULTIPLE_SELECT.value:
+        return _MultiCategoryBuilder(column)
+    return _ColumnBuilder(column)
+
+
+class _SnapshotBuilder:
+    def __init__(self, columns: Iterable[Dict[str, Any]]) -> None:
+        self._np = import_optional("numpy")
+        self._ids: List[str] = []
+        definitions = list(columns)
+        names = {column["name"] for column in definitions}
+        definitions += [column for column in _BUILTIN_COLUMNS if column["name"] not in names]
+        self._builders = [_builder_for(column) for column in definitions]
+
+    def append(self, row: Dict[str, Any]) -> None:
+        self._ids.append(row.get("_id"))
+        get = row.get
+        for builder in self._builders:
+            builder.append(get(builder.name))
+
+    def build(self) -> TableSnapshot:
+        np = self._np
+        row_ids = np.empty(len(self._ids), dtype=object)
+        row_ids[:] = self._ids
+        return TableSnapshot({builder.name: builder.build(np) for builder in self._builders}, row_ids)
+
+
+# ========== 列与快照 ==========
+
+class _Column:
+    __slots__ = ("name", "column_type", "kind", "values", "categories", "offsets")
+
+    def __init__(self, name: str, column_type: Optional[str], kind: str, values: Any,
+                 categories: Optional[List[Any]] = None, offsets: Any = None) -> None:
+        self.name = name
+        self.column_type = column_type
+        self.kind = kind
+        self.values = values
+        self.categories = categories
+        self.offsets = offsets
+
+    def take(self, np: Any, indices: Any) -> _Column:
+        if self.kind != "multi":
+            return _Column(self.name, self.column_type, self.kind, self.values[indices], self.categories)
+        starts = self.offsets[:-1][indices]
+        lengths = self.offsets[1:][indices] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int32)
+        return _Column(self.name, self.column_type, self.kind, self.values[gather], self.categories, offsets)
+
+    def item_rows(self, np: Any) -> Any:
+        """多选列每个编码所属的行号"""
+        return np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+
+
+class TableSnapshot:
+    """列式的表快照
+
+    数字类列（number、duration、rate）为 float64，空值为 NaN；日期类列（date、ctime、mtime）为
+    datetime64[ms]，空值为 NaT；复选框为 bool；单选为 int32 字典编码；多选为 offsets 加字典编码；
+    其余列类型保存为 object 数组。
+
+    示例:
+        snapshot = await api.snapshot("Table1")
+        adults = snapshot.filter(snapshot.mask("Age", ">=", 18))
+        print(adults.group_by("Status", "Amount", agg="sum"))
+        df = snapshot.to_pandas()
+    """
+
+    def __init__(self, columns: Dict[str, _Column], row_ids: Any) -> None:
+        self._np = import_optional("numpy")
+        self._columns = columns
+        self.row_ids = row_ids
+
+    def __str__(self) -> str:
+        return f"<SeaTable TableSnapshot [{len(self)} rows x {len(self._columns)} columns]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], columns: Iterable[Dict[str, Any]]) -> TableSnapshot:
+        """由行列表构建快照
+
+        :param rows: 以列名为键的行，如 list_rows 或 query 的结果
+        :param columns: 列定义（含 name、type 与选项），决定各列的存储类型
+        """
+        builder = _SnapshotBuilder(columns)
+        for row in rows:
+            builder.append(row)
+        return builder.build()
+
+    @classmethod
+    async def from_async_rows(cls, rows: AsyncIterable[Dict[str, Any]], columns: Iterable[Dict[str, Any]]) -> TableSnapshot:
+        """由异步行迭代器（如 api.iter_rows）逐行构建快照，不保留整表的行字典"""
+        builder = _SnapshotBuilder(columns)
+        async for row in rows:
+            builder.append(row)
+        return builder.build()
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def _column(self, name: str) -> _Column:
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"column '{name}' not found") from None
+
+    def column(self, name: str) -> np.ndarray:
+        """列的值数组：数字、日期、复选框列直接返回底层数组，单选列解码为 object 数组，多选列为列表组成的 object 数组"""
+        np = self._np
+        column = self._column(name)
+        if column.kind == "category":
+            labels = np.empty(len(column.categories) + 1, dtype=object)
+            labels[:-1] = column.categories
+            return labels[column.values]
+        if column.kind == "multi":
+            categories = column.categories
+            offsets = column.offsets.tolist()
+            codes = column.values.tolist()
+            result = np.empty(len(self), dtype=object)
+            result[:] = [[categories[code] for code in codes[offsets[i]:offsets[i + 1]]] for i in range(len(self))]
+            return result
+        return column.values
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def _scalar(self, column: _Column, value: Any) -> Any:
+        if column.kind == "date":
+            return self._np.datetime64(_date_value(value), "ms") if not isinstance(value, self._np.datetime64) else value
+        return value
+
+    def mask(self, name: str, op: str, value: Any) -> np.ndarray:
+        """按条件生成布尔掩码
+
+        :param op: "=", "!=", ">", ">=", "<", "<=" 或 "in"（value 为可迭代对象）；
+            多选列的 "=" / "!=" 表示包含 / 不包含该选项
+        """
+        np = self._np
+        column = self._column(name)
+        if op == "in":
+            result = np.zeros(len(self), dtype=bool)
+            for item in value:
+                result |= self.mask(name, "=", item)
+            return result
+        if column.kind in ("category", "multi"):
+            if op not in ("=", "!="):
+                raise ValueError(f"{column.column_type} type column does not support the operator '{op}'")
+            code = column.categories.index(value) if value in column.categories else None
+            if column.kind == "category":
+                hit = column.values == code if code is not None else np.zeros(len(self), dtype=bool)
+            else:
+                hit = np.zeros(len(self), dtype=bool)
+                if code is not None:
+                    hit[column.item_rows(np)[column.values == code]] = True
+            return hit if op == "=" else ~hit
+        values = column.values
+        scalar = self._scalar(column, value)
+        if op == "=":
+            return values == scalar
+        if op == "!=":
+            return values != scalar
+        if column.kind not in ("number", "date"):
+            raise ValueError(f"{column.column_type} type column does not support the operator '{op}'")
+        if op == ">":
+            return values > scalar
+        if op == ">=":
+            return values >= scalar
+        if op == "<":
+            return values < scalar
+        if op == "<=":
+            return values <= scalar
+        raise ValueError(f"unsupported operator '{op}'")
+
+    def filter(self, mask: Any) -> TableSnapshot:
+        """按布尔掩码（或行下标数组）选取行，返回新的快照"""
+        np = self._np
+        mask = np.asarray(mask)
+        indices = np.flatnonzero(mask) if mask.dtype == bool else mask
+        return TableSnapshot({name: column.take(np, indices) for name, column in self._columns.items()}, self.row_ids[indices])
+
+    def sum(self, name: str, mask: Optional[Any] = None) -> float:
+        """数字列求和（忽略空值），复选框列统计勾选数"""
+        column = self._column(name)
+        if column.kind not in ("number", "bool"):
+            raise ValueError(f"{column.column_type} type column does not support sum")
+        values = column.values if mask is None else column.values[mask]
+        return float(self._np.nansum(values)) if column.kind == "number" else int(values.sum())
+
+    def _group_codes(self, column: _Column) -> Tuple[Any, List[Any], Any]:
+        """返回 (每个值的组号, 组键列表, 每个值所属的行号或 None)"""
+        np = self._np
+        if column.kind == "category":
+            return column.values + 1, [None] + column.categories, None
+        if column.kind == "multi":
+            return column.values, list(column.categories), column.item_rows(np)
+        if column.kind == "bool":
+            return column.values.astype(np.int64), [False, True], None
+        if column.kind in ("number", "date"):
+            keys, inverse = np.unique(column.values, return_inverse=True)
+            return inverse, keys.tolist(), None
+        index: Dict[Any, int] = {}
+        try:
+            codes = np.fromiter((index.setdefault(v, len(index)) for v in column.values), dtype=np.int64, count=len(self))
+        except TypeError:
+            raise ValueError(f"{column.column_type} type column does not support group_by") from None
+        return codes, list(index), None
+
+    def group_by(self, by: str, column: Optional[str] = None, agg: str = "count") -> Dict[Any, Any]:
+        """按列分组聚合
+
+        :param by: 分组列；单选列的空值分到 None，多选列按每个选项分别计入
+        :param column: 被聚合的数字列，agg 为 count 时可省略
+        :param agg: "count"、"sum" 或 "mean"，sum/mean 忽略空值
+        """
+        np = self._np
+        codes, keys, rows = self._group_codes(self._column(by))
+        size = len(keys)
+        if agg == "count":
+            totals = np.bincount(codes, minlength=size)
+        else:
+            target = self._column(column) if column else None
+            if target is None or target.kind != "number":
+                raise ValueError("sum and mean need a number column")
+            values = target.values if rows is None else target.values[rows]
+            valid = ~np.isnan(values)
+            sums = np.bincount(codes, weights=np.where(valid, values, 0.0), minlength=size)
+            if agg == "sum":
+                totals = sums
+            elif agg == "mean":
+                counts = np.bincount(codes, weights=valid, minlength=size)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    totals = sums / counts
+            else:
+                raise ValueError(f"unsupported aggregation '{agg}'")
+        present = np.bincount(codes, minlength=size) > 0
+        return {keys[i]: totals[i].item() for i in np.flatnonzero(present)}
+
+    def to_arrow(self) -> pa.Table:
+        """导出为 pyarrow.Table；数字与日期列直接引用底层缓冲区"""
+        pa = import_optional("pyarrow")
+        arrays = [pa.array(self.row_ids.tolist(), type=pa.string())]
+        names = ["_id"]
+        for name, column in self._columns.items():
+            if column.kind in ("number", "date", "bool"):
+                arrow_array = pa.array(column.values)
+            elif column.kind == "category":
+                dictionary = pa.array([str(c) for c in column.categories], type=pa.string())
+                arrow_array = pa.DictionaryArray.from_arrays(pa.array(column.values, mask=column.values < 0), dictionary)
+            elif column.kind == "multi":
+                dictionary = pa.array([str(c) for c in column.categories], type=pa.string())
+                items = pa.DictionaryArray.from_arrays(pa.array(column.values), dictionary)
+                arrow_array = pa.ListArray.from_arrays(pa.array(column.offsets), items)
+            else:
+                values = column.values.tolist()
+                try:
+                    arrow_array = pa.array(values)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    # 值类型不统一（如链接、协作人列）时序列化为 JSON 字符串
+                    arrow_array = pa.array([v if v is None or isinstance(v, str) else json_dumps(v).decode("utf-8") for v in values], type=pa.string())
+            arrays.append(arrow_array)
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """导出为 pandas.DataFrame；数字、日期、复选框列不复制，单选列为 Categorical"""
+        pd = import_optional("pandas")
+        data: Dict[str, Any] = {"_id": self.row_ids}
+        for name, column in self._columns.items():
+            if column.kind == "category":
+                data[name] = pd.Categorical.from_codes(column.values, categories=[str(c) for c in column.categories])
+            elif column.kind == "multi":
+                data[name] = self.column(name)
+            else:
+                data[name] = column.values
+        return pd.DataFrame(data, copy=False)
@@ -1,6 +1,5 @@
 """SeaTable WebSocket 异步客户端"""
 import logging
-from datetime import datetime
 from typing import Any, TYPE_CHECKING
 
 import socketio
@@ -86,9 +85,8 @@ class SocketIOAsync:
         await self._sio.connect(url, socketio_path="/api-gateway/socket.io")
 
     async def _ensure_token_fresh(self) -> None:
-        """确保 token 未过期"""
-        if datetime.now() >= self.seatable_api.jwt_exp:
-            await self.seatable_api.auth()
+        """确保 token 未过期，与 HTTP 请求共享同一次刷新"""
+        if await self.seatable_api.ensure_token_fresh():
             logger.info("[ SeaTable SocketIO JWT token refreshed ]")
 
     async def _on_connect(self) -> None:
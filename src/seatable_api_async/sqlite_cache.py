@@ -0,0 +1,254 @@
+"""基于 SQLite 的持久化行缓存，按 _mtime 增量同步"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from .constants import QUERY_PAGE_SIZE
+from .utils import json_dumps, json_loads
+
+if TYPE_CHECKING:
+    from .seatable_api import SeaTableApiAsync
+
+__all__ = ["SQLiteRowCache"]
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    table_id TEXT PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    last_mtime TEXT,
+    synced_at REAL
+)
+"""
+
+
+def _rows_table(table_id: str) -> str:
+    # 表 ID 由服务器生成，仍然转义双引号以防万一
+    return '"rows_' + table_id.replace('"', '""') + '"'
+
+
+def _quote_sql_name(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _keyset_sql(select: str, conditions: List[str], order_by: str, limit: int) -> str:
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"{select}{where} ORDER BY {order_by} LIMIT {limit}"
+
+
+class SQLiteRowCache:
+    """把表的行缓存到本地 SQLite 文件，进程重启后只需增量同步
+
+    每张 SeaTable 表对应一张 SQLite 表（_id 主键、_mtime 索引、行数据为 JSON）。
+    sync 按 (_mtime, _id) 键集分页查询，只拉取 _mtime 不早于上次同步的行，并对比行 ID 集合删除服务器上已删除的行。
+    读取接口直接查询本地文件，不请求服务器；SQLite 操作在线程中执行。
+
+    示例:
+        async with SeaTableApiAsync(token, server_url) as api:
+            async with SQLiteRowCache(api, "cache.db") as cache:
+                await cache.sync("Table1")
+                row = await cache.get_row("Table1", row_id)
+    """
+
+    def __init__(self, seatable_api: "SeaTableApiAsync", path: str, chunk_size: int = QUERY_PAGE_SIZE) -> None:
+        """
+        :param path: SQLite 文件路径，":memory:" 表示只在内存中缓存
+        :param chunk_size: 同步时每次 SQL 查询的行数，最大 10000
+        """
+        self.seatable_api = seatable_api
+        self.path = path
+        self.chunk_size = chunk_size
+        self._conn: Optional[sqlite3.Connection] = None
+        # 同一连接上的操作串行执行
+        self._lock = asyncio.Lock()
+        self._table_ids: Dict[str, str] = {}
+
+    def __str__(self) -> str:
+        return f"<SeaTable SQLiteRowCache [{self.path}]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self) -> SQLiteRowCache:
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """打开数据库文件，读取各表的同步状态"""
+        if self._conn is not None:
+            return
+
+        def open_db() -> sqlite3.Connection:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            return conn
+
+        self._conn = await asyncio.to_thread(open_db)
+        states = await self._run(lambda conn: conn.execute("SELECT table_name, table_id FROM sync_state").fetchall())
+        self._table_ids = dict(states)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            async with self._lock:
+                await asyncio.to_thread(conn.close)
+
+    async def _run(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        if self._conn is None:
+            raise RuntimeError("cache is not open")
+        async with self._lock:
+            return await asyncio.to_thread(func, self._conn)
+
+    # ========== 同步 ==========
+
+    async def sync(self, table_name: str, full: bool = False, detect_deletions: bool = True) -> Dict[str, int]:
+        """同步一张表
+
+        :param full: 忽略上次同步的 _mtime，重新拉取全部行（如列被改名后）
+        :param detect_deletions: 是否拉取服务器上的全部行 ID，删除本地多余的行
+        :return: {"updated": 写入的行数, "deleted": 删除的行数}
+        """
+        table = (await self.seatable_api.get_metadata_index()).get_table(table_name)
+        if not table:
+            raise ValueError(f"table '{table_name}' not found")
+        table_id = table["_id"]
+        rows_table = _rows_table(table_id)
+
+        def prepare(conn: sqlite3.Connection) -> Optional[str]:
+            with conn:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {rows_table} (_id TEXT PRIMARY KEY, _mtime TEXT, data TEXT NOT NULL)")
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "rows_{table_id}_mtime" ON {rows_table} (_mtime)')
+                if full:
+                    conn.execute(f"DELETE FROM {rows_table}")
+                    conn.execute("DELETE FROM sync_state WHERE table_id = ?", (table_id,))
+            state = conn.execute("SELECT last_mtime FROM sync_state WHERE table_id = ?", (table_id,)).fetchone()
+            return state[0] if state else None
+
+        last_mtime = await self._run(prepare)
+        sql_table = _quote_sql_name(table["name"])
+
+        # 按 (_mtime, _id) 键集翻页而不是 OFFSET：同步期间被修改的行 _mtime 变大，
+        # 会在之后的页中再次出现，不会让其他行的位置前移而被跳过
+        lower_bound = f"_mtime >= {_sql_literal(last_mtime)}" if last_mtime else None
+        updated = 0
+        cursor: Optional[Tuple[str, str]] = None
+        while True:
+            conditions = [lower_bound] if lower_bound else []
+            if cursor:
+                mtime, row_id = _sql_literal(cursor[0]), _sql_literal(cursor[1])
+                conditions.append(f"(_mtime > {mtime} OR (_mtime = {mtime} AND _id > {row_id}))")
+            chunk = await self.seatable_api.query(_keyset_sql(f"SELECT * FROM {sql_table}", conditions, "_mtime, _id", self.chunk_size)) or []
+            if chunk:
+                last_mtime = await self._run(lambda conn, rows=chunk: self._write_rows(conn, rows_table, rows, last_mtime))
+                updated += len(chunk)
+                cursor = (chunk[-1].get("_mtime") or "", chunk[-1]["_id"])
+            if len(chunk) < self.chunk_size:
+                break
+
+        deleted = 0
+        if detect_deletions:
+            remote_ids: Set[str] = set()
+            last_id: Optional[str] = None
+            while True:
+                conditions = [f"_id > {_sql_literal(last_id)}"] if last_id else []
+                chunk = await self.seatable_api.query(_keyset_sql(f"SELECT _id FROM {sql_table}", conditions, "_id", self.chunk_size), convert=False) or []
+                remote_ids.update(row["_id"] for row in chunk)
+                if len(chunk) < self.chunk_size:
+                    break
+                last_id = chunk[-1]["_id"]
+            deleted = await self._run(lambda conn: self._delete_missing(conn, rows_table, remote_ids))
+
+        def save_state(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (table_id, table_name, last_mtime, synced_at) VALUES (?, ?, ?, ?)",
+                    (table_id, table["name"], last_mtime, time.time()),
+                )
+
+        await self._run(save_state)
+        self._table_ids = {name: tid for name, tid in self._table_ids.items() if tid != table_id}
+        self._table_ids[table["name"]] = table_id
+        return {"updated": updated, "deleted": deleted}
+
+    @staticmethod
+    def _write_rows(conn: sqlite3.Connection, rows_table: str, rows: List[Dict[str, Any]], last_mtime: Optional[str]) -> Optional[str]:
+        records = []
+        for row in rows:
+            mtime = row.get("_mtime")
+            if mtime and (last_mtime is None or mtime > last_mtime):
+                last_mtime = mtime
+            records.append((row["_id"], mtime, json_dumps(row).decode("utf-8")))
+        with conn:
+            conn.executemany(f"INSERT OR REPLACE INTO {rows_table} (_id, _mtime, data) VALUES (?, ?, ?)", records)
+        return last_mtime
+
+    @staticmethod
+    def _delete_missing(conn: sqlite3.Connection, rows_table: str, remote_ids: Set[str]) -> int:
+        local_ids = {row_id for (row_id,) in conn.execute(f"SELECT _id FROM {rows_table}")}
+        missing = [(row_id,) for row_id in local_ids - remote_ids]
+        if missing:
+            with conn:
+                conn.executemany(f"DELETE FROM {rows_table} WHERE _id = ?", missing)
+        return len(missing)
+
+    # ========== 读取 ==========
+
+    def _rows_table_for(self, table_name: str) -> str:
+        table_id = self._table_ids.get(table_name)
+        if table_id is None:
+            raise ValueError(f"table '{table_name}' has not been synced")
+        return _rows_table(table_id)
+
+    async def _select(self, table_name: str, where: str = "", params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        rows_table = self._rows_table_for(table_name)
+        params = tuple(params)
+        records = await self._run(lambda conn: conn.execute(f"SELECT data FROM {rows_table} {where}", params).fetchall())
+        return [json_loads(data) for (data,) in records]
+
+    async def get_row(self, table_name: str, row_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._select(table_name, "WHERE _id = ?", (row_id,))
+        return rows[0] if rows else None
+
+    async def get_rows(self, table_name: str, row_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """按行 ID 批量读取，不存在的 ID 会被跳过"""
+        rows = []
+        row_ids = list(row_ids)
+        # SQLite 默认最多 999 个绑定参数
+        for start in range(0, len(row_ids), 900):
+            part = row_ids[start:start + 900]
+            rows += await self._select(table_name, f"WHERE _id IN ({', '.join('?' * len(part))})", part)
+        return rows
+
+    async def rows(self, table_name: str) -> List[Dict[str, Any]]:
+        """本地缓存的全部行，按 _mtime 排序"""
+        return await self._select(table_name, "ORDER BY _mtime")
+
+    async def changed_since(self, table_name: str, mtime: str) -> List[Dict[str, Any]]:
+        """_mtime 晚于指定时间的行，使用 _mtime 索引"""
+        return await self._select(table_name, "WHERE _mtime > ? ORDER BY _mtime", (mtime,))
+
+    async def count(self, table_name: str) -> int:
+        rows_table = self._rows_table_for(table_name)
+        return await self._run(lambda conn: conn.execute(f"SELECT COUNT(*) FROM {rows_table}").fetchone()[0])
+
+    async def last_mtime(self, table_name: str) -> Optional[str]:
+        """上次同步到的最大 _mtime"""
+        table_id = self._table_ids.get(table_name)
+        if table_id is None:
+            return None
+        state = await self._run(lambda conn: conn.execute("SELECT last_mtime FROM sync_state WHERE table_id = ?", (table_id,)).fetchone())
+        return state[0] if state else None
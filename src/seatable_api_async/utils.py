@@ -1,15 +1,37 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import functools
+import hashlib
+import importlib
 import json
 import logging
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .compact_row import BUILTIN_FIELDS, CompactRow
+from .constants import CONVERTER_CACHE_SIZE, DATE_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
 # 预编译正则表达式
 _TABLE_ID_PATTERN = re.compile(r"^[-0-9a-zA-Z]{4}$")
+# 以 SELECT 开头的只读查询（允许前导空白与左括号）
+_SQL_SELECT_PATTERN = re.compile(r"^[\s(]*select\b", re.IGNORECASE)
+# SQL 末尾的 LIMIT 子句：LIMIT n / LIMIT n OFFSET m / LIMIT m, n
+_SQL_LIMIT_PATTERN = re.compile(
+    r"\s+limit\s+(\d+)(?:\s*,\s*(\d+)|\s+offset\s+(\d+))?\s*$",
+    re.IGNORECASE,
+)
 
 # 操作类型到数据键的映射
 _OP_TYPE_MAP = {
@@ -19,6 +41,47 @@ _OP_TYPE_MAP = {
 }
 
 
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# JSON 编解码后端，安装了 orjson 时优先使用
+_json_loads: Callable[[Union[str, bytes]], Any] = orjson.loads if orjson else json.loads
+_json_dumps: Callable[[Any], bytes] = _orjson_dumps if orjson else _std_dumps
+
+
+def set_json_backend(loads: Callable[[Union[str, bytes]], Any], dumps: Callable[[Any], bytes]) -> None:
+    """替换 JSON 编解码后端
+
+    :param loads: 接受 str 或 bytes，解析失败时抛出 json.JSONDecodeError 或其子类
+    :param dumps: 返回 UTF-8 编码的 bytes
+    """
+    global _json_loads, _json_dumps
+    _json_loads, _json_dumps = loads, dumps
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """使用当前后端解析 JSON，可直接传入响应的原始字节"""
+    return _json_loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """使用当前后端序列化为 UTF-8 编码的 JSON 字节"""
+    return _json_dumps(obj)
+
+
+def import_optional(name: str, extra: str = "analytics") -> Any:
+    """按需导入可选依赖，缺失时提示安装对应的 extra"""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(f"{name} is required: pip install seatable-api-async[{extra}]") from e
+
+
 def path_get(data: Optional[Dict[str, Any]], path: str, default: Any = None) -> Any:
     """安全地获取嵌套字典中的值
 
@@ -42,75 +105,153 @@ def _get_row(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return data.get(key) if key else None
 
 
-def _filter_by_id(datas: List[Dict[str, Any]], data_id: str) -> Optional[Dict[str, Any]]:
-    """根据 _id 查找数据，找到第一个匹配项即返回"""
-    return next((i for i in datas if i.get("_id") == data_id), None)
-
-
-def _get_option_name(options: List[Dict[str, Any]], option_id: str) -> Optional[str]:
-    """根据选项 ID 获取选项名称"""
-    res = _filter_by_id(options, option_id)
-    return res["name"] if res else None
-
-
-def _convert_single_select(cell_value: Any, options: Optional[List[Dict[str, Any]]]) -> Any:
+def _convert_single_select(cell_value: Any, option_names: Optional[Dict[str, str]]) -> Any:
     """转换单选字段值"""
-    if not cell_value or not options:
+    if not cell_value or not option_names:
         return cell_value
-    return _get_option_name(options, cell_value)
+    return option_names.get(cell_value)
 
 
-def _convert_multiple_select(cell_value: Any, options: Optional[List[Dict[str, Any]]]) -> Any:
+def _convert_multiple_select(cell_value: Any, option_names: Optional[Dict[str, str]]) -> Any:
     """转换多选字段值"""
-    if not cell_value or not options:
+    if not cell_value or not option_names:
         return cell_value
-    return [_get_option_name(options, option_id) for option_id in cell_value]
+    return [option_names.get(option_id) for option_id in cell_value]
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _format_date(value: str, date_only: bool) -> str:
+    """格式化 ISO 日期字符串，常见形态直接切片，其余交给 strftime；解析失败时抛出 ValueError/TypeError"""
+    # 始终用 fromisoformat 校验，切片结果与 strftime 一致
+    date_value = datetime.fromisoformat(value)
+    # 年份以 0 开头时 strftime 不补零，24 点在部分版本会进位到次日，均走 strftime
+    if len(value) >= 10 and value[4] == "-" and value[7] == "-" and value[0] != "0":
+        if date_only:
+            return value[:10]
+        if len(value) == 10:
+            return f"{value} 00:00:00"
+        if (len(value) >= 16 and value[10] in "T " and value[13] == ":" and value[11:13] != "24"
+                and value[11:13].isdigit() and value[14:16].isdigit()):
+            if len(value) == 16:
+                return f"{value[:10]} {value[11:16]}:00"
+            if len(value) >= 19 and value[16] == ":" and value[17:19].isdigit():
+                return f"{value[:10]} {value[11:19]}"
+    if date_only:
+        return date_value.strftime("%Y-%m-%d")
+    return date_value.strftime("%Y-%m-%d %H:%M:%S")
 
 
 def _convert_date_value(value: Any, date_format: Optional[str]) -> Any:
-    """转换日期字段值"""
+    """转换日期字段值，重复出现的值直接取缓存"""
     if not value:
         return None
     try:
-        date_value = datetime.fromisoformat(value)
-        if date_format == "YYYY-MM-DD":
-            return date_value.strftime("%Y-%m-%d")
-        return date_value.strftime("%Y-%m-%d %H:%M:%S")
+        return _format_date(value, date_format == "YYYY-MM-DD")
     except (ValueError, TypeError) as e:
         logger.warning(f"Format date error: {e}")
         return value
 
 
-def _convert_long_text(value: Any, **_) -> str:
+def _convert_long_text(value: Any, _: Any = None) -> str:
     """转换长文本字段值"""
     return value["text"] if value else ""
 
 
-# WebSocket 行转换器映射
-_WS_CONVERTERS: Dict[str, Callable] = {
-    "single-select": lambda value, options, **_: _convert_single_select(value, options),
-    "multiple-select": lambda value, options, **_: _convert_multiple_select(value, options),
+# WebSocket 行转换器映射，参数为 (单元格值, 选项 ID 到名称的映射)
+_WS_CONVERTERS: Dict[str, Callable[[Any, Optional[Dict[str, str]]], Any]] = {
+    "single-select": _convert_single_select,
+    "multiple-select": _convert_multiple_select,
     "long-text": _convert_long_text,
 }
 
 
-def convert_row(metadata: Dict[str, Any], ws_data: str) -> Dict[str, Any]:
+class MetadataIndex:
+    """Base 元数据的字典索引：按表名/表 ID 查表，按列名/列 key 查列，按选项 ID 查选项名
+
+    只在表结构变化时重建，可在多次 convert_row 调用间复用。
+
+    示例:
+        index = MetadataIndex(await api.get_metadata())
+        row = convert_row(index, ws_data)
+    """
+
+    def __init__(self, metadata: Dict[str, Any]) -> None:
+        self.metadata = metadata
+        tables = metadata.get("tables") or []
+        self._tables_by_name: Dict[str, Dict[str, Any]] = {t["name"]: t for t in tables}
+        self._tables_by_id: Dict[str, Dict[str, Any]] = {t["_id"]: t for t in tables}
+        self._columns_by_name = {t["_id"]: {c["name"]: c for c in t.get("columns") or []} for t in tables}
+        self._columns_by_key = {t["_id"]: {c["key"]: c for c in t.get("columns") or []} for t in tables}
+        # 选项映射按列懒加载
+        self._option_names: Dict[Tuple[str, str], Optional[Dict[str, str]]] = {}
+
+    def __str__(self) -> str:
+        return f"<SeaTable MetadataIndex [{len(self._tables_by_id)} tables]>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def tables(self) -> List[Dict[str, Any]]:
+        return list(self._tables_by_id.values())
+
+    def get_table(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """按表名查找表，表名形如表 ID 时也按 ID 查找"""
+        table = self._tables_by_name.get(table_name)
+        if table is None and like_table_id(table_name):
+            table = self._tables_by_id.get(table_name)
+        return table
+
+    def get_table_by_id(self, table_id: str) -> Optional[Dict[str, Any]]:
+        return self._tables_by_id.get(table_id)
+
+    def get_column_by_name(self, table_name: str, column_name: str) -> Optional[Dict[str, Any]]:
+        table = self.get_table(table_name)
+        return self._columns_by_name[table["_id"]].get(column_name) if table else None
+
+    def get_column_by_key(self, table_name: str, column_key: str) -> Optional[Dict[str, Any]]:
+        table = self.get_table(table_name)
+        return self._columns_by_key[table["_id"]].get(column_key) if table else None
+
+    def columns_by_key(self, table_id: str) -> Dict[str, Dict[str, Any]]:
+        """表 ID 对应的列 key 到列定义的映射"""
+        return self._columns_by_key.get(table_id, {})
+
+    def option_names(self, table_id: str, column_key: str) -> Optional[Dict[str, str]]:
+        """单选/多选列的选项 ID 到名称的映射，列没有选项时返回 None"""
+        cache_key = (table_id, column_key)
+        if cache_key in self._option_names:
+            return self._option_names[cache_key]
+        column = self._columns_by_key.get(table_id, {}).get(column_key)
+        options = path_get(column, "data.options") if column else None
+        names = {option["id"]: option["name"] for option in options} if options else None
+        self._option_names[cache_key] = names
+        return names
+
+
+def convert_row(metadata: Union[Dict[str, Any], MetadataIndex], ws_data: str) -> Dict[str, Any]:
     """Convert websocket row data to readable row data
 
-    :param metadata: dict
+    :param metadata: dict, or a MetadataIndex reused across events
     :param ws_data: str
     :return: dict
     """
-    data = json.loads(ws_data)
+    index = metadata if isinstance(metadata, MetadataIndex) else MetadataIndex(metadata)
+    return convert_operation(index, json_loads(ws_data))
+
+
+def convert_operation(index: MetadataIndex, data: Dict[str, Any]) -> Dict[str, Any]:
+    """转换已解析的单行操作（insert_row / modify_row / delete_row），其他操作原样返回"""
     row = _get_row(data)
     if not row:
         return data
 
-    table = _filter_by_id(metadata["tables"], data["table_id"])
+    table_id = data["table_id"]
+    table = index.get_table_by_id(table_id)
     if not table:
         return data
 
-    column_map = {column["key"]: column for column in table["columns"]}
+    column_map = index.columns_by_key(table_id)
 
     result: Dict[str, Any] = {
         "_id": data["row_id"],
@@ -123,10 +264,11 @@ def convert_row(metadata: Dict[str, Any], ws_data: str) -> Dict[str, Any]:
         if not column:
             continue
 
-        column_type = column["type"]
-        options = path_get(column, "data.options")
-        converter = _WS_CONVERTERS.get(column_type, lambda value, **_: value)
-        result[column["name"]] = converter(value=cell_value, options=options)
+        converter = _WS_CONVERTERS.get(column["type"])
+        if converter is None:
+            result[column["name"]] = cell_value
+        else:
+            result[column["name"]] = converter(cell_value, index.option_names(table_id, column_key))
 
     return result
 
@@ -162,21 +304,65 @@ def _build_select_map(metadata: List[Dict[str, Any]]) -> Dict[str, Dict[str, str
 
 def convert_db_rows(
     metadata: List[Dict[str, Any]],
-    results: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]],
+    row_factory: Optional[Type[CompactRow]] = None,
+) -> List[Any]:
     """Convert dtable-db rows data to readable rows data
 
     :param metadata: list of column definitions
     :param results: list of row data
+    :param row_factory: CompactRow (or a subclass) to build compact rows instead of dicts
     :return: list of converted rows
     """
     if not results:
         return []
 
-    column_map = {column["key"]: column for column in metadata}
-    select_map = _build_select_map(metadata)
-
-    return [_convert_single_row(row, column_map, select_map) for row in results]
+    if row_factory is not None:
+        return _convert_db_rows_compact(compile_row_converter(metadata), results, row_factory)
+
+    get_entry = compile_row_converter(metadata).get
+    rows: List[Dict[str, Any]] = []
+    for row in results:
+        item: Dict[str, Any] = {}
+        for column_key, value in row.items():
+            entry = get_entry(column_key)
+            if entry is None:
+                item[column_key] = value
+                continue
+            column_name, converter = entry
+            item[column_name] = value if converter is None else converter(value)
+        rows.append(item)
+    return rows
+
+
+def _convert_db_rows_compact(plan: RowConverterPlan, results: List[Dict[str, Any]], row_factory: Type[CompactRow]) -> List[CompactRow]:
+    """按转换计划直接构建紧凑行，不创建中间 dict"""
+    names = [name for name, _ in plan.values() if name not in BUILTIN_FIELDS]
+    layout = row_factory.layout(BUILTIN_FIELDS + tuple(names))
+    positions = layout._positions
+    # 列 key -> (字段位置, 转换函数)；内置列的 key 与字段名相同
+    slots = {key: (positions[name], converter) for key, (name, converter) in plan.items()}
+    slots.update((name, (positions[name], None)) for name in BUILTIN_FIELDS)
+    get_slot = slots.get
+    from_values = layout.from_values
+    size = len(positions) + 1
+
+    rows: List[CompactRow] = []
+    for row in results:
+        values: List[Any] = [None] * size
+        extras: Optional[Dict[str, Any]] = None
+        for column_key, value in row.items():
+            slot = get_slot(column_key)
+            if slot is None:
+                if extras is None:
+                    extras = {}
+                extras[column_key] = value
+                continue
+            index, converter = slot
+            values[index] = value if converter is None else converter(value)
+        values[-1] = extras
+        rows.append(from_values(values))
+    return rows
 
 
 def _convert_link_values(value: List[Dict[str, Any]], s_map: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
@@ -205,39 +391,106 @@ def _convert_link_formula_values(value: List[Any], s_map: Optional[Dict[str, str
     return [s_map.get(v, v) for v in value]
 
 
-def _convert_single_row(
-    result: Dict[str, Any],
-    column_map: Dict[str, Dict[str, Any]],
-    select_map: Dict[str, Dict[str, str]]
-) -> Dict[str, Any]:
-    """转换单行数据"""
-    item: Dict[str, Any] = {}
+def _select_converter(s_map: Dict[str, str]) -> Callable[[Any], Any]:
+    return lambda value: s_map.get(value, value) if value else value
 
-    for column_key, value in result.items():
-        if column_key not in column_map:
-            item[column_key] = value
-            continue
 
-        column = column_map[column_key]
-        column_name = column["name"]
+def _multiple_select_converter(s_map: Dict[str, str]) -> Callable[[Any], Any]:
+    return lambda value: [s_map.get(v, v) for v in value] if value else value
+
+
+def _link_converter(s_map: Dict[str, str]) -> Callable[[Any], Any]:
+    return lambda value: _convert_link_values(value, s_map) if value else value
+
+
+def _link_formula_converter(s_map: Dict[str, str]) -> Callable[[Any], Any]:
+    return lambda value: _convert_link_formula_values(value, s_map) if value else value
+
+
+def _date_converter(date_format: Optional[str]) -> Callable[[Any], Any]:
+    return lambda value: _convert_date_value(value, date_format)
+
+
+# 带选项映射的列类型 -> 转换函数工厂；没有选项映射时这些列原样输出
+_SELECT_CONVERTER_FACTORIES: Dict[str, Callable[[Dict[str, str]], Callable[[Any], Any]]] = {
+    "single-select": _select_converter,
+    "multiple-select": _multiple_select_converter,
+    "link": _link_converter,
+    "link-formula": _link_formula_converter,
+}
+
+# 转换计划：列 key -> (输出列名, 转换函数)，转换函数为 None 时原样输出
+RowConverterPlan = Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]]
+
+_converter_cache: OrderedDict[bytes, RowConverterPlan] = OrderedDict()
+_converter_cache_lock = threading.Lock()
+
+
+def _build_converter_plan(metadata: List[Dict[str, Any]]) -> RowConverterPlan:
+    select_map = _build_select_map(metadata)
+    plan: RowConverterPlan = {}
+    for column in metadata:
+        column_key = column["key"]
         column_type = column.get("type")
-        s_map = select_map.get(column_key)
-
-        # 根据列类型转换值
-        if column_type == "single-select" and value and s_map:
-            item[column_name] = s_map.get(value, value)
-        elif column_type == "multiple-select" and value and s_map:
-            item[column_name] = [s_map.get(v, v) for v in value]
-        elif column_type == "link" and value:
-            item[column_name] = _convert_link_values(value, s_map)
-        elif column_type == "link-formula" and value:
-            item[column_name] = _convert_link_formula_values(value, s_map)
-        elif column_type == "date":
-            item[column_name] = _convert_date_value(value, path_get(column, "data.format"))
-        else:
-            item[column_name] = value
+        converter: Optional[Callable[[Any], Any]] = None
+        if column_type == "date":
+            converter = _date_converter(path_get(column, "data.format"))
+        elif column_type in _SELECT_CONVERTER_FACTORIES and column_key in select_map:
+            converter = _SELECT_CONVERTER_FACTORIES[column_type](select_map[column_key])
+        plan[column_key] = (column["name"], converter)
+    return plan
+
 
-    return item
+def compile_row_converter(metadata: List[Dict[str, Any]]) -> RowConverterPlan:
+    """将 dtable-db 的列定义编译为转换计划，按元数据指纹缓存，相同表结构的查询复用同一计划
+
+    :param metadata: list of column definitions
+    :return: 列 key -> (输出列名, 转换函数或 None)
+    """
+    fingerprint = hashlib.blake2b(json_dumps(metadata), digest_size=16).digest()
+    with _converter_cache_lock:
+        plan = _converter_cache.get(fingerprint)
+        if plan is not None:
+            _converter_cache.move_to_end(fingerprint)
+            return plan
+    plan = _build_converter_plan(metadata)
+    with _converter_cache_lock:
+        _converter_cache[fingerprint] = plan
+        if len(_converter_cache) > CONVERTER_CACHE_SIZE:
+            _converter_cache.popitem(last=False)
+    return plan
+
+
+def merge_batch_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """合并分块批量操作的响应
+
+    数值字段求和，列表字段拼接，布尔字段取与，其余字段保留首个非空值。
+    """
+    merged: Dict[str, Any] = {}
+    for res in results:
+        for key, value in (res or {}).items():
+            current = merged.get(key)
+            if current is None:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, bool):
+                merged[key] = current and value
+            elif isinstance(value, (int, float)):
+                merged[key] = current + value
+            elif isinstance(value, list):
+                current.extend(value)
+    return merged
+
+
+def parse_jwt_exp(token: Optional[str]) -> Optional[datetime]:
+    """读取 JWT 的 exp 声明（不校验签名），返回本地时间，无法解析时返回 None"""
+    if not token:
+        return None
+    try:
+        payload = token.split(".")[1]
+        claims = json_loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return datetime.fromtimestamp(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError, binascii.Error, OverflowError, OSError):
+        return None
 
 
 def parse_headers(token: str) -> Dict[str, str]:
@@ -253,6 +506,27 @@ def parse_server_url(server_url: str) -> str:
     return server_url.rstrip("/")
 
 
+def is_select_sql(sql: str) -> bool:
+    """SQL 是否为只读的 SELECT 语句，只有这类查询可以在超时或 5xx 后安全重放"""
+    return bool(_SQL_SELECT_PATTERN.match(sql))
+
+
+def split_sql_limit(sql: str) -> Tuple[str, Optional[int], int]:
+    """拆分 SQL 末尾的 LIMIT/OFFSET 子句
+
+    :param sql: SQL 语句
+    :return: (去掉 LIMIT 子句的 SQL, limit 或 None, offset)
+    """
+    sql = sql.strip().rstrip(";").rstrip()
+    match = _SQL_LIMIT_PATTERN.search(sql)
+    if not match:
+        return sql, None, 0
+    first, comma_count, offset = match.groups()
+    if comma_count is not None:
+        return sql[:match.start()], int(comma_count), int(first)
+    return sql[:match.start()], int(first), int(offset or 0)
+
+
 def like_table_id(value: str) -> bool:
     """检查值是否为有效的表 ID（4 字符字母数字）"""
     return _TABLE_ID_PATTERN.match(value) is not None
@@ -0,0 +1,90 @@
+"""认证结果的磁盘缓存：冷启动复用、主动续期与失效 JWT 的清理"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from seatable_api_async import AuthCache, SeaTableApiAsync, SeatableApiException
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AuthCache(str(tmp_path / "auth"))
+
+
+async def test_second_client_skips_authentication(stub, cache):
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        token = api.jwt_token
+    assert stub.request_count == 1
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        assert api.jwt_token == token
+        assert api.dtable_uuid is not None
+        assert len(await api.list_rows(stub.table_name, limit=10)) == 10
+    assert stub.request_count == 2
+    path = cache._path(stub.url, stub.api_token)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+async def test_expiring_entry_is_not_used(stub, cache):
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        await cache.save(stub.url, stub.api_token, {"access_token": "old"}, datetime.now() + timedelta(minutes=1))
+        await api.auth()
+        assert api.jwt_token != "old"
+    assert stub.request_count == 2
+
+
+async def test_refresh_bypasses_the_cache(stub, cache):
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        token = api.jwt_token
+        await api.auth(use_cache=False)
+        assert api.jwt_token != token
+        # 新 token 写回缓存
+        assert (await cache.load(stub.url, stub.api_token))["data"]["access_token"] == api.jwt_token
+    assert stub.request_count == 2
+
+
+async def test_background_refresh_bypasses_the_cache(stub, cache):
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache, auto_refresh=True) as api:
+        token = api.jwt_token
+        # 缓存中的 token 仍有效，后台续期也要向服务器重新认证
+        api.jwt_exp = datetime.now()
+        api.stop_auto_refresh()
+        api.start_auto_refresh()
+        await asyncio.sleep(1.2)
+        assert api.jwt_token != token
+    assert stub.request_count == 2
+
+
+async def test_rejected_jwt_is_evicted_and_reauthenticated(stub, cache):
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        stub.revoked_tokens.add(api.jwt_token)
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        requests = stub.request_count
+        rows = await api.list_rows(stub.table_name, limit=10)
+        assert len(rows) == 10
+        # 被拒绝的请求、重新认证、重发
+        assert stub.request_count - requests == 3
+        assert api.jwt_token not in stub.revoked_tokens
+        assert (await cache.load(stub.url, stub.api_token))["data"]["access_token"] == api.jwt_token
+
+
+async def test_rejected_jwt_without_cache_is_raised(stub, api):
+    stub.revoked_tokens.add(api.jwt_token)
+    requests = stub.request_count
+    with pytest.raises(SeatableApiException, match="401"):
+        await api.list_rows(stub.table_name)
+    assert stub.request_count - requests == 1
+
+
+async def test_unreadable_or_corrupt_entry_is_a_miss(stub, cache):
+    path = cache._path(stub.url, stub.api_token)
+    os.makedirs(path)
+    assert await cache.load(stub.url, stub.api_token) is None
+    os.rmdir(path)
+    with open(path, "wb") as f:
+        f.write(b"{not json")
+    assert await cache.load(stub.url, stub.api_token) is None
+    async with SeaTableApiAsync(stub.api_token, stub.url, auth_cache=cache) as api:
+        assert api.is_authed
+    assert (await cache.load(stub.url, stub.api_token))["data"]["access_token"] == api.jwt_token
@@ -0,0 +1,57 @@
+"""批量行操作的自动分块与响应合并"""
+import pytest
+
+from seatable_api_async import BatchRowsError, SeatableApiException
+from seatable_api_async.utils import merge_batch_results
+
+
+def test_merge_batch_results():
+    merged = merge_batch_results([
+        {"inserted_row_count": 2, "success": True, "row_ids": ["a"], "first_row": {"_id": "a"}},
+        None,
+        {"inserted_row_count": 3, "success": False, "row_ids": ["b", "c"], "first_row": {"_id": "b"}},
+    ])
+    assert merged == {"inserted_row_count": 5, "success": False, "row_ids": ["a", "b", "c"], "first_row": {"_id": "a"}}
+
+
+async def test_append_is_chunked_and_merged(stub, api):
+    requests = stub.request_count
+    result = await api.batch_append_rows(stub.table_name, [{"名称": f"n{i}"} for i in range(230)], chunk_size=100, concurrency=3)
+    assert stub.request_count - requests == 3
+    assert result["inserted_row_count"] == 230
+    assert len(stub._rows) == 480
+
+
+async def test_update_and_delete_are_chunked(stub, api):
+    row_ids = list(stub._rows)
+    await api.batch_update_rows(stub.table_name, [{"row_id": row_id, "row": {"数量": -1}} for row_id in row_ids[:150]], chunk_size=40)
+    assert all(stub._rows[row_id]["a001"] == -1 for row_id in row_ids[:150])
+    assert stub._rows[row_ids[150]]["a001"] != -1
+
+    result = await api.batch_delete_rows(stub.table_name, row_ids[:150], chunk_size=40, concurrency=2)
+    assert result["deleted_rows"] == 150
+    assert len(stub._rows) == 100
+
+
+async def test_partial_failure_raises_batch_rows_error(stub, api):
+    post = api.post
+
+    async def failing_post(url, *args, **kwargs):
+        if kwargs["json"]["rows"][0]["名称"] == "n100":
+            raise SeatableApiException("chunk rejected")
+        return await post(url, *args, **kwargs)
+
+    api.post = failing_post
+    with pytest.raises(BatchRowsError) as excinfo:
+        await api.batch_append_rows(stub.table_name, [{"名称": f"n{i}"} for i in range(250)], chunk_size=100)
+    error = excinfo.value
+    assert error.chunk_count == 3
+    assert [(e["chunk"], e["start"], e["size"]) for e in error.errors] == [(1, 100, 100)]
+    # 成功块的响应仍然合并后保留
+    assert error.result["inserted_row_count"] == 150
+    assert len(stub._rows) == 400
+
+
+async def test_invalid_chunk_size(stub, api):
+    with pytest.raises(ValueError):
+        await api.batch_append_rows(stub.table_name, [{"名称": "x"}], chunk_size=0)
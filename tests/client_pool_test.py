@@ -0,0 +1,55 @@
+"""多 Base 客户端池：共享连接池、单次认证与 LRU 淘汰"""
+import asyncio
+
+import pytest
+
+from seatable_api_async import SeaTableClientPool
+
+
+async def test_concurrent_get_authenticates_once(stub):
+    async with SeaTableClientPool(stub.url) as pool:
+        clients = await asyncio.gather(*(pool.get("token-a") for _ in range(20)))
+        assert all(client is clients[0] for client in clients)
+        assert stub.request_count == 1
+        assert await pool.get("token-a") is clients[0]
+        assert stub.request_count == 1
+
+
+async def test_clients_share_the_pool_session(stub):
+    async with SeaTableClientPool(stub.url) as pool:
+        a = await pool.get("token-a")
+        b = await pool.get("token-b")
+        assert a is not b
+        assert a.session is b.session is pool.session
+        assert len(await a.list_rows(stub.table_name)) == 250
+    assert a.session.closed
+
+
+async def test_least_recently_used_client_is_evicted(stub):
+    async with SeaTableClientPool(stub.url, max_bases=2) as pool:
+        a = await pool.get("token-a")
+        await pool.get("token-b")
+        # 访问 a 后 b 成为最久未使用的客户端
+        await pool.get("token-a")
+        await pool.get("token-c")
+        assert len(pool) == 2
+        assert await pool.get("token-a") is a
+        requests = stub.request_count
+        await pool.get("token-b")
+        assert stub.request_count - requests == 1
+
+
+async def test_evict_and_closed_pool(stub):
+    pool = SeaTableClientPool(stub.url)
+    with pytest.raises(RuntimeError):
+        await pool.get("token-a")
+    async with pool:
+        a = await pool.get("token-a")
+        pool.evict("token-a")
+        assert len(pool) == 0
+        assert await pool.get("token-a") is not a
+
+
+def test_max_bases_must_be_positive():
+    with pytest.raises(ValueError):
+        SeaTableClientPool("https://cloud.seatable.io", max_bases=0)
@@ -0,0 +1,52 @@
+"""日期列解析：切片快速路径与 strptime 结果一致，UTC 时间按各自的偏移转为本地时间"""
+import time
+from datetime import datetime
+
+import pytest
+
+from seatable_api_async.column import CTimeColumn, DateColumn, _parse_date_str, _strptime_date_str, _utc_to_local
+from seatable_api_async.utils import _format_date
+
+
+@pytest.fixture
+def berlin(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    _utc_to_local.cache_clear()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+    _utc_to_local.cache_clear()
+
+
+@pytest.mark.parametrize("value", [
+    "2025-06-01", "2025-06-01 08", "2025-06-01 08:30", "2025-06-01 08:30:15", "2025-6-1", "2025-06-01 8:5:3",
+])
+def test_parse_date_str_matches_strptime(value):
+    assert _parse_date_str(value) == _strptime_date_str(value)
+
+
+@pytest.mark.parametrize("value", ["2025-13-01", "2025-06-01 25:00", "2025-06-01T08:30", "yesterday"])
+def test_invalid_input_is_rejected(value):
+    with pytest.raises(ValueError):
+        DateColumn().parse_input_value(value)
+
+
+@pytest.mark.parametrize("value, date_only, expected", [
+    ("2025-06-01T08:30:15.123+08:00", False, "2025-06-01 08:30:15"),
+    ("2025-06-01T08:30+08:00", False, "2025-06-01 08:30:00"),
+    ("2025-06-01", False, "2025-06-01 00:00:00"),
+    ("2025-06-01T08:30:15+08:00", True, "2025-06-01"),
+    ("0999-06-01T08:30:15", False, datetime(999, 6, 1, 8, 30, 15).strftime("%Y-%m-%d %H:%M:%S")),
+])
+def test_format_date(value, date_only, expected):
+    assert _format_date(value, date_only) == expected
+
+
+def test_utc_to_local_uses_the_offset_of_each_value(berlin):
+    column = CTimeColumn()
+    # 冬令时 UTC+1，夏令时 UTC+2
+    assert column.get_local_time("2025-01-15T12:00:00.000000+00:00") == datetime(2025, 1, 15, 13, 0)
+    assert column.get_local_time("2025-07-15T12:00:00.000+00:00") == datetime(2025, 7, 15, 14, 0)
+    # 快速路径之外的形态走 strptime，结果相同
+    assert column.get_local_time("2025-07-15T12:00:00.5+00:00") == datetime(2025, 7, 15, 14, 0, 0, 500000)
@@ -0,0 +1,130 @@
+"""CompactRow 紧凑行"""
+import pickle
+import time
+
+import pytest
+
+from seatable_api_async import CompactRow, SeaTableApiAsync
+from seatable_api_async.compact_row import _layouts
+from seatable_api_async.constants import COMPACT_LAYOUT_CACHE_SIZE
+from seatable_api_async.utils import convert_db_rows
+from stub_server import StubSeaTable
+
+COLUMNS = StubSeaTable.columns
+Row = CompactRow.for_columns(COLUMNS)
+
+
+def test_layout_is_shared():
+    assert CompactRow.for_columns(COLUMNS) is Row
+    assert Row._fields[:3] == ("_id", "_ctime", "_mtime")
+    assert CompactRow.layout(("_id", "名称")) is not Row
+
+
+def test_access():
+    row = Row.from_dict({"_id": "r1", "名称": "abc", "数量": 0, "extra": 1})
+    assert row["名称"] == row.名称 == "abc"
+    assert row._id == "r1"
+    assert row["数量"] == 0
+    # 缺失的字段为 None，额外的键可按名称访问
+    assert row["备注"] is None
+    assert row["extra"] == row.extra == 1
+    assert row.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        row["missing"]
+    with pytest.raises(AttributeError):
+        row.missing
+    # 整数下标仍按 tuple 访问
+    assert row[0] == "r1"
+
+
+def test_dict_conversion():
+    data = {"_id": "r1", "_ctime": "c", "_mtime": "m", "名称": "abc", "标签": ["a"], "extra": {"x": 1}}
+    row = Row.from_dict(data)
+    assert {key: value for key, value in row.as_dict().items() if value is not None} == data
+    assert row.keys() == list(Row._fields) + ["extra"]
+    assert dict(row.items()) == row.as_dict()
+
+
+def test_field_shadowing_tuple_method():
+    layout = CompactRow.layout(("_id", "count", "index"))
+    row = layout.from_dict({"_id": "r1", "count": 3, "index": 4})
+    assert row["count"] == 3 and row["index"] == 4
+    # 与 tuple 方法重名的列只能用 row["列名"] 访问
+    assert callable(row.count)
+
+
+def test_pickle_roundtrip():
+    row = Row.from_dict({"_id": "r1", "名称": "abc", "extra": 1})
+    restored = pickle.loads(pickle.dumps(row))
+    assert type(restored) is Row
+    assert restored == row
+    assert restored.extra == 1
+
+
+def test_convert_db_rows_matches_dicts(stub):
+    results = list(stub._rows.values())[:20]
+    dicts = convert_db_rows(COLUMNS, results)
+    rows = convert_db_rows(COLUMNS, results, row_factory=CompactRow)
+    assert [{key: value for key, value in row.as_dict().items() if key in d} for row, d in zip(rows, dicts)] == dicts
+
+
+async def test_list_and_iter_rows(stub, api):
+    dicts = await api.list_rows(stub.table_name, limit=50)
+    rows = await api.list_rows(stub.table_name, limit=50, row_factory=CompactRow)
+    assert all(isinstance(row, CompactRow) for row in rows)
+    assert [row.as_dict() for row in rows] == dicts
+    iterated = [row async for row in api.iter_rows(stub.table_name, page_size=100, row_factory=CompactRow)]
+    assert len(iterated) == 250
+    assert type(iterated[0]) is type(iterated[-1])
+
+
+def test_layout_cache_is_bounded():
+    saved = dict(_layouts)
+    try:
+        first = CompactRow.layout(("_id", "first"))
+        for i in range(COMPACT_LAYOUT_CACHE_SIZE):
+            CompactRow.layout(("_id", f"c{i}"))
+        assert len(_layouts) <= COMPACT_LAYOUT_CACHE_SIZE
+        assert CompactRow.layout(("_id", "first")) is not first
+        # 淘汰后重新生成的布局与原有的行仍然相等
+        assert first.from_dict({"first": 1}) == CompactRow.layout(("_id", "first")).from_dict({"first": 1})
+    finally:
+        _layouts.clear()
+        _layouts.update(saved)
+
+
+async def test_layout_follows_the_table_columns(stub, api):
+    rows = await api.list_rows(stub.table_name, limit=5, row_factory=CompactRow)
+    # 字段顺序取自列定义，而不是行中键的顺序
+    assert type(rows[0]) is Row
+    assert await api.list_rows(stub.table_name, start=1000, row_factory=CompactRow) == []
+
+
+async def test_columns_are_fetched_alongside_rows():
+    async with StubSeaTable(row_count=10, latency=0.1) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url) as api:
+            requests = stub.request_count
+            started = time.perf_counter()
+            await api.list_rows(stub.table_name, row_factory=CompactRow)
+            # 行与列定义同时请求，耗时约为一次往返
+            assert time.perf_counter() - started < 0.18
+            assert stub.request_count - requests == 2
+            started = time.perf_counter()
+            assert len([row async for row in api.iter_rows(stub.table_name, row_factory=CompactRow)]) == 10
+            assert time.perf_counter() - started < 0.18
+
+
+async def test_metadata_cache_avoids_column_requests(stub):
+    async with SeaTableApiAsync(stub.api_token, stub.url, metadata_ttl=60) as api:
+        await api.list_rows(stub.table_name, row_factory=CompactRow)
+        requests = stub.request_count
+        await api.list_rows(stub.table_name, row_factory=CompactRow)
+        assert stub.request_count - requests == 1
+
+
+async def test_query_rows(stub, api):
+    rows = await api.query(f"SELECT * FROM {stub.table_name} LIMIT 30", row_factory=CompactRow)
+    assert len(rows) == 30
+    assert rows[0].名称 == stub._rows[rows[0]._id]["0000"]
+    with pytest.raises(ValueError):
+        await api.query(f"SELECT * FROM {stub.table_name}", convert=False, row_factory=CompactRow)
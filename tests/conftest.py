@@ -0,0 +1,17 @@
+"""离线测试的公共夹具，基于 benchmarks/stub_server.py 中的进程内替身服务器"""
+import pytest
+
+from seatable_api_async import SeaTableApiAsync
+from stub_server import StubSeaTable
+
+
+@pytest.fixture
+async def stub():
+    async with StubSeaTable(row_count=250, text_size=16) as server:
+        yield server
+
+
+@pytest.fixture
+async def api(stub):
+    async with SeaTableApiAsync(stub.api_token, stub.url) as client:
+        yield client
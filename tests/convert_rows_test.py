@@ -0,0 +1,113 @@
+"""dtable-db 行转换：编译后的转换计划与逐单元格判断的结果一致"""
+import random
+
+from seatable_api_async.constants import CONVERTER_CACHE_SIZE
+from seatable_api_async.utils import (
+    _build_select_map,
+    _convert_date_value,
+    _convert_link_formula_values,
+    _convert_link_values,
+    compile_row_converter,
+    convert_db_rows,
+    path_get,
+)
+
+OPTIONS = [{"id": "o1", "name": "红"}, {"id": "o2", "name": "绿"}]
+
+METADATA = [
+    {"key": "_id", "name": "_id", "type": "text"},
+    {"key": "0000", "name": "名称", "type": "text"},
+    {"key": "a001", "name": "数量", "type": "number"},
+    {"key": "a002", "name": "状态", "type": "single-select", "data": {"options": OPTIONS}},
+    {"key": "a003", "name": "标签", "type": "multiple-select", "data": {"options": OPTIONS}},
+    {"key": "a004", "name": "空选项", "type": "single-select", "data": {"options": []}},
+    {"key": "a005", "name": "日期", "type": "date", "data": {"format": "YYYY-MM-DD HH:mm"}},
+    {"key": "a006", "name": "生日", "type": "date", "data": {"format": "YYYY-MM-DD"}},
+    {"key": "a007", "name": "关联", "type": "link", "data": {"array_type": "single-select", "array_data": {"options": OPTIONS}}},
+    {"key": "a008", "name": "关联文本", "type": "link", "data": {"array_type": "text"}},
+    {"key": "a009", "name": "关联公式", "type": "link-formula", "data": {"array_type": "multiple-select", "array_data": {"options": OPTIONS}}},
+    {"key": "a010", "name": "无选项公式", "type": "link-formula", "data": {}},
+]
+
+
+def _reference_convert_row(result, metadata):
+    """编译转换计划之前逐单元格判断列类型的实现"""
+    column_map = {column["key"]: column for column in metadata}
+    select_map = _build_select_map(metadata)
+    item = {}
+    for column_key, value in result.items():
+        if column_key not in column_map:
+            item[column_key] = value
+            continue
+        column = column_map[column_key]
+        column_name = column["name"]
+        column_type = column.get("type")
+        s_map = select_map.get(column_key)
+        if column_type == "single-select" and value and s_map:
+            item[column_name] = s_map.get(value, value)
+        elif column_type == "multiple-select" and value and s_map:
+            item[column_name] = [s_map.get(v, v) for v in value]
+        elif column_type == "link" and value:
+            item[column_name] = _convert_link_values(value, s_map)
+        elif column_type == "link-formula" and value:
+            item[column_name] = _convert_link_formula_values(value, s_map)
+        elif column_type == "date":
+            item[column_name] = _convert_date_value(value, path_get(column, "data.format"))
+        else:
+            item[column_name] = value
+    return item
+
+
+def _random_value(rng, key):
+    choices = {
+        "_id": [f"row{rng.randrange(1000)}"],
+        "0000": ["", None, "text"],
+        "a001": [None, 0, 1.5],
+        "a002": [None, "", "o1", "o2", "unknown"],
+        "a003": [None, [], ["o1"], ["o2", "x"]],
+        "a004": [None, "o1"],
+        "a005": [None, "", "2025-06-01T08:30:00+08:00", "2025-06-01", "not a date"],
+        "a006": [None, "2025-06-01T08:30:00+08:00"],
+        "a007": [None, [], [{"row_id": "r", "display_value": "o1"}], [{"row_id": "r", "display_value": ["o1", "o2"]}]],
+        "a008": [None, [{"row_id": "r", "display_value": "x"}]],
+        "a009": [None, [], ["o1", "z"], [["o1"], ["o2"]]],
+        "a010": [None, ["o1"]],
+        "extra": [1, None],
+    }
+    return rng.choice(choices[key])
+
+
+def test_plan_matches_reference_conversion():
+    rng = random.Random(0)
+    keys = [column["key"] for column in METADATA] + ["extra"]
+    rows = []
+    for _ in range(500):
+        # 结果行只含部分列，且键顺序随机
+        row_keys = rng.sample(keys, rng.randint(1, len(keys)))
+        rows.append({key: _random_value(rng, key) for key in row_keys})
+    assert convert_db_rows(METADATA, rows) == [_reference_convert_row(row, METADATA) for row in rows]
+    assert [list(row) for row in convert_db_rows(METADATA, rows)] == [list(_reference_convert_row(row, METADATA)) for row in rows]
+
+
+def test_plan_only_converts_columns_that_need_it():
+    plan = compile_row_converter(METADATA)
+    assert plan["0000"] == ("名称", None)
+    assert plan["a004"] == ("空选项", None)
+    assert plan["a008"] == ("关联文本", None)
+    assert plan["a002"][1] is not None
+    assert plan["a005"][1] is not None
+
+
+def test_plans_are_cached_by_schema():
+    plan = compile_row_converter(METADATA)
+    assert compile_row_converter([dict(column) for column in METADATA]) is plan
+    renamed = [dict(column, name="改名") if column["key"] == "0000" else column for column in METADATA]
+    assert compile_row_converter(renamed) is not plan
+    assert compile_row_converter(renamed)["0000"] == ("改名", None)
+
+
+def test_plan_cache_is_bounded():
+    first = compile_row_converter([{"key": "k", "name": "first", "type": "text"}])
+    for i in range(CONVERTER_CACHE_SIZE):
+        compile_row_converter([{"key": "k", "name": f"n{i}", "type": "text"}])
+    assert compile_row_converter([{"key": "k", "name": "first", "type": "text"}]) is not first
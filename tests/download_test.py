@@ -0,0 +1,67 @@
+"""流式下载：.part 临时文件、进度回调与摘要"""
+import hashlib
+
+import pytest
+
+from seatable_api_async import SeaTableApiAsync, SeatableApiException
+from stub_server import StubSeaTable
+
+FILE_SIZE = 300 * 1024
+
+
+@pytest.fixture
+async def file_stub():
+    async with StubSeaTable(row_count=1, file_size=FILE_SIZE) as server:
+        yield server
+
+
+@pytest.fixture
+async def file_api(file_stub):
+    async with SeaTableApiAsync(file_stub.api_token, file_stub.url) as client:
+        yield client
+
+
+def _expected_content(stub):
+    # 替身服务器重复发送同一段随机字节
+    return (stub._file * (FILE_SIZE // len(stub._file) + 1))[:FILE_SIZE]
+
+
+async def test_download_with_progress_and_checksum(file_stub, file_api, tmp_path):
+    path = tmp_path / "bench.bin"
+    progress = []
+    digest = await file_api.download_file(file_stub.asset_url, str(path), progress=lambda done, total: progress.append((done, total)), checksum="sha256")
+    content = _expected_content(file_stub)
+    assert path.read_bytes() == content
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert progress[-1] == (FILE_SIZE, FILE_SIZE)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+    assert not (tmp_path / "bench.bin.part").exists()
+
+
+async def test_without_checksum_returns_none(file_stub, file_api, tmp_path):
+    assert await file_api.download_file(file_stub.asset_url, str(tmp_path / "bench.bin")) is None
+
+
+async def test_failed_download_keeps_existing_file(file_stub, file_api, tmp_path):
+    path = tmp_path / "bench.bin"
+    path.write_bytes(b"previous")
+
+    def interrupt(done, total):
+        if done > FILE_SIZE // 2:
+            raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        await file_api.download_file(file_stub.asset_url, str(path), progress=interrupt)
+    assert path.read_bytes() == b"previous"
+    assert not (tmp_path / "bench.bin.part").exists()
+
+
+async def test_unknown_algorithm_leaves_no_part_file(file_stub, file_api, tmp_path):
+    with pytest.raises(ValueError):
+        await file_api.download_file(file_stub.asset_url, str(tmp_path / "bench.bin"), checksum="no-such-hash")
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_url_of_another_base_is_rejected(file_api, tmp_path):
+    with pytest.raises(SeatableApiException, match="url invalid"):
+        await file_api.download_file("https://example.com/workspace/1/asset/other/files/a.txt", str(tmp_path / "a.txt"))
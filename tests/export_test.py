@@ -0,0 +1,141 @@
+"""表与查询结果的流式导出"""
+import csv
+import json
+
+import pytest
+
+from seatable_api_async.export import export_pages, guess_export_format
+
+_METADATA = [{"key": "a001", "name": "数量", "type": "number"}]
+
+
+async def _pages(*pages):
+    for results in pages:
+        yield {"metadata": _METADATA, "results": results}
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+async def test_export_table_csv(stub, api, tmp_path):
+    path = tmp_path / "table.csv"
+    count = await api.export_table(stub.table_name, str(path), chunk_size=100)
+    records = _read_csv(path)
+    assert count == 250
+    assert records[0] == ["_id", "_ctime", "_mtime", "名称", "数量", "状态", "标签", "日期", "完成", "备注"]
+    assert len(records) == 251
+    # 按 _id 排序，多选值序列化为 JSON
+    assert [record[0] for record in records[1:]] == sorted(stub._rows)
+    assert len(json.loads(records[1][6])) == 3
+    assert not (tmp_path / "table.csv.part").exists()
+
+
+async def test_export_table_pages_by_id(stub, api, tmp_path, monkeypatch):
+    sqls = []
+    query_raw = api._query_raw
+
+    async def recording_query_raw(sql):
+        sqls.append(sql)
+        return await query_raw(sql)
+
+    monkeypatch.setattr(api, "_query_raw", recording_query_raw)
+    assert await api.export_table(stub.table_name, str(tmp_path / "table.jsonl"), chunk_size=100) == 250
+    ids = sorted(stub._rows)
+    assert sqls == [
+        f"SELECT * FROM `{stub.table_name}` ORDER BY _id LIMIT 100",
+        f"SELECT * FROM `{stub.table_name}` WHERE _id > '{ids[99]}' ORDER BY _id LIMIT 100",
+        f"SELECT * FROM `{stub.table_name}` WHERE _id > '{ids[199]}' ORDER BY _id LIMIT 100",
+    ]
+
+
+async def test_export_query_jsonl(stub, api, tmp_path):
+    path = tmp_path / "rows.jsonl"
+    last_id = sorted(stub._rows)[119]
+    count = await api.export_query(f"SELECT * FROM {stub.table_name} WHERE _id <= '{last_id}'", str(path), chunk_size=50)
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert count == len(rows) == 120
+    assert rows[0]["名称"] == stub._rows[rows[0]["_id"]]["0000"]
+
+
+async def test_export_table_parquet(stub, api, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "table.parquet"
+    count = await api.export_table(stub.table_name, str(path), chunk_size=100, row_group_size=60)
+    table = pq.read_table(path)
+    assert count == table.num_rows == 250
+    # 每块 100、100、50 行，按 60 行拆分为 60+40、60+40、50
+    assert pq.ParquetFile(path).metadata.num_row_groups == 5
+    assert str(table.schema.field("数量").type) == "double"
+    assert str(table.schema.field("完成").type) == "bool"
+    assert str(table.schema.field("标签").type) == "list<element: string>"
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+async def test_aliased_columns_are_exported(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"agg.{fmt}"
+    # 如 SELECT 数量, COUNT(*) AS cnt ...：cnt 不在 metadata 中，结果中也没有内置列
+    count = await export_pages(_pages([], [{"a001": 3, "cnt": 7}, {"a001": 5, "cnt": 1}], [{"a001": 1, "cnt": 2}]), str(path))
+    assert count == 3
+    if fmt == "csv":
+        assert _read_csv(path) == [["数量", "cnt"], ["3", "7"], ["5", "1"], ["1", "2"]]
+    else:
+        import pyarrow.parquet as pq
+        assert pq.read_table(path).to_pylist() == [{"数量": 3.0, "cnt": 7.0}, {"数量": 5.0, "cnt": 1.0}, {"数量": 1.0, "cnt": 2.0}]
+
+
+async def test_empty_result_writes_header_only(tmp_path):
+    path = tmp_path / "empty.csv"
+    assert await export_pages(_pages([]), str(path)) == 0
+    assert _read_csv(path) == [["数量"]]
+
+
+async def test_failed_export_removes_part_file(tmp_path):
+    path = tmp_path / "broken.csv"
+
+    async def broken_pages():
+        yield {"metadata": _METADATA, "results": [{"a001": 1}]}
+        raise RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        await export_pages(broken_pages(), str(path))
+    assert not path.exists()
+    assert not (tmp_path / "broken.csv.part").exists()
+
+
+def test_guess_export_format():
+    assert guess_export_format("a.CSV") == "csv"
+    assert guess_export_format("a.ndjson") == "jsonl"
+    assert guess_export_format("a.parquet") == "parquet"
+    with pytest.raises(ValueError):
+        guess_export_format("a.txt")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+async def test_keys_after_the_first_page_are_rejected(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"late.{fmt}"
+    with pytest.raises(ValueError, match="'late'"):
+        await export_pages(_pages([{"a001": 1}], [{"a001": 2, "late": "x"}]), str(path))
+    assert not path.exists()
+
+
+async def test_jsonl_keeps_keys_after_the_first_page(tmp_path):
+    path = tmp_path / "late.jsonl"
+    await export_pages(_pages([{"a001": 1}], [{"a001": 2, "late": "x"}]), str(path))
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == [{"数量": 1}, {"数量": 2, "late": "x"}]
+
+
+async def test_parquet_number_coercion(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "numbers.parquet"
+    await export_pages(_pages([{"a001": 1}, {"a001": "2.5"}, {"a001": ""}, {}]), str(path))
+    assert pq.read_table(path).column("数量").to_pylist() == [1.0, 2.5, None, None]
+    with pytest.raises(ValueError, match="'abc'"):
+        await export_pages(_pages([{"a001": 1}], [{"a001": "abc"}]), str(path))
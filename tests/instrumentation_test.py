@@ -0,0 +1,96 @@
+"""请求埋点钩子与 MetricsCollector"""
+import pytest
+
+from seatable_api_async import MetricsCollector, RequestHooks, SeaTableApiAsync, SeatableApiException
+from seatable_api_async.instrumentation import RequestContext, endpoint_template
+from stub_server import StubSeaTable
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://x/dtable-server/api/v1/dtables/1234/rows/", "rows"),
+    ("https://x/api-gateway/api/v2/dtables/1234/batch-append-rows/", "batch-append-rows"),
+    ("https://x/api/v2.1/dtable/app-access-token/", "app-access-token"),
+    ("https://x/api/v2.1/dtable/custom/app-upload-link/", "custom/app-upload-link"),
+    ("https://x/dtable-db/api/v1/query/12345678-1234-1234-1234-123456789abc/", "query"),
+    ("https://x/upload-api/token", "upload"),
+    ("https://x/workspace/1/asset/uuid/files/a.bin", "download"),
+    ("https://x/unknown", "other"),
+])
+def test_endpoint_template(url, expected):
+    assert endpoint_template(url) == expected
+
+
+class _Recorder(RequestHooks):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, ctx):
+        self.events.append("start")
+
+    def on_body_received(self, ctx):
+        self.events.append(("body", ctx.response_bytes))
+
+    def on_decoded(self, ctx):
+        self.events.append("decoded")
+
+    def on_error(self, ctx, error):
+        self.events.append("error")
+
+
+async def test_hooks_see_each_stage(stub):
+    recorder = _Recorder()
+    async with SeaTableApiAsync(stub.api_token, stub.url, hooks=[recorder]) as api:
+        recorder.events.clear()
+        await api.list_rows(stub.table_name, limit=1)
+        assert recorder.events[0] == "start"
+        assert recorder.events[1][0] == "body" and recorder.events[1][1] > 0
+        assert recorder.events[2] == "decoded"
+
+
+async def test_streamed_download_reports_bytes(tmp_path):
+    metrics = MetricsCollector()
+    async with StubSeaTable(row_count=1, file_size=100_000) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, hooks=[metrics]) as api:
+            await api.download_file(stub.asset_url, str(tmp_path / "bench.bin"))
+    assert metrics.summary()[("download", "GET")]["bytes"] == 100_000
+
+
+async def test_failing_hook_does_not_break_requests(stub):
+    class Broken(RequestHooks):
+        def on_decoded(self, ctx):
+            raise RuntimeError("boom")
+
+    async with SeaTableApiAsync(stub.api_token, stub.url, hooks=[Broken()]) as api:
+        assert len(await api.list_rows(stub.table_name, limit=5)) == 5
+
+
+async def test_errors_are_counted(stub):
+    metrics = MetricsCollector()
+    async with SeaTableApiAsync(stub.api_token, stub.url, hooks=[metrics]) as api:
+        with pytest.raises(SeatableApiException):
+            await api.rename_table(stub.table_name, "x")
+    assert 'error="SeatableApiException"' in metrics.to_prometheus()
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = MetricsCollector(buckets=(0.1,))
+    ctx = RequestContext("GET", "https://x/unknown")
+    ctx.endpoint = 'a\\b"c\nd'
+    ctx.status = 200
+    metrics.on_error(ctx, ValueError())
+    text = metrics.to_prometheus()
+    assert 'endpoint="a\\\\b\\"c\\nd"' in text
+    # 每个样本占一行
+    assert all(line.startswith(("#", "seatable_")) for line in text.splitlines())
+
+
+def test_quantile_uses_bucket_upper_bound():
+    metrics = MetricsCollector(buckets=(0.1, 1.0))
+    for elapsed in (0.05, 0.05, 0.5, 5.0):
+        ctx = RequestContext("GET", "https://x/unknown")
+        ctx.started -= elapsed
+        metrics.on_decoded(ctx)
+    assert metrics.quantile("other", "GET", 0.5) == 0.1
+    assert metrics.quantile("other", "GET", 0.75) == 1.0
+    assert metrics.quantile("other", "GET", 1.0) == float("inf")
+    assert metrics.quantile("rows", "GET", 0.5) is None
@@ -0,0 +1,46 @@
+"""iter_query 分块执行 SQL 与 LIMIT 子句拆分"""
+import pytest
+
+from seatable_api_async.utils import split_sql_limit
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT * FROM t", ("SELECT * FROM t", None, 0)),
+    ("select * from t limit 10;", ("select * from t", 10, 0)),
+    ("SELECT * FROM t LIMIT 10 OFFSET 5", ("SELECT * FROM t", 10, 5)),
+    # MySQL 写法 LIMIT offset, count
+    ("SELECT * FROM t LIMIT 5, 10", ("SELECT * FROM t", 10, 5)),
+    ("SELECT * FROM t WHERE a = 'limit 3'", ("SELECT * FROM t WHERE a = 'limit 3'", None, 0)),
+])
+def test_split_sql_limit(sql, expected):
+    assert split_sql_limit(sql) == expected
+
+
+async def _collect(api, sql, **kwargs):
+    chunks = [chunk async for chunk in api.iter_query(sql, **kwargs)]
+    return chunks, [row["_id"] for chunk in chunks for row in chunk]
+
+
+async def test_chunks_cover_all_rows(stub, api):
+    chunks, ids = await _collect(api, f"SELECT * FROM {stub.table_name} ORDER BY _id", chunk_size=60)
+    assert [len(chunk) for chunk in chunks] == [60, 60, 60, 60, 10]
+    assert ids == sorted(stub._rows)
+    assert chunks[0][0]["名称"] == stub._rows[ids[0]]["0000"]
+
+
+async def test_limit_and_offset_are_respected(stub, api):
+    chunks, ids = await _collect(api, f"SELECT * FROM {stub.table_name} ORDER BY _id LIMIT 70 OFFSET 15", chunk_size=30)
+    assert [len(chunk) for chunk in chunks] == [30, 30, 10]
+    assert ids == sorted(stub._rows)[15:85]
+
+
+async def test_unconverted_rows_keep_column_keys(stub, api):
+    chunks, _ = await _collect(api, f"SELECT * FROM {stub.table_name} LIMIT 5", convert=False)
+    assert "0000" in chunks[0][0]
+
+
+async def test_invalid_arguments(stub, api):
+    with pytest.raises(ValueError):
+        await _collect(api, "")
+    with pytest.raises(ValueError):
+        await _collect(api, f"SELECT * FROM {stub.table_name}", chunk_size=10001)
@@ -0,0 +1,41 @@
+"""iter_rows 自动分页与预取"""
+import pytest
+
+
+@pytest.mark.parametrize("concurrency", [1, 3, 10])
+async def test_yields_every_row_in_order(stub, api, concurrency):
+    rows = [row async for row in api.iter_rows(stub.table_name, page_size=40, concurrency=concurrency)]
+    assert [row["_id"] for row in rows] == list(stub._rows)
+
+
+async def test_row_count_avoids_requests_past_the_end(stub, api):
+    requests = stub.request_count
+    rows = [row async for row in api.iter_rows(stub.table_name, page_size=50, concurrency=4, row_count=250)]
+    assert len(rows) == 250
+    assert stub.request_count - requests == 5
+
+
+async def test_short_page_stops_paging(stub, api):
+    requests = stub.request_count
+    rows = [row async for row in api.iter_rows(stub.table_name, page_size=100)]
+    assert len(rows) == 250
+    # 100 + 100 + 50，第三页是短页，不再请求第四页
+    assert stub.request_count - requests == 3
+
+
+async def test_breaking_early_cancels_prefetch(stub, api):
+    seen = []
+    async for row in api.iter_rows(stub.table_name, page_size=10, concurrency=5):
+        seen.append(row["_id"])
+        if len(seen) == 15:
+            break
+    assert seen == list(stub._rows)[:15]
+    # 取消的预取不影响后续请求
+    assert len(await api.list_rows(stub.table_name, limit=5)) == 5
+
+
+@pytest.mark.parametrize("kwargs", [{"page_size": 0}, {"page_size": 1001}, {"concurrency": 0}])
+async def test_invalid_arguments(stub, api, kwargs):
+    with pytest.raises(ValueError):
+        async for _ in api.iter_rows(stub.table_name, **kwargs):
+            pass
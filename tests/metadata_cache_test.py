@@ -0,0 +1,71 @@
+"""元数据缓存的 TTL、失效与并发加载"""
+import asyncio
+
+import pytest
+
+from seatable_api_async import SeaTableApiAsync, SeatableApiException
+from seatable_api_async.metadata_cache import MetadataCache
+
+
+@pytest.fixture
+async def cached_api(stub):
+    async with SeaTableApiAsync(stub.api_token, stub.url, metadata_ttl=60) as client:
+        yield client
+
+
+async def test_repeated_lookups_share_one_download(stub, cached_api):
+    requests = stub.request_count
+    await asyncio.gather(*(cached_api.get_table_by_name(stub.table_name) for _ in range(10)))
+    assert (await cached_api.get_column_by_name(stub.table_name, "数量"))["key"] == "a001"
+    assert len(await cached_api.list_tables()) == 1
+    assert stub.request_count - requests == 1
+
+
+async def test_invalidate_triggers_reload(stub, cached_api):
+    await cached_api.list_tables()
+    requests = stub.request_count
+    cached_api.invalidate_metadata()
+    await cached_api.list_tables()
+    await cached_api.list_tables()
+    assert stub.request_count - requests == 1
+
+
+async def test_schema_changes_invalidate_even_on_failure(stub, cached_api):
+    await cached_api.list_tables()
+    # 替身服务器没有改表接口，请求失败后缓存仍应失效
+    with pytest.raises(SeatableApiException):
+        await cached_api.rename_table(stub.table_name, "Renamed")
+    assert not cached_api.metadata_cache.is_valid
+
+
+async def test_ttl_expiry():
+    cache = MetadataCache(ttl=0.05)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"tables": []}
+
+    await cache.load(loader)
+    await cache.load(loader)
+    await asyncio.sleep(0.06)
+    await cache.load(loader)
+    assert len(calls) == 2
+
+
+async def test_invalidation_during_download_discards_result():
+    cache = MetadataCache(ttl=60)
+    versions = iter([{"tables": [{"_id": "0000", "name": "old", "columns": []}]}, {"tables": [{"_id": "0000", "name": "new", "columns": []}]}])
+
+    async def loader():
+        metadata = next(versions)
+        if metadata["tables"][0]["name"] == "old":
+            # 下载期间表结构被修改
+            cache.invalidate()
+        await asyncio.sleep(0)
+        return metadata
+
+    await cache.load(loader)
+    assert cache.is_valid
+    assert cache.get_table("new") is not None
+    assert cache.get_table("old") is None
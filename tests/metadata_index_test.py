@@ -0,0 +1,79 @@
+"""MetadataIndex 与 WebSocket 行转换"""
+import json
+
+from seatable_api_async import SeaTableApiAsync
+from seatable_api_async.utils import MetadataIndex, convert_row
+
+OPTIONS = [{"id": "o1", "name": "红"}, {"id": "o2", "name": "绿"}]
+
+METADATA = {
+    "tables": [
+        {
+            "_id": "0000",
+            "name": "Table1",
+            "columns": [
+                {"key": "c000", "name": "名称", "type": "text"},
+                {"key": "c001", "name": "状态", "type": "single-select", "data": {"options": OPTIONS}},
+                {"key": "c002", "name": "标签", "type": "multiple-select", "data": {"options": OPTIONS}},
+                {"key": "c003", "name": "备注", "type": "long-text"},
+                {"key": "c004", "name": "无选项", "type": "single-select", "data": {}},
+            ],
+        },
+        {"_id": "a1B2", "name": "Other", "columns": []},
+    ]
+}
+
+
+def _event(op_type, row, table_id="0000"):
+    key = {"insert_row": "row_data", "modify_row": "updated", "delete_row": "deleted_row"}[op_type]
+    return json.dumps({"op_type": op_type, "table_id": table_id, "row_id": "r1", key: row})
+
+
+def test_lookups():
+    index = MetadataIndex(METADATA)
+    assert index.get_table("Table1")["_id"] == "0000"
+    # 形如表 ID 的名称也按 ID 查找
+    assert index.get_table("a1B2")["name"] == "Other"
+    assert index.get_table("missing") is None
+    assert index.get_column_by_name("Table1", "状态")["key"] == "c001"
+    assert index.get_column_by_key("Table1", "c002")["name"] == "标签"
+    assert index.get_column_by_name("missing", "状态") is None
+    assert index.option_names("0000", "c001") == {"o1": "红", "o2": "绿"}
+    assert index.option_names("0000", "c004") is None
+    assert [t["name"] for t in index.tables] == ["Table1", "Other"]
+
+
+def test_index_and_dict_give_same_result():
+    index = MetadataIndex(METADATA)
+    row = {"c000": "a", "c001": "o2", "c002": ["o1", "o2"], "c003": {"text": "长文本"}, "c004": "x", "unknown": 1}
+    for op_type in ("insert_row", "modify_row", "delete_row"):
+        event = _event(op_type, row)
+        assert convert_row(index, event) == convert_row(METADATA, event)
+    assert convert_row(index, _event("insert_row", row)) == {
+        "_id": "r1",
+        "op_type": "insert_row",
+        "table_name": "Table1",
+        "名称": "a",
+        "状态": "绿",
+        "标签": ["红", "绿"],
+        "备注": "长文本",
+        "无选项": "x",
+    }
+
+
+def test_empty_values_and_other_operations():
+    index = MetadataIndex(METADATA)
+    converted = convert_row(index, _event("modify_row", {"c001": None, "c002": [], "c003": None}))
+    assert (converted["状态"], converted["标签"], converted["备注"]) == (None, [], "")
+    # 未知表与非行操作原样返回
+    assert convert_row(index, _event("insert_row", {"c000": "a"}, table_id="zzzz"))["row_data"] == {"c000": "a"}
+    assert convert_row(index, json.dumps({"op_type": "insert_column"})) == {"op_type": "insert_column"}
+
+
+async def test_get_metadata_index_reuses_the_cache(stub):
+    async with SeaTableApiAsync(stub.api_token, stub.url, metadata_ttl=60) as api:
+        index = await api.get_metadata_index()
+        assert await api.get_metadata_index() is index
+        assert index.get_column_by_name(stub.table_name, "数量")["key"] == "a001"
+        api.invalidate_metadata()
+        assert await api.get_metadata_index() is not index
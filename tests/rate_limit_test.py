@@ -0,0 +1,73 @@
+"""429 限流重试与令牌桶限流器"""
+import asyncio
+import time
+
+import pytest
+
+from seatable_api_async import RateLimiter, SeaTableApiAsync, SeatableApiException
+from seatable_api_async.rate_limit import parse_retry_after
+from stub_server import StubSeaTable
+
+
+async def test_throttled_requests_are_retried():
+    async with StubSeaTable(row_count=20, throttle_every=3) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, rate_limit_retries=3) as api:
+            results = await asyncio.gather(*(api.list_rows(stub.table_name) for _ in range(10)))
+        assert all(len(rows) == 20 for rows in results)
+        assert stub.throttled_count > 0
+
+
+async def test_retry_after_is_honored():
+    async with StubSeaTable(row_count=5, throttle_every=2, retry_after=0.3) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url) as api:
+            # 认证是第 1 个请求，list_rows 的第一次尝试被限流
+            started = time.monotonic()
+            rows = await api.list_rows(stub.table_name)
+            elapsed = time.monotonic() - started
+        assert len(rows) == 5
+        assert stub.throttled_count == 1
+        assert elapsed >= 0.3
+
+
+async def test_throttling_raises_after_retries_exhausted():
+    async with StubSeaTable(row_count=5, throttle_every=2) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, rate_limit_retries=0) as api:
+            with pytest.raises(SeatableApiException, match="429"):
+                await api.list_rows(stub.table_name)
+
+
+async def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20, burst=1)
+    started = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire()
+    # 桶中初始有 1 个令牌，之后每 0.05 秒补充 1 个
+    assert time.monotonic() - started >= 0.18
+
+
+async def test_rate_limiter_shared_by_clients():
+    limiter = RateLimiter(rate=50, burst=5)
+    async with StubSeaTable(row_count=5) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, rate_limiter=limiter) as first, \
+                SeaTableApiAsync(stub.api_token, stub.url, rate_limiter=limiter) as second:
+            started = time.monotonic()
+            await asyncio.gather(*(client.list_rows(stub.table_name) for client in (first, second) for _ in range(5)))
+            elapsed = time.monotonic() - started
+    # 2 次认证加 10 次查询共 12 个令牌，超出桶容量的 7 个按 50/s 补充
+    assert elapsed >= 0.12
+
+
+async def test_pause_blocks_all_holders():
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.pause(0.2)
+    started = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - started >= 0.2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,118 @@
+"""BaseReplica：全量加载、事件增量应用、加载期间事件的重放与缺失事件后的重新加载"""
+import asyncio
+import json
+
+import pytest
+
+from seatable_api_async import BaseReplica
+from stub_server import TABLE_ID
+
+
+def _modify(row_id, updated):
+    return json.dumps({"op_type": "modify_row", "table_id": TABLE_ID, "row_id": row_id, "updated": updated})
+
+
+@pytest.fixture
+async def replica(stub, api):
+    replica = BaseReplica(api, resync_delay=0.01)
+
+    async def connect():
+        # 不建立真实的 WebSocket 连接
+        pass
+
+    replica._connect_with_token_refresh = connect
+    async with replica:
+        yield replica
+
+
+async def test_initial_load(stub, replica):
+    assert replica.ready
+    assert replica.count(stub.table_name) == 250
+    row_id = next(iter(stub._rows))
+    assert replica.get_row(stub.table_name, row_id)["_id"] == row_id
+    with pytest.raises(ValueError):
+        replica.rows("missing")
+
+
+async def test_row_events_are_applied_without_requests(stub, replica):
+    first, second = list(stub._rows)[:2]
+    requests = stub.request_count
+    await replica.on_update_dtable(_modify(first, {"a001": -1, "a002": "000001"}), 1)
+    await replica.on_update_dtable(json.dumps({
+        "op_type": "insert_row", "table_id": TABLE_ID, "row_id": "new1",
+        "row_data": {"_id": "new1", "0000": "hello", "a003": ["t00001", "t00002"]},
+    }), 2)
+    await replica.on_update_dtable(json.dumps({"op_type": "delete_rows", "table_id": TABLE_ID, "row_ids": [second], "deleted_rows": []}), 3)
+    await replica.on_update_dtable(json.dumps({
+        "op_type": "modify_rows", "table_id": TABLE_ID, "row_ids": ["new1"], "updated": {"new1": {"0000": "hi"}},
+    }), 4)
+    # 只影响视图的操作被忽略
+    await replica.on_update_dtable(json.dumps({"op_type": "modify_view_type", "table_id": TABLE_ID}), 5)
+    await asyncio.sleep(0.05)
+
+    row = replica.get_row(stub.table_name, first)
+    assert (row["数量"], row["状态"]) == (-1, "已完成")
+    assert replica.get_row(stub.table_name, "new1") == {"_id": "new1", "名称": "hi", "标签": ["标签1", "标签2"]}
+    assert replica.get_row(stub.table_name, second) is None
+    assert replica.count(stub.table_name) == 250
+    assert replica.filter(stub.table_name, "数量 < 0") == [row]
+    assert stub.request_count == requests
+    assert replica.resync_count == 0
+
+
+async def test_duplicate_events_are_ignored(stub, replica):
+    row_id = next(iter(stub._rows))
+    await replica.on_update_dtable(_modify(row_id, {"a001": 1}), 1)
+    await replica.on_update_dtable(_modify(row_id, {"a001": 2}), 1)
+    assert replica.get_row(stub.table_name, row_id)["数量"] == 1
+
+
+async def test_events_during_load_are_replayed(stub, api):
+    row_id = next(iter(stub._rows))
+    replica = BaseReplica(api)
+
+    async def connect():
+        # 加入房间后、全量加载前收到的事件
+        await replica.on_update_dtable(_modify(row_id, {"a001": -5}), 1)
+
+    replica._connect_with_token_refresh = connect
+    async with replica:
+        assert replica.get_row(stub.table_name, row_id)["数量"] == -5
+        assert replica.version == 1
+
+
+@pytest.mark.parametrize("event, index", [
+    # 事件序号不连续
+    (None, 3),
+    # 无法增量应用的操作
+    (json.dumps({"op_type": "insert_column", "table_id": TABLE_ID}), 2),
+    # 修改副本中没有的行
+    (_modify("unknown", {"a001": 1}), 2),
+])
+async def test_resync(stub, replica, event, index):
+    row_id = next(iter(stub._rows))
+    await replica.on_update_dtable(_modify(row_id, {"a001": -1}), 1)
+    # 服务器上的行被修改，副本只有在重新加载后才能看到
+    stub._rows[row_id]["a001"] = 99
+    await replica.on_update_dtable(event or _modify(row_id, {"a001": -1}), index)
+    await asyncio.sleep(0.05)
+    await replica.wait_ready()
+    assert replica.resync_count == 1
+    assert replica.get_row(stub.table_name, row_id)["数量"] == 99
+
+
+async def test_reconnect_triggers_resync(stub, replica):
+    joined = []
+
+    async def emit(event, data):
+        joined.append(event)
+
+    replica._sio.emit = emit
+    # 首次连接只加入房间，之后的重连说明可能漏掉了事件
+    await replica._on_connect()
+    assert replica.resync_count == 0
+    await replica._on_connect()
+    await asyncio.sleep(0.05)
+    await replica.wait_ready()
+    assert replica.resync_count == 1
+    assert len(joined) == 2
@@ -0,0 +1,89 @@
+"""瞬时故障重试策略：幂等判断、重试预算与只重试 SELECT"""
+import pytest
+
+from seatable_api_async import RetryPolicy, SeaTableApiAsync, SeatableApiException
+from seatable_api_async.utils import is_select_sql
+from stub_server import StubSeaTable
+
+
+def test_idempotent_methods():
+    policy = RetryPolicy()
+    assert policy.should_retry("GET", 0)
+    assert policy.should_retry("delete", 0)
+    assert not policy.should_retry("POST", 0)
+    assert policy.should_retry("POST", 0, idempotent=True)
+    assert not policy.should_retry("GET", 0, idempotent=False)
+    assert RetryPolicy(retry_non_idempotent=True).should_retry("POST", 0)
+
+
+def test_max_retries():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry("GET", 1)
+    assert not policy.should_retry("GET", 2)
+
+
+def test_budget_limits_retries():
+    policy = RetryPolicy(max_retries=10, budget_min=3, budget_ratio=0.5)
+    assert [policy.should_retry("GET", 0) for _ in range(4)] == [True, True, True, False]
+    # 每个请求存入 0.5 个额度，两个请求后可再重试一次
+    policy.record_request()
+    assert not policy.should_retry("GET", 0)
+    policy.record_request()
+    assert policy.should_retry("GET", 0)
+
+
+def test_budget_is_capped():
+    policy = RetryPolicy(budget_min=1, budget_ratio=1)
+    for _ in range(100):
+        policy.record_request()
+    assert sum(policy.should_retry("GET", 0) for _ in range(100)) == 10
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT * FROM t", True),
+    ("  select _id from t", True),
+    ("(SELECT a FROM t) UNION (SELECT a FROM u)", True),
+    ("UPDATE t SET a = 1", False),
+    ("DELETE FROM t WHERE a = 'select'", False),
+    ("INSERT INTO t (a) VALUES ('x')", False),
+    ("selection", False),
+])
+def test_is_select_sql(sql, expected):
+    assert is_select_sql(sql) is expected
+
+
+def _policy():
+    return RetryPolicy(max_retries=3, backoff_base=0.001, backoff_max=0.001)
+
+
+async def test_get_is_retried_after_503():
+    async with StubSeaTable(row_count=10, fail_every=2) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, retry_policy=_policy()) as api:
+            # 认证是第 1 个请求，list_rows 的第一次尝试返回 503
+            assert len(await api.list_rows(stub.table_name)) == 10
+        assert stub.failed_count == 1
+
+
+async def test_without_policy_503_is_raised():
+    async with StubSeaTable(row_count=10, fail_every=2) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url) as api:
+            with pytest.raises(SeatableApiException, match="503"):
+                await api.list_rows(stub.table_name)
+
+
+async def test_only_select_queries_are_retried():
+    async with StubSeaTable(row_count=10, fail_every=2) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, retry_policy=_policy()) as api:
+            assert len(await api.query(f"SELECT * FROM {stub.table_name}")) == 10
+            # 请求 3 成功，请求 4 返回 503：写语句不重放
+            with pytest.raises(SeatableApiException, match="503"):
+                await api.query(f"UPDATE {stub.table_name} SET 数量 = 1")
+        assert stub.request_count == 4
+
+
+async def test_post_writes_are_not_retried():
+    async with StubSeaTable(row_count=10, fail_every=2) as stub:
+        async with SeaTableApiAsync(stub.api_token, stub.url, retry_policy=_policy()) as api:
+            with pytest.raises(SeatableApiException, match="503"):
+                await api.batch_append_rows(stub.table_name, [{"名称": "x"}])
+        assert len(stub._rows) == 10
@@ -0,0 +1,83 @@
+"""RowWriteBuffer 合并单行写操作"""
+import asyncio
+
+import pytest
+
+from seatable_api_async import RowWriteBuffer, SeatableApiException
+
+
+async def test_concurrent_appends_share_one_request(stub, api):
+    requests = stub.request_count
+    async with RowWriteBuffer(api, max_delay=0.01) as buffer:
+        await asyncio.gather(*(buffer.append_row(stub.table_name, {"名称": f"n{i}"}) for i in range(50)))
+    assert stub.request_count - requests == 1
+    assert len(stub._rows) == 300
+
+
+async def test_max_batch_size_splits_batches(stub, api):
+    requests = stub.request_count
+    async with RowWriteBuffer(api, max_batch_size=20, max_delay=0.05) as buffer:
+        await asyncio.gather(*(buffer.append_row(stub.table_name, {"名称": f"n{i}"}) for i in range(50)))
+    # 两个满批立即发送，剩余 10 行等待 max_delay 后发送
+    assert stub.request_count - requests == 3
+
+
+async def test_apply_default_is_passed_and_splits_batches(stub, api):
+    calls = []
+    batch_append_rows = api.batch_append_rows
+
+    async def record(table_name, rows, apply_default=None, **kwargs):
+        calls.append((len(rows), apply_default))
+        return await batch_append_rows(table_name, rows, apply_default=apply_default, **kwargs)
+
+    api.batch_append_rows = record
+    async with RowWriteBuffer(api, max_delay=0.01) as buffer:
+        await asyncio.gather(
+            buffer.append_row(stub.table_name, {"名称": "a"}, apply_default=True),
+            buffer.append_row(stub.table_name, {"名称": "b"}, apply_default=True),
+            buffer.append_row(stub.table_name, {"名称": "c"}),
+        )
+    assert calls == [(2, True), (1, None)]
+
+
+async def test_update_and_delete_resolve_per_row(stub, api):
+    row_ids = list(stub._rows)[:3]
+    async with RowWriteBuffer(api, max_delay=0.01) as buffer:
+        updated = await asyncio.gather(*(buffer.update_row(stub.table_name, row_id, {"数量": -1}) for row_id in row_ids))
+        deleted = await asyncio.gather(*(buffer.delete_row(stub.table_name, row_id) for row_id in row_ids))
+        missing = await buffer.delete_row(stub.table_name, "missing")
+    assert updated == [{"row_id": row_id, "success": True} for row_id in row_ids]
+    assert deleted == [{"row_id": row_id, "deleted": True} for row_id in row_ids]
+    assert missing == {"row_id": "missing", "deleted": False}
+    assert not set(row_ids) & set(stub._rows)
+
+
+async def test_operations_on_a_table_keep_their_order(stub, api):
+    row_id = list(stub._rows)[0]
+    async with RowWriteBuffer(api, max_delay=0.01) as buffer:
+        results = await asyncio.gather(
+            buffer.update_row(stub.table_name, row_id, {"名称": "first"}),
+            buffer.delete_row(stub.table_name, row_id),
+            buffer.update_row(stub.table_name, row_id, {"名称": "after delete"}),
+        )
+    assert results[1]["deleted"] is True
+    assert row_id not in stub._rows
+
+
+async def test_failed_batch_fails_every_caller(stub, api):
+    async def fail(*args, **kwargs):
+        raise SeatableApiException("rejected")
+
+    api.batch_update_rows = fail
+    async with RowWriteBuffer(api, max_delay=0.01) as buffer:
+        results = await asyncio.gather(
+            buffer.update_row(stub.table_name, "a", {}), buffer.update_row(stub.table_name, "b", {}), return_exceptions=True
+        )
+    assert all(isinstance(result, SeatableApiException) for result in results)
+
+
+async def test_closed_buffer_rejects_writes(stub, api):
+    buffer = RowWriteBuffer(api)
+    await buffer.close()
+    with pytest.raises(SeatableApiException):
+        await buffer.append_row(stub.table_name, {"名称": "x"})
@@ -0,0 +1,98 @@
+"""本地行过滤的列类型语义，与 column.py 的 ColumnValue 比较一致"""
+import pytest
+
+from seatable_api_async import compile_filter
+from stub_server import StubSeaTable
+
+COLUMNS = StubSeaTable.columns
+
+ROWS = [
+    {"_id": "r1", "名称": "abcdef", "数量": 5, "状态": "进行中", "标签": ["标签1", "标签2"], "日期": "2025-05-12 13:30", "完成": True, "备注": ""},
+    {"_id": "r2", "名称": "xyz", "数量": 50.5, "状态": "已完成", "标签": [], "日期": "2025-08-01 10:00", "完成": False},
+    {"_id": "r3", "名称": "abxyz", "数量": 0, "状态": None, "日期": None},
+    # list_rows 返回的 ISO 格式，按其中的日期时间比较
+    {"_id": "r4", "名称": "iso", "数量": 1, "日期": "2025-09-23T19:30:00+08:00"},
+    {"_id": "r5", "名称": "iso", "数量": 1, "日期": "2025-05-12T13:30:00.000Z"},
+]
+
+
+def _matched(expression):
+    return [row["_id"] for row in compile_filter(expression, COLUMNS).filter(ROWS)]
+
+
+@pytest.mark.parametrize("expression, expected", [
+    # 数字：空值不参与比较，0 不是空值
+    ("数量 > 10", ["r2"]),
+    ("数量 <= 5", ["r1", "r3", "r4", "r5"]),
+    ("数量 = 0", ["r3"]),
+    ("数量 = 50.5", ["r2"]),
+    # 文本与单选
+    ("名称 = xyz", ["r2"]),
+    ("状态 != 进行中", ["r2", "r3", "r4", "r5"]),
+    ("状态 = ''", ["r3", "r4", "r5"]),
+    ("备注 = ''", ["r1", "r2", "r3", "r4", "r5"]),
+    ("名称 like 'ab%'", ["r1", "r3"]),
+    ("名称 like '%xyz'", ["r2", "r3"]),
+    ("名称 like '%bc%'", ["r1"]),
+    ("名称 like 'a%z'", ["r3"]),
+    # 复选框：缺失视为 false
+    ("完成 = true", ["r1"]),
+    ("完成 = false", ["r2", "r3", "r4", "r5"]),
+    # 多选：= 表示包含某个选项
+    ("标签 = 标签1", ["r1"]),
+    ("标签 != 标签1", ["r2", "r3", "r4", "r5"]),
+    ("标签 = ''", ["r2", "r3", "r4", "r5"]),
+    # 日期：两种单元格格式均可比较
+    ("日期 > 2025-06-01", ["r2", "r4"]),
+    ("日期 < '2025-05-12 14:00'", ["r1", "r5"]),
+    ("日期 = '2025-09-23 19:30'", ["r4"]),
+    ("日期 >= '2025-09-23 19:30:01'", []),
+    ("日期 = ''", ["r3"]),
+    # and 优先于 or，括号改变结合
+    ("名称 like 'ab%' and 数量 > 1 or 状态 = 已完成", ["r1", "r2"]),
+    ("名称 like 'ab%' and (数量 > 1 or 状态 = 已完成)", ["r1"]),
+    ("_id = r2 OR _id = r3", ["r2", "r3"]),
+    ("名称 = iso and 日期 < 2025-06-01", ["r5"]),
+])
+def test_column_semantics(expression, expected):
+    assert _matched(expression) == expected
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("缺失 = 1", "not found"),
+    ("数量 like 1", "does not support the query method 'like'"),
+    ("完成 like true", "does not support the query method 'like'"),
+    ("名称 > abc", "does not support the query method '>'"),
+    ("数量 > ''", "null query string"),
+    ("名称 like abc", "no patterns"),
+    ("完成 = maybe", 'query string as "maybe"'),
+    ("数量 = 1 and", "end of filter expression"),
+    ("(数量 = 1", "end of filter expression"),
+    ("", "cannot be empty"),
+])
+def test_invalid_expressions(expression, message):
+    with pytest.raises(ValueError, match=message):
+        compile_filter(expression, COLUMNS)
+
+
+def test_malformed_date_cell_raises():
+    with pytest.raises(ValueError, match="2025-13"):
+        compile_filter("日期 > 2025-06-01", COLUMNS).filter([{"日期": "2025-13-01T00:00:00+08:00"}])
+
+
+async def test_api_filter_matches_local_filter(stub, api):
+    expression = "数量 >= 5000 and (状态 = 进行中 or 标签 = 标签3)"
+    rows = await api.list_rows(stub.table_name)
+    expected = compile_filter(expression, COLUMNS).filter(rows)
+    assert expected
+    assert await api.filter(stub.table_name, expression) == expected
+
+
+async def test_api_filter_on_dates(stub, api):
+    rows = await api.list_rows(stub.table_name)
+    # 替身服务器的日期单元格为 ISO 格式，如 2025-05-12T13:30:00+08:00
+    assert "T" in rows[0]["日期"]
+    matched = await api.filter(stub.table_name, "日期 >= 2025-06-01 and 日期 < '2025-07-01 00:00'")
+    expected = [row for row in rows if row["日期"] and "2025-06-01" <= row["日期"][:10] < "2025-07-01"]
+    assert expected
+    assert matched == expected
@@ -60,6 +60,8 @@ async def main():
         """
         # list_rows = await api.list_rows(table_name=table_name, order_by="年龄", desc=True)
         # print(list_rows)
+        # async for row in api.iter_rows(table_name=table_name, page_size=100, concurrency=2):
+        #     print(row)
         # one_row = await api.get_row(table_name=table_name, row_id="SnmUzDdRTKCYFGnmAtSH-A")
         # print(one_row)
         # row_data = {
@@ -185,6 +187,8 @@ async def main():
           query相关操作测试
         """
         # print(await api.query(sql="select * from 老师表"))
+        # async for chunk in api.iter_query(sql="select * from 老师表 order by _ctime", chunk_size=100):
+        #     print(chunk)
 
         # queryset: QuerySet = await api.filter(table_name=table_name, conditions="年龄 > 19 and 名称='周老师'")
         # print(queryset.rows)
@@ -0,0 +1,102 @@
+"""列式快照：按列类型转换、掩码过滤、分组聚合与导出"""
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from seatable_api_async import TableSnapshot
+from stub_server import StubSeaTable
+
+COLUMNS = StubSeaTable.columns
+
+ROWS = [
+    {"_id": "r1", "名称": "a", "数量": 5, "状态": "进行中", "标签": ["标签1", "标签2"], "日期": "2025-05-12T13:30:00+08:00", "完成": True, "备注": "x"},
+    {"_id": "r2", "名称": "b", "数量": "12.5", "状态": "已完成", "标签": [], "日期": "2025-08-01", "完成": False},
+    {"_id": "r3", "名称": None, "数量": None, "状态": None, "标签": None, "日期": "not a date"},
+    {"_id": "r4", "名称": "d", "数量": 7, "状态": "未知状态", "标签": ["新标签", "标签1"], "日期": "", "完成": True},
+]
+
+
+@pytest.fixture
+def snapshot():
+    return TableSnapshot.from_rows(ROWS, COLUMNS)
+
+
+def test_column_storage(snapshot):
+    assert len(snapshot) == 4
+    assert list(snapshot.row_ids) == ["r1", "r2", "r3", "r4"]
+    numbers = snapshot["数量"]
+    assert numbers.dtype == np.float64
+    assert numbers[[0, 1, 3]].tolist() == [5.0, 12.5, 7.0] and math.isnan(numbers[2])
+    dates = snapshot["日期"]
+    assert dates.dtype == np.dtype("datetime64[ms]")
+    # 带时区的值换算为 UTC
+    assert dates[0] == np.datetime64("2025-05-12T05:30:00")
+    assert dates[1] == np.datetime64("2025-08-01T00:00:00")
+    assert np.isnat(dates[2]) and np.isnat(dates[3])
+    assert snapshot["完成"].tolist() == [True, False, False, True]
+    assert snapshot["状态"].tolist() == ["进行中", "已完成", None, "未知状态"]
+    assert snapshot["标签"].tolist() == [["标签1", "标签2"], [], [], ["新标签", "标签1"]]
+    assert snapshot["备注"].tolist() == ["x", None, None, None]
+    # 内置列
+    assert "_mtime" in snapshot.column_names
+
+
+def test_masks(snapshot):
+    def ids(mask):
+        return snapshot.filter(mask).row_ids.tolist()
+
+    assert ids(snapshot.mask("数量", ">", 6)) == ["r2", "r4"]
+    assert ids(snapshot.mask("日期", "<", datetime(2025, 6, 1, tzinfo=timezone.utc))) == ["r1"]
+    assert ids(snapshot.mask("日期", ">=", "2025-08-01")) == ["r2"]
+    assert ids(snapshot.mask("状态", "=", "已完成")) == ["r2"]
+    assert ids(snapshot.mask("状态", "in", ["进行中", "未知状态", "不存在"])) == ["r1", "r4"]
+    assert ids(snapshot.mask("标签", "=", "标签1")) == ["r1", "r4"]
+    assert ids(snapshot.mask("标签", "!=", "标签1")) == ["r2", "r3"]
+    assert ids(snapshot.mask("完成", "=", True) & snapshot.mask("数量", "<", 6)) == ["r1"]
+    with pytest.raises(ValueError):
+        snapshot.mask("状态", ">", "x")
+    with pytest.raises(ValueError):
+        snapshot.mask("名称", "<", "x")
+    with pytest.raises(KeyError):
+        snapshot.mask("缺失", "=", 1)
+
+
+def test_filter_keeps_multi_select_rows_aligned(snapshot):
+    subset = snapshot.filter(np.array([3, 0]))
+    assert subset.row_ids.tolist() == ["r4", "r1"]
+    assert subset["标签"].tolist() == [["新标签", "标签1"], ["标签1", "标签2"]]
+    assert subset["状态"].tolist() == ["未知状态", "进行中"]
+
+
+def test_aggregations(snapshot):
+    assert snapshot.sum("数量") == 24.5
+    assert snapshot.sum("完成") == 2
+    assert snapshot.group_by("状态") == {None: 1, "进行中": 1, "已完成": 1, "未知状态": 1}
+    assert snapshot.group_by("标签", "数量", agg="sum") == {"标签1": 12.0, "标签2": 5.0, "新标签": 7.0}
+    assert snapshot.group_by("完成", "数量", agg="mean") == {False: 12.5, True: 6.0}
+    assert snapshot.group_by("名称") == {"a": 1, "b": 1, None: 1, "d": 1}
+    with pytest.raises(ValueError):
+        snapshot.group_by("状态", "名称", agg="sum")
+
+
+def test_arrow_and_pandas_export(snapshot):
+    table = snapshot.to_arrow()
+    assert table.num_rows == 4
+    assert table.column("状态").to_pylist() == ["进行中", "已完成", None, "未知状态"]
+    assert table.column("标签").to_pylist() == [["标签1", "标签2"], [], [], ["新标签", "标签1"]]
+    df = snapshot.to_pandas()
+    assert df["数量"].sum() == 24.5
+    assert df["状态"].cat.categories.tolist()[:2] == ["进行中", "已完成"]
+    assert df["状态"].isna().tolist() == [False, False, True, False]
+
+
+async def test_api_snapshot_matches_list_rows(stub, api):
+    rows = await api.list_rows(stub.table_name)
+    snapshot = await api.snapshot(stub.table_name)
+    expected = TableSnapshot.from_rows(rows, COLUMNS)
+    assert snapshot.row_ids.tolist() == expected.row_ids.tolist()
+    for name in expected.column_names:
+        left, right = snapshot[name], expected[name]
+        assert left.tolist() == right.tolist(), name
@@ -0,0 +1,72 @@
+"""SQLiteRowCache 的增量同步"""
+from seatable_api_async import SQLiteRowCache
+
+
+async def test_initial_sync_copies_all_rows(stub, api, tmp_path):
+    async with SQLiteRowCache(api, str(tmp_path / "cache.db"), chunk_size=40) as cache:
+        result = await cache.sync(stub.table_name)
+        assert result == {"updated": 250, "deleted": 0}
+        assert await cache.count(stub.table_name) == 250
+        row_id = next(iter(stub._rows))
+        row = await cache.get_row(stub.table_name, row_id)
+        assert row["名称"] == stub._rows[row_id]["0000"]
+        assert await cache.last_mtime(stub.table_name) == stub._rows[row_id]["_mtime"]
+
+
+async def test_incremental_sync_fetches_changes_and_deletions(stub, api, tmp_path):
+    path = str(tmp_path / "cache.db")
+    async with SQLiteRowCache(api, path, chunk_size=40) as cache:
+        await cache.sync(stub.table_name)
+
+    row_ids = list(stub._rows)
+    await api.batch_update_rows(stub.table_name, [{"row_id": row_ids[10], "row": {"名称": "changed"}}])
+    await api.batch_delete_rows(stub.table_name, [row_ids[20]])
+
+    # 重新打开文件，同步状态应已持久化
+    async with SQLiteRowCache(api, path, chunk_size=40) as cache:
+        result = await cache.sync(stub.table_name)
+        # 拉取 _mtime 不早于上次同步的行：生成的行 _mtime 相同，因此除被删除的行外全部重新拉取
+        assert result == {"updated": 249, "deleted": 1}
+        assert await cache.count(stub.table_name) == 249
+        assert (await cache.get_row(stub.table_name, row_ids[10]))["名称"] == "changed"
+        assert await cache.get_row(stub.table_name, row_ids[20]) is None
+        changed = await cache.changed_since(stub.table_name, "2025-11-20T08:15:30.123+00:00")
+        assert [row["_id"] for row in changed] == [row_ids[10]]
+
+        # 此后只拉取上次修改的行与新修改的行
+        await api.batch_update_rows(stub.table_name, [{"row_id": row_ids[30], "row": {"数量": -1}}])
+        result = await cache.sync(stub.table_name)
+        assert result == {"updated": 2, "deleted": 0}
+        assert (await cache.get_row(stub.table_name, row_ids[30]))["数量"] == -1
+        assert await cache.last_mtime(stub.table_name) == stub._rows[row_ids[30]]["_mtime"]
+
+
+async def test_rows_edited_during_sync_are_not_skipped(stub, api, tmp_path):
+    row_ids = list(stub._rows)
+    query = api.query
+    pages = 0
+
+    async def query_and_edit(sql, *args, **kwargs):
+        nonlocal pages
+        result = await query(sql, *args, **kwargs)
+        pages += 1
+        if pages == 1:
+            # 修改一行已同步的行，OFFSET 翻页时其后的行会前移一位而被跳过
+            await api.batch_update_rows(stub.table_name, [{"row_id": row_ids[0], "row": {"名称": "edited"}}])
+        return result
+
+    api.query = query_and_edit
+    async with SQLiteRowCache(api, ":memory:", chunk_size=40) as cache:
+        await cache.sync(stub.table_name)
+        cached = {row["_id"]: row for row in await cache.rows(stub.table_name)}
+    assert set(cached) == set(row_ids)
+    assert cached[row_ids[0]]["名称"] == "edited"
+
+
+async def test_full_sync_rebuilds_cache(stub, api):
+    async with SQLiteRowCache(api, ":memory:", chunk_size=100) as cache:
+        await cache.sync(stub.table_name)
+        result = await cache.sync(stub.table_name, full=True, detect_deletions=False)
+        assert result == {"updated": 250, "deleted": 0}
+        rows = await cache.get_rows(stub.table_name, list(stub._rows)[:5] + ["missing"])
+        assert len(rows) == 5
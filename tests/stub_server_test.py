@@ -0,0 +1,19 @@
+"""替身服务器的 SQL 子集"""
+import pytest
+
+from seatable_api_async import SeatableApiException
+
+
+async def test_where_order_and_limit(stub, api):
+    row_ids = sorted(stub._rows)
+    rows = await api.query(f"SELECT _id FROM {stub.table_name} WHERE _id > '{row_ids[9]}' AND (_id <= '{row_ids[19]}' OR _id = '{row_ids[0]}') ORDER BY _id LIMIT 5")
+    assert [row["_id"] for row in rows] == row_ids[10:15]
+
+
+async def test_unsupported_where_is_rejected(stub, api):
+    with pytest.raises(SeatableApiException):
+        await api.query(f"SELECT * FROM {stub.table_name} WHERE __import__('os') = '1'")
+
+
+def test_columns_are_public(stub):
+    assert [column["name"] for column in stub.columns][:2] == ["名称", "数量"]
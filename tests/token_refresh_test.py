@@ -0,0 +1,52 @@
+"""JWT 续期：并发请求只刷新一次、后台续期与 exp 解析"""
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta
+
+from seatable_api_async import SeaTableApiAsync
+from seatable_api_async.utils import parse_jwt_exp
+
+
+def _jwt(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.sig"
+
+
+def test_parse_jwt_exp():
+    assert parse_jwt_exp(_jwt({"exp": 1760000000})) == datetime.fromtimestamp(1760000000)
+    assert parse_jwt_exp(_jwt({"sub": "x"})) is None
+    assert parse_jwt_exp("not-a-jwt") is None
+    assert parse_jwt_exp(None) is None
+
+
+async def test_auth_reads_expiry_from_token(stub, api):
+    # 替身服务器签发 3 天有效期的 token
+    assert abs(api.jwt_exp - (datetime.now() + timedelta(days=3))) < timedelta(minutes=1)
+
+
+async def test_concurrent_requests_share_one_refresh(stub, api):
+    api.jwt_exp = datetime.now() + timedelta(minutes=1)
+    requests = stub.request_count
+    results = await asyncio.gather(*(api.list_rows(stub.table_name, limit=1) for _ in range(20)))
+    assert all(len(rows) == 1 for rows in results)
+    # 1 次认证 + 20 次查询
+    assert stub.request_count - requests == 21
+    assert api.jwt_exp > datetime.now() + timedelta(days=2)
+    assert not await api.ensure_token_fresh()
+
+
+async def test_background_refresh_renews_before_expiry(stub):
+    async with SeaTableApiAsync(stub.api_token, stub.url, auto_refresh=True) as api:
+        assert api._refresh_task is not None
+        # 剩余时间不足时后台任务至少等待 1 秒后续期
+        api.jwt_exp = datetime.now()
+        api.stop_auto_refresh()
+        api.start_auto_refresh()
+        requests = stub.request_count
+        await asyncio.sleep(1.2)
+        assert stub.request_count - requests == 1
+        assert api.jwt_exp > datetime.now() + timedelta(days=2)
+        task = api._refresh_task
+    assert api._refresh_task is None
+    assert task.cancelled()
@@ -0,0 +1,55 @@
+"""批量上传下载：上传链接复用与失效重试、重名文件"""
+import pytest
+
+from seatable_api_async import SeatableApiException
+from stub_server import DTABLE_UUID
+
+
+async def test_upload_many_reuses_one_link(stub, api, tmp_path):
+    files = []
+    for i in range(5):
+        path = tmp_path / f"f{i}.txt"
+        path.write_bytes(b"x" * (i + 1))
+        files.append(str(path))
+    results = await api.upload_many(files)
+    assert [r["error"] for r in results] == [None] * 5
+    assert [r["result"]["size"] for r in results] == [1, 2, 3, 4, 5]
+    # 认证 1 次、获取上传链接 1 次、上传 5 次
+    assert stub.request_count == 7
+
+
+async def test_expired_link_is_refreshed_once(stub, api):
+    await api.upload_bytes_file("a.txt", b"a")
+    stub.expire_upload_links()
+    info = await api.upload_bytes_file("b.txt", b"bb")
+    assert info["size"] == 2
+    requests = stub.request_count
+    # 新链接已缓存，不再重新获取
+    await api.upload_bytes_file("c.txt", b"c")
+    assert stub.request_count - requests == 1
+
+
+async def test_other_errors_are_not_retried(stub, api):
+    await api.upload_bytes_file("a.txt", b"a")
+    calls = []
+
+    async def reject(upload_info, name, content, file_type, replace):
+        calls.append(name)
+        raise SeatableApiException("quota exceeded", status=400)
+
+    api._upload_content = reject
+    requests = stub.request_count
+    with pytest.raises(SeatableApiException, match="quota"):
+        await api.upload_bytes_file("b.txt", b"b")
+    assert calls == ["b.txt"]
+    assert stub.request_count == requests
+
+
+async def test_download_many_renames_duplicates(stub, api, tmp_path):
+    base = f"{stub.url}/workspace/1/asset/{DTABLE_UUID}/files"
+    urls = [f"{base}/2025-10/bench.bin", f"{base}/2025-11/bench.bin", f"{base}/2025-11/other.bin", f"{base}/2025-12/bench.bin"]
+    results = await api.download_many(urls, str(tmp_path))
+    assert [r["error"] for r in results] == [None] * 4
+    names = [r["path"].rsplit("/", 1)[-1] for r in results]
+    assert names == ["bench.bin", "bench (1).bin", "other.bin", "bench (2).bin"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(names)
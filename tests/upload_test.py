@@ -0,0 +1,48 @@
+"""本地文件的流式 multipart 上传"""
+import os
+
+from seatable_api_async.payload import AsyncFilePayload
+
+
+class _Writer:
+    """记录写入分块的 AbstractStreamWriter 替身"""
+
+    def __init__(self):
+        self.chunks = []
+
+    async def write(self, chunk):
+        self.chunks.append(bytes(chunk))
+
+
+async def test_payload_streams_in_chunks_and_can_be_resent(tmp_path):
+    path = tmp_path / "data.bin"
+    content = os.urandom(10_000)
+    path.write_bytes(content)
+    payload = AsyncFilePayload(str(path), chunk_size=4096)
+    assert payload.size == 10_000
+
+    for _ in range(2):
+        writer = _Writer()
+        await payload.write(writer)
+        assert [len(chunk) for chunk in writer.chunks] == [4096, 4096, 1808]
+        assert b"".join(writer.chunks) == content
+
+
+async def test_upload_local_file(stub, api, tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(os.urandom(200_000))
+    info = await api.upload_local_file(str(path))
+    assert info["name"] == "report.pdf"
+    # 替身服务器返回实际收到的字节数
+    assert info["size"] == 200_000
+    assert info["type"] == "file"
+    assert info["url"].endswith("/files/2025-11/report.pdf")
+
+
+async def test_upload_local_file_with_name_and_image_type(stub, api, tmp_path):
+    path = tmp_path / "local.png"
+    path.write_bytes(b"\x89PNG" + os.urandom(100))
+    info = await api.upload_local_file(str(path), name="cover.png", file_type="image")
+    assert info["name"] == "cover.png"
+    assert info["size"] == 104
+    assert info["url"].endswith("/images/2025-11/cover.png")